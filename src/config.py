@@ -20,6 +20,18 @@ class Settings(BaseSettings):
     VECTOR_DB_URL: Optional[str] = None
     VECTOR_DB_KEY: Optional[str] = None
     VECTOR_DB_BACKEND: str = "qdrant"  # Alias for compatibility with main.py
+    VECTOR_DB_DTYPE: str = "float32"  # Storage dtype of the numpy backend: "float32" or "float16"
+    VECTOR_DB_LAZY_COLLECTIONS: bool = True  # Embedded Qdrant: open collections on demand, one store each
+    VECTOR_DB_MAX_OPEN_COLLECTIONS: int = 32  # LRU bound on open embedded collections
+    VECTOR_DB_MAX_RESIDENT_MB: int = 0  # Size bound on open embedded collections (0 = unbounded)
+    VECTOR_DB_IDLE_SECONDS: int = 600  # Close embedded collections idle for this long (0 = never)
+    VECTOR_DB_QUANTIZATION: str = "none"  # Default for new collections: "none", "scalar" (int8) or "binary"
+    VECTOR_DB_ON_DISK: bool = False  # Keep original vectors on disk (mmap) instead of RAM
+    VECTOR_DB_QUANTIZATION_ALWAYS_RAM: bool = True  # Pin quantized vectors in RAM
+    VECTOR_DB_SEARCH_OVERSAMPLING: float = 2.0  # Candidates fetched per result from quantized vectors
+    VECTOR_DB_SEARCH_RESCORE: bool = True  # Re-rank quantized candidates with the original vectors
+    VECTOR_DB_COLLECTION_MODE: str = "per_project"  # "per_project" or "shared" (one collection for all projects)
+    VECTOR_DB_SHARED_COLLECTION_NAME: str = "collection_shared"
     vector_db_path: str = "qdrant_db"
     vector_db_distance_method: str = "cosine"
     
@@ -38,11 +50,40 @@ class Settings(BaseSettings):
     # Generation and embedding models
     GENERATION_BACKEND: str = "openai"  # Provider for text generation
     GENERATION_MODEL_ID: str = "gpt-3.5-turbo"  # Model ID for text generation
+    LLM_HTTP_MAX_CONNECTIONS: int = 200  # Pooled connections shared by the async LLM clients
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 50
     EMBEDDING_BACKEND: str = "openai"  # Provider for embeddings
     EMBEDDING_MODEL_ID: str = "text-embedding-3-small"  # Model ID for embeddings
     EMBEDDING_MODEL_SIZE: int = 1536  # Dimension of embeddings
+    EMBEDDING_DIMENSIONS: int = 0  # Reduced (Matryoshka) dimension to index and search with; 0 keeps EMBEDDING_MODEL_SIZE
+    EMBEDDING_MAX_CONCURRENCY: int = 4  # Embedding batches in flight during ingestion
+    EMBEDDING_QUERY_MAX_CONCURRENCY: int = 8  # Query embeddings in flight, separate from ingestion
+    EMBEDDING_REQUESTS_PER_MINUTE: int = 3000  # Client-side limit, refined from rate-limit headers
+    EMBEDDING_TOKENS_PER_MINUTE: int = 1000000  # Client-side limit, refined from rate-limit headers
+    EMBEDDING_MAX_RETRIES: int = 5  # Retries for 429/5xx embedding responses
+    EMBEDDING_RETRY_BASE_DELAY: float = 0.5  # Seconds, doubled per attempt (with jitter)
+    EMBEDDING_RETRY_MAX_DELAY: float = 30.0  # Upper bound for a single backoff delay
+    EMBEDDING_CACHE_ENABLED: bool = True  # Persistent content-addressed embedding cache
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 200000  # LRU bound on cached vectors
+    QUERY_EMBEDDING_CACHE_ENABLED: bool = True  # In-memory LRU of query embeddings
+    QUERY_EMBEDDING_CACHE_MAX_ENTRIES: int = 10000
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: int = 3600  # 0 = entries never expire
+    ANSWER_CACHE_ENABLED: bool = True  # Cache of /index/answer results per project index version
+    ANSWER_CACHE_MAX_ENTRIES: int = 2000
+    ANSWER_CACHE_TTL_SECONDS: int = 86400  # 0 = entries never expire
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.0  # Cosine similarity for near-duplicate questions, e.g. 0.97 (0 = exact only)
+    embedding_cache_path: str = "embedding_cache"
     generation_default_max_tokens: int = 7500
     generation_default_temperature: float = 0.1
+    RAG_RETRIEVAL_LIMIT: int = 10  # Chunks retrieved per question before packing
+    RAG_CONTEXT_MAX_TOKENS: int = 6000  # Input token budget of a RAG prompt
+    RAG_HISTORY_MAX_TOKENS: int = 1500  # Part of the budget conversation turns may use
+    CONVERSATION_SUMMARY_ENABLED: bool = True  # Fold older turns of a session into a running summary
+    CONVERSATION_KEEP_MESSAGES: int = 6  # Most recent messages always sent verbatim
+    CONVERSATION_SUMMARY_MAX_TOKENS: int = 300
+    CONVERSATION_MAX_SESSIONS: int = 10000
+    CONVERSATION_SESSION_TTL_SECONDS: int = 86400  # 0 = summaries never expire
+    SINGLE_FLIGHT_ENABLED: bool = True  # Identical concurrent questions share one computation
     input_default_max_character: int = 1024
     
     # Language settings
@@ -58,6 +99,20 @@ class Settings(BaseSettings):
     file_default_chunk_size: int = 512000  # in bytes
     file_allowed_types: List[str] = ["text/plain", "application/pdf"]
     
+    # Ingestion settings
+    INGESTION_WORKERS: int = 2  # Number of background ingestion workers
+    INGESTION_QUEUE_MAX_SIZE: int = 100  # Max pending ingestion jobs (0 = unbounded)
+    INGESTION_BATCH_SIZE: int = 256  # Chunks stored, embedded and indexed together while streaming a document
+    INGESTION_PIPELINE_QUEUE_SIZE: int = 2  # Batches buffered between ingestion stages before backpressure applies
+    INGESTION_JOB_LEASE_SECONDS: int = 300  # A running job whose process stops renewing this lease is taken over
+    INGESTION_RECOVERY_INTERVAL_SECONDS: int = 30  # How often waiting and abandoned jobs are enqueued
+
+    # Document parser pool settings
+    PARSER_MAX_WORKERS: int = 0  # Parser processes (0 = CPU count)
+    PARSER_PAGES_PER_TASK: int = 16  # PDF pages parsed per task
+    PARSER_MEMORY_LIMIT_MB: int = 1024  # Extra address space per parser process (0 = unlimited)
+    PARSER_TASK_TIMEOUT: int = 120  # Seconds before a parser task is aborted
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
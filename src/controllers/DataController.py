@@ -2,6 +2,8 @@ from .BaseController import BaseController
 from .ProjectController import ProjectController
 from fastapi import UploadFile
 from models import ResponseSignal
+import aiofiles
+import hashlib
 import re
 import os
 
@@ -16,7 +18,8 @@ class DataController(BaseController):
         if file.content_type not in self.app_settings.FILE_ALLOWED_TYPES:
             return False, ResponseSignal.FILE_TYPE_NOT_SUPPORTED.value
 
-        if file.size > self.app_settings.FILE_MAX_SIZE * self.size_scale:
+        # The declared size is optional; save_upload_stream enforces the limit on the actual bytes
+        if file.size is not None and file.size > self.app_settings.FILE_MAX_SIZE * self.size_scale:
             return False, ResponseSignal.FILE_SIZE_EXCEEDED.value
 
         return True, ResponseSignal.FILE_VALIDATED_SUCCESS.value
@@ -44,6 +47,54 @@ class DataController(BaseController):
 
         return new_file_path, random_key + "_" + cleaned_file_name
 
+    async def save_upload_stream(self, file: UploadFile, project_id: str):
+        """Streams an upload once to its content-addressed path in the project directory.
+
+        The body is read in FILE_DEFAULT_CHUNK_SIZE pieces while the size and
+        sha256 are computed incrementally, and the upload is aborted as soon as
+        it exceeds FILE_MAX_SIZE. The file is finally renamed to
+        `<sha256><ext>`, so identical uploads share one file on disk.
+
+        Returns:
+            (is_saved, signal, file_path, file_name, file_hash, file_size)
+        """
+        project_path = ProjectController().get_project_path(project_id=project_id)
+        max_size = self.app_settings.FILE_MAX_SIZE * self.size_scale
+        file_ext = os.path.splitext(file.filename)[-1].lower()
+
+        temp_path = os.path.join(project_path, f".upload_{self.generate_random_string()}.part")
+        hasher = hashlib.sha256()
+        file_size = 0
+
+        try:
+            async with aiofiles.open(temp_path, "wb") as f:
+                while chunk := await file.read(self.app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                    file_size += len(chunk)
+                    if file_size > max_size:
+                        break
+                    hasher.update(chunk)
+                    await f.write(chunk)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        if file_size > max_size:
+            os.remove(temp_path)
+            return False, ResponseSignal.FILE_SIZE_EXCEEDED.value, None, None, None, file_size
+
+        file_hash = hasher.hexdigest()
+        file_name = f"{file_hash}{file_ext}"
+        file_path = os.path.join(project_path, file_name)
+
+        if os.path.exists(file_path):
+            # Same content already stored for this project
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, file_path)
+
+        return True, ResponseSignal.FILE_UPLOAD_SUCCESS.value, file_path, file_name, file_hash, file_size
+
     def get_clean_file_name(self, orig_file_name: str):
 
         # remove any special characters, except underscore and .
@@ -0,0 +1,335 @@
+from .BaseController import BaseController
+from .ProcessController import ProcessController
+from .NLPController import NLPController
+from models.IngestionJobModel import IngestionJobModel
+from models.ChunkModel import ChunkModel
+from models.ProjectModel import ProjectModel
+from models.db_schemes import DataChunk, IngestionJob
+from models.enums.JobStatusEnum import JobStatusEnum, JobStageEnum, JobStageStatusEnum
+from helpers.stage_metrics import StageMetrics
+from langchain.docstore.document import Document
+from typing import AsyncIterator, List
+import asyncio
+import logging
+import os
+import time
+
+class IngestionStageError(Exception):
+    """Wraps a failure with the ingestion stage it happened in."""
+
+    def __init__(self, stage: str, error: Exception):
+        super().__init__(str(error))
+        self.stage = stage
+
+class IngestionController(BaseController):
+    """Runs a queued ingestion job: parse -> chunk -> embed -> index.
+
+    Blocking work (file parsing, chunking, embedding and vector DB writes) is
+    pushed to worker threads so a running job never stalls the event loop.
+    When a DocumentParserPool is given, files are parsed in its worker
+    processes instead, with page ranges spread across cores.
+    """
+
+    def __init__(self, db_client, vectordb_client, generation_client,
+                 embedding_client, template_parser, logger=None,
+                 embedding_executor=None, embedding_cache=None, document_parser=None,
+                 batch_size: int = 256, queue_size: int = 2):
+        super().__init__()
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.db_client = db_client
+        self.vectordb_client = vectordb_client
+        self.generation_client = generation_client
+        self.embedding_client = embedding_client
+        self.template_parser = template_parser
+        self.embedding_executor = embedding_executor
+        self.embedding_cache = embedding_cache
+        self.document_parser = document_parser
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+
+        self.job_model = IngestionJobModel(db_client=db_client)
+
+    async def iter_documents(self, process_controller: ProcessController,
+                             file_name: str) -> AsyncIterator[Document]:
+        """Yields the file's pages one at a time as they are parsed."""
+        if self.document_parser is not None:
+            file_path = os.path.join(process_controller.project_path, file_name)
+            async for pages in self.document_parser.iter_pages(file_path):
+                for page in pages:
+                    yield page
+            return
+
+        pages = process_controller.iter_file_content(file_id=file_name)
+        while True:
+            page = await asyncio.to_thread(next, pages, None)
+            if page is None:
+                break
+            yield page
+
+    async def run_job(self, job: IngestionJob, owner: str = None):
+        """Runs the stages as an overlapping pipeline over batches of `batch_size` chunks.
+
+        Parsing/chunking, embedding and vector DB upserts run as concurrent
+        tasks joined by queues of at most `queue_size` batches, so page N+1 is
+        parsed while batch K is embedded and batch K-1 is upserted. A slow
+        stage fills its input queue and blocks the stages before it, keeping
+        memory bounded; total time tends toward that of the slowest stage.
+
+        With `owner`, job statuses are only written while that worker still
+        holds the job's lease, so a worker that lost it cannot finish the job.
+        """
+        job_config = job.job_config
+        project_id_str = job_config["project_id"]
+        asset_id_str = str(job.job_asset_id)
+        stages = [stage.value for stage in JobStageEnum]
+        metrics = {stage: StageMetrics(name=stage) for stage in stages}
+        parse_metrics, chunk_metrics, embed_metrics, index_metrics = (
+            metrics[JobStageEnum.PARSE.value], metrics[JobStageEnum.CHUNK.value],
+            metrics[JobStageEnum.EMBED.value], metrics[JobStageEnum.INDEX.value],
+        )
+        started_at = time.perf_counter()
+
+        self.logger.info(f"[IngestionController.run_job] Starting job {job.id} for asset {asset_id_str}")
+        await self.job_model.set_job_status(job_id=job.id, status=JobStatusEnum.RUNNING.value, owner=owner)
+
+        try:
+            for stage in stages:
+                await self.job_model.set_stage_progress(job_id=job.id, stage=stage,
+                                                        status=JobStageStatusEnum.RUNNING.value)
+
+            process_controller = ProcessController(project_id=project_id_str)
+            nlp_controller = NLPController(
+                db_client=self.db_client,
+                vectordb_client=self.vectordb_client,
+                generation_client=self.generation_client,
+                embedding_client=self.embedding_client,
+                template_parser=self.template_parser,
+                logger=self.logger,
+                embedding_executor=self.embedding_executor,
+                embedding_cache=self.embedding_cache
+            )
+            chunk_model = await ChunkModel.create_instance(db_client=self.db_client)
+            project_model = await ProjectModel.create_instance(db_client=self.db_client)
+            vector_config = await project_model.get_project_vector_config(project_object_id=job.job_project_id)
+
+            # Drop chunks and points left behind by a previous (failed or retried) run of this asset
+            do_reset = job_config.get("do_reset", False)
+            await chunk_model.delete_chunks_by_asset_id(asset_id=job.job_asset_id)
+            if not do_reset:
+                await asyncio.to_thread(
+                    nlp_controller.delete_asset_from_vector_db,
+                    project_identifier_str=project_id_str,
+                    asset_id=asset_id_str
+                )
+
+            embed_queue = asyncio.Queue(maxsize=self.queue_size)
+            index_queue = asyncio.Queue(maxsize=self.queue_size)
+
+            async def emit_batch(batch: List[DataChunk]):
+                with chunk_metrics.timed("busy"):
+                    await chunk_model.insert_many_chunks(chunks=batch)
+                chunk_metrics.add(len(batch))
+                with chunk_metrics.timed("blocked"):
+                    await embed_queue.put(batch)
+
+            async def parse():
+                pages = self.iter_documents(process_controller, job_config["file_name"])
+                try:
+                    while True:
+                        try:
+                            with parse_metrics.timed("busy"):
+                                page = await anext(pages, None)
+                        except Exception as e:
+                            raise IngestionStageError(JobStageEnum.PARSE.value, e) from e
+                        if page is None:
+                            return
+                        parse_metrics.add(1)
+                        yield page
+                finally:
+                    # Stop the parser from reading ahead once this stage ends early
+                    await pages.aclose()
+
+            async def parse_and_chunk():
+                pages = parse()
+                chunks = process_controller.iter_file_chunks(
+                    pages,
+                    file_id=asset_id_str,
+                    chunk_size=job_config["chunk_size"],
+                    overlap_size=job_config["overlap_size"]
+                )
+                batch: List[DataChunk] = []
+                chunk_count = 0
+
+                try:
+                    while True:
+                        # Time spent parsing the next page is the parse stage's, the rest is splitting
+                        waited_at, parse_busy = time.perf_counter(), parse_metrics.busy_seconds
+                        try:
+                            chunk = await anext(chunks, None)
+                        except IngestionStageError:
+                            raise
+                        except Exception as e:
+                            raise IngestionStageError(JobStageEnum.CHUNK.value, e) from e
+                        parsing = parse_metrics.busy_seconds - parse_busy
+                        chunk_metrics.starved_seconds += parsing
+                        chunk_metrics.busy_seconds += time.perf_counter() - waited_at - parsing
+                        if chunk is None:
+                            break
+
+                        chunk_count += 1
+                        batch.append(DataChunk(
+                            chunk_text=chunk.page_content,
+                            chunk_metadata=chunk.metadata,
+                            chunk_order=chunk_count,
+                            chunk_project_id=job.job_project_id,
+                            chunk_asset_id=job.job_asset_id
+                        ))
+                        if len(batch) >= self.batch_size:
+                            await emit_batch(batch)
+                            batch = []
+                finally:
+                    # Closing the chunker does not close the pages it was reading
+                    await chunks.aclose()
+                    await pages.aclose()
+
+                # Without any page, the only chunk is the empty-content placeholder
+                if parse_metrics.items == 0:
+                    raise ValueError(f"No content could be loaded from {job_config['file_name']}")
+
+                try:
+                    if batch:
+                        await emit_batch(batch)
+                    await embed_queue.put(None)
+                except Exception as e:
+                    raise IngestionStageError(JobStageEnum.CHUNK.value, e) from e
+
+            async def embed():
+                while True:
+                    with embed_metrics.timed("starved"):
+                        batch = await embed_queue.get()
+                    if batch is None:
+                        await index_queue.put(None)
+                        return
+
+                    with embed_metrics.timed("busy"):
+                        vectors = await nlp_controller.aembed_chunks(chunks=batch)
+                    if vectors is None:
+                        raise ValueError("Failed to embed document chunks.")
+                    embed_metrics.add(len(vectors))
+
+                    with embed_metrics.timed("blocked"):
+                        await index_queue.put((batch, vectors))
+
+            async def index():
+                nonlocal do_reset
+                while True:
+                    with index_metrics.timed("starved"):
+                        item = await index_queue.get()
+                    if item is None:
+                        return
+
+                    batch, vectors = item
+                    with index_metrics.timed("busy"):
+                        is_indexed = await asyncio.to_thread(
+                            nlp_controller.insert_chunks_into_vector_db,
+                            project_identifier_str=project_id_str,
+                            chunks=batch,
+                            vectors=vectors,
+                            do_reset=do_reset,
+                            vector_config=vector_config
+                        )
+                    if not is_indexed:
+                        raise ValueError("Failed to index document chunks.")
+                    index_metrics.add(len(batch))
+
+                    # Only the first batch may reset the collection
+                    do_reset = False
+                    await self.job_model.set_stages_completed(
+                        job_id=job.id,
+                        completed={stage: stage_metrics.items for stage, stage_metrics in metrics.items()}
+                    )
+
+            await self.run_stages({
+                JobStageEnum.PARSE.value: parse_and_chunk(),
+                JobStageEnum.EMBED.value: embed(),
+                JobStageEnum.INDEX.value: index(),
+            })
+
+            for stage, stage_metrics in metrics.items():
+                await self.job_model.set_stage_progress(job_id=job.id, stage=stage,
+                                                        status=JobStageStatusEnum.DONE.value,
+                                                        completed=stage_metrics.items,
+                                                        total=stage_metrics.items)
+
+        except Exception as e:
+            failed_stage = getattr(e, "stage", JobStageEnum.PARSE.value)
+            self.logger.error(f"[IngestionController.run_job] Job {job.id} failed during '{failed_stage}': {e}", exc_info=True)
+            await self.job_model.set_stage_progress(job_id=job.id, stage=failed_stage,
+                                                    status=JobStageStatusEnum.FAILED.value)
+            await self.job_model.set_job_metrics(job_id=job.id,
+                                                 metrics=self.summarize_metrics(metrics, started_at))
+            if not await self.job_model.set_job_status(job_id=job.id, status=JobStatusEnum.FAILED.value,
+                                                       error=str(e), owner=owner):
+                self.logger.warning(f"[IngestionController.run_job] Job {job.id} is no longer held by {owner}, not marking it failed")
+            # A failed run may still have written points before it stopped
+            await self.bump_project_index_version(job)
+            return False
+
+        job_metrics = self.summarize_metrics(metrics, started_at)
+        await self.job_model.set_job_metrics(job_id=job.id, metrics=job_metrics)
+        if not await self.job_model.set_job_status(job_id=job.id, status=JobStatusEnum.COMPLETED.value,
+                                                   owner=owner):
+            self.logger.warning(f"[IngestionController.run_job] Job {job.id} is no longer held by {owner}, not marking it completed")
+            return False
+        await self.bump_project_index_version(job)
+        self.logger.info(
+            f"[IngestionController.run_job] Job {job.id} completed for asset {asset_id_str}: "
+            f"{index_metrics.items} chunks from {parse_metrics.items} pages in {job_metrics['wall_seconds']}s, "
+            f"bottleneck stage '{job_metrics['bottleneck_stage']}'"
+        )
+
+        return True
+
+    async def bump_project_index_version(self, job: IngestionJob):
+        """Moves the project to a new index version so answers cached before this job stop matching."""
+        try:
+            project_model = await ProjectModel.create_instance(db_client=self.db_client)
+            await project_model.bump_index_version(project_object_id=job.job_project_id)
+        except Exception as e:
+            self.logger.error(f"[IngestionController.run_job] Could not bump index version of project {job.job_project_id}: {e}")
+
+    @staticmethod
+    async def run_stages(stage_coroutines: dict):
+        """Runs the pipeline stages concurrently; the first failure cancels the others.
+
+        Raises:
+            IngestionStageError: tagged with the stage that failed first
+        """
+        async def run_stage(stage: str, coroutine):
+            try:
+                await coroutine
+            except (asyncio.CancelledError, IngestionStageError):
+                raise
+            except Exception as e:
+                raise IngestionStageError(stage, e) from e
+
+        tasks = [
+            asyncio.create_task(run_stage(stage, coroutine))
+            for stage, coroutine in stage_coroutines.items()
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def summarize_metrics(metrics: dict, started_at: float) -> dict:
+        stages = {stage: stage_metrics.to_dict() for stage, stage_metrics in metrics.items()}
+        return {
+            "wall_seconds": round(time.perf_counter() - started_at, 3),
+            "bottleneck_stage": max(metrics.values(), key=lambda m: m.busy_seconds).name,
+            "stages": stages,
+        }
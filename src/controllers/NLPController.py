@@ -1,17 +1,26 @@
 from .BaseController import BaseController
 from models.db_schemes import Project, DataChunk
 from stores.llm.LLMEnums import DocumentTypeEnum
+from stores.llm.providers.FallbackProvider import FallbackProvider
+from stores.llm.ContextPacker import ContextPacker
+from stores.vectordb.VectorDBEnums import PayloadFieldEnums, CollectionModeEnums
 from typing import List, Optional
 import json
 import logging
-from qdrant_client.http import models as rest_models
 import uuid
+import asyncio
 import re # Import regular expression module
 
+# Namespace for deterministic vector point ids (uuid5 of asset id + chunk order)
+CHUNK_POINT_ID_NAMESPACE = uuid.UUID("46c3c2b6-7f86-44a1-b67f-e5bd810113f4")
+
 class NLPController(BaseController):
 
     def __init__(self, db_client, vectordb_client, generation_client, 
-                 embedding_client, template_parser, logger):
+                 embedding_client, template_parser, logger,
+                 embedding_executor=None, embedding_cache=None,
+                 async_vectordb_client=None, query_embedding_cache=None,
+                 answer_cache=None, language: Optional[str] = None):
         super().__init__()
         self.logger = logger
 
@@ -21,26 +30,348 @@ class NLPController(BaseController):
         self.generation_client = generation_client
         self.embedding_client = embedding_client
         self.template_parser = template_parser
+        # Prompt language of this request, passed to every template: the parser is shared by all requests
+        self.language = language
+        if template_parser is not None:
+            self.language = template_parser.resolve_language(language) if language else template_parser.language
+        self.embedding_executor = embedding_executor
+        self.embedding_cache = embedding_cache
+        self.async_vectordb_client = async_vectordb_client
+        self.query_embedding_cache = query_embedding_cache
+        self.answer_cache = answer_cache
+        # Set by aanswer_rag_question: "exact", "semantic" or None
+        self.answer_cache_hit = None
+        # Set by build_rag_prompt: what the context packer kept and dropped
+        self.context_report = None
+        self.context_packer = ContextPacker(
+            max_input_tokens=self.app_settings.RAG_CONTEXT_MAX_TOKENS,
+            max_history_tokens=self.app_settings.RAG_HISTORY_MAX_TOKENS,
+            model_id=getattr(generation_client, "generation_model_id", None),
+        )
+        # Cleared by answer_from_documents when the LLM call failed, so the answer is not cached
+        self.answer_generated = True
+
+    def is_shared_collection_mode(self) -> bool:
+        return self.app_settings.VECTOR_DB_COLLECTION_MODE.lower() == CollectionModeEnums.SHARED.value
 
     def create_collection_name(self, project_id: str):
+        if self.is_shared_collection_mode():
+            return self.app_settings.VECTOR_DB_SHARED_COLLECTION_NAME
         return f"collection_{project_id}".strip()
+
+    def get_tenant_filters(self, project_identifier_str: str) -> dict:
+        """Payload filter that confines an operation to one project in a shared collection."""
+        if not self.is_shared_collection_mode():
+            return {}
+        return {PayloadFieldEnums.PROJECT_ID.value: str(project_identifier_str)}
+
+    @staticmethod
+    def create_point_id(asset_id: str, chunk_order: int) -> str:
+        """Deterministic point id, so re-indexing the same chunk overwrites its point."""
+        return str(uuid.uuid5(CHUNK_POINT_ID_NAMESPACE, f"{asset_id}:{chunk_order}"))
     
     def reset_vector_db_collection(self, project: Project):
         collection_name = self.create_collection_name(project_id=project.project_id)
+        if self.is_shared_collection_mode():
+            # Other projects live in the same collection: drop only this project's points
+            return self.vectordb_client.delete_by_filter(
+                collection_name=collection_name,
+                filters=self.get_tenant_filters(project.project_id)
+            )
         return self.vectordb_client.delete_collection(collection_name=collection_name)
+
+    def delete_asset_from_vector_db(self, project_identifier_str: str, asset_id: str):
+        """Removes one document's points, leaving the rest of the project's index intact."""
+        collection_name = self.create_collection_name(project_id=project_identifier_str)
+        return self.vectordb_client.delete_by_asset_id(
+            collection_name=collection_name,
+            asset_id=str(asset_id)
+        )
     
-    def get_vector_db_collection_info(self, project: Project):
-        collection_name = self.create_collection_name(project_id=project.project_id)
-        collection_info = self.vectordb_client.get_collection_info(collection_name=collection_name)
+    async def adelete_asset_from_vector_db(self, project_identifier_str: str, asset_id: str):
+        """Async variant of delete_asset_from_vector_db, for request handlers."""
+        if self.async_vectordb_client is None:
+            return await asyncio.to_thread(
+                self.delete_asset_from_vector_db,
+                project_identifier_str=project_identifier_str,
+                asset_id=asset_id,
+            )
 
-        return json.loads(
-            json.dumps(collection_info, default=lambda x: x.__dict__)
+        collection_name = self.create_collection_name(project_id=project_identifier_str)
+        return await self.async_vectordb_client.delete_by_asset_id(
+            collection_name=collection_name,
+            asset_id=str(asset_id)
         )
+
+    def get_vector_db_collection_info(self, project_identifier_str: str):
+        collection_name = self.create_collection_name(project_id=project_identifier_str)
+        collection_info = json.loads(json.dumps(
+            self.vectordb_client.get_collection_info(collection_name=collection_name),
+            default=lambda x: x.__dict__
+        ))
+
+        if not self.is_shared_collection_mode():
+            return collection_info
+
+        # Totals of the shared collection cover every project; only its settings are common
+        return {
+            "collection_name": collection_name,
+            "shared_collection": True,
+            "points_count": self.vectordb_client.count_points(
+                collection_name=collection_name,
+                filters=self.get_tenant_filters(project_identifier_str)
+            ),
+            "config": (collection_info or {}).get("config"),
+        }
     
+    def update_vector_db_config(self, project_identifier_str: str, vector_config: dict):
+        """Applies changed quantization / on_disk options to the project's existing collection."""
+        if not hasattr(self.vectordb_client, "update_vector_config"):
+            return False
+
+        if self.is_shared_collection_mode():
+            self.logger.warning("Per-project vector config is ignored in shared collection mode; "
+                                "configure the shared collection through VECTOR_DB_* settings")
+            return False
+
+        collection_name = self.create_collection_name(project_id=project_identifier_str)
+        return self.vectordb_client.update_vector_config(
+            collection_name=collection_name,
+            vector_config=vector_config
+        )
+
+    def estimate_vector_db_recall(self, project_identifier_str: str,
+                                  sample_size: int = 20, limit: int = 10) -> Optional[dict]:
+        """Recall of the configured (quantized) search against exact search, if the backend supports it."""
+        if not hasattr(self.vectordb_client, "estimate_recall"):
+            return None
+
+        collection_name = self.create_collection_name(project_id=project_identifier_str)
+        return self.vectordb_client.estimate_recall(
+            collection_name=collection_name,
+            sample_size=sample_size,
+            limit=limit,
+            filters=self.get_tenant_filters(project_identifier_str)
+        )
+
     def index_into_vector_db(self, project_identifier_str: str, chunks: List[DataChunk],
                                    do_reset: bool = False):
         
         self.logger.info(f"[NLPController.index_into_vector_db] Called for project_identifier_str {project_identifier_str}. Number of chunks: {len(chunks)}")
+
+        vectors = self.embed_chunks(chunks=chunks)
+        if vectors is None:
+            return False
+
+        return self.insert_chunks_into_vector_db(
+            project_identifier_str=project_identifier_str,
+            chunks=chunks,
+            vectors=vectors,
+            do_reset=do_reset,
+        )
+
+    def embed_chunks(self, chunks: List[DataChunk]) -> list:
+        """Embeds the text of each chunk as a document, preserving chunk order.
+
+        Texts are sent through the provider's batch API, so a document costs
+        one request per provider-sized batch instead of one per chunk.
+        """
+        vectors = self.embed_texts_cached(
+            texts=[chunk.chunk_text for chunk in chunks],
+            document_type=DocumentTypeEnum.DOCUMENT.value
+        )
+        if vectors is None:
+            self.logger.error("[NLPController.embed_chunks] Embedding client returned no vectors or a mismatched count")
+            return None
+
+        self.logger.info(f"[NLPController.embed_chunks] Generated embeddings. Example vector length: {len(vectors[0]) if vectors else 'N/A'}")
+
+        return vectors
+
+    async def aembed_chunks(self, chunks: List[DataChunk]) -> list:
+        """Async variant of embed_chunks.
+
+        Uses the shared AsyncEmbeddingExecutor (concurrent, rate-limited batches)
+        when one is configured, otherwise runs embed_chunks in a worker thread.
+        """
+        if self.embedding_executor is None:
+            return await asyncio.to_thread(self.embed_chunks, chunks=chunks)
+
+        vectors = await self.aembed_texts_cached(
+            texts=[chunk.chunk_text for chunk in chunks],
+            document_type=DocumentTypeEnum.DOCUMENT.value
+        )
+        if vectors is None:
+            self.logger.error("[NLPController.aembed_chunks] Embedding executor returned no vectors or a mismatched count")
+            return None
+
+        self.logger.info(f"[NLPController.aembed_chunks] Generated embeddings. Example vector length: {len(vectors[0]) if vectors else 'N/A'}")
+        return vectors
+
+    def get_embedding_cache(self):
+        # Never cache the fallback provider's zero vectors
+        if self.embedding_cache is None or isinstance(self.embedding_client, FallbackProvider):
+            return None
+        return self.embedding_cache
+
+    def get_query_embedding_cache(self, document_type: str):
+        # Only queries repeat verbatim often enough to be worth keeping in memory
+        if self.query_embedding_cache is None or document_type != DocumentTypeEnum.QUERY.value \
+                or isinstance(self.embedding_client, FallbackProvider):
+            return None
+        return self.query_embedding_cache
+
+    def embed_texts_cached(self, texts: List[str], document_type: str) -> Optional[list]:
+        """Embeds `texts`, serving repeated content from the embedding caches.
+
+        Queries are looked up in the in-memory query cache first, then in the
+        persistent cache; only texts missing from both (deduplicated) reach
+        the provider.
+
+        Returns:
+            One vector per input text, or None if the provider call failed
+        """
+        query_cache = self.get_query_embedding_cache(document_type)
+        if query_cache is None:
+            return self._embed_texts_persisted(texts, document_type)
+
+        model_id = self.embedding_client.embedding_model_id
+        dimension = self.embedding_client.embedding_size
+
+        vectors = query_cache.get_many(model_id, dimension, texts, document_type)
+        missing_texts = list(dict.fromkeys(
+            text for text, vector in zip(texts, vectors) if vector is None
+        ))
+        if not missing_texts:
+            return vectors
+
+        missing_vectors = self._embed_texts_persisted(missing_texts, document_type)
+        if missing_vectors is None:
+            return None
+
+        query_cache.put_many(model_id, dimension, missing_texts, missing_vectors, document_type)
+        return self._merge_cached_vectors(texts, vectors, missing_texts, missing_vectors)
+
+    async def aembed_texts_cached(self, texts: List[str], document_type: str) -> Optional[list]:
+        """Async variant of embed_texts_cached; cache misses go through the executor."""
+        query_cache = self.get_query_embedding_cache(document_type)
+        if query_cache is None:
+            return await self._aembed_texts_persisted(texts, document_type)
+
+        model_id = self.embedding_client.embedding_model_id
+        dimension = self.embedding_client.embedding_size
+
+        vectors = query_cache.get_many(model_id, dimension, texts, document_type)
+        missing_texts = list(dict.fromkeys(
+            text for text, vector in zip(texts, vectors) if vector is None
+        ))
+        if not missing_texts:
+            return vectors
+
+        missing_vectors = await self._aembed_texts_persisted(missing_texts, document_type)
+        if missing_vectors is None:
+            return None
+
+        query_cache.put_many(model_id, dimension, missing_texts, missing_vectors, document_type)
+        return self._merge_cached_vectors(texts, vectors, missing_texts, missing_vectors)
+
+    def _embed_texts_persisted(self, texts: List[str], document_type: str) -> Optional[list]:
+        # Persistent cache lookup, then the provider for the remaining texts
+        cache = self.get_embedding_cache()
+        if cache is None:
+            vectors = self.embedding_client.embed_texts(texts=texts, document_type=document_type)
+            return vectors if vectors is not None and len(vectors) == len(texts) else None
+
+        model_id = self.embedding_client.embedding_model_id
+        dimension = self.embedding_client.embedding_size
+
+        vectors = self.get_cached_vectors(cache, texts, document_type)
+        missing_texts = list(dict.fromkeys(
+            text for text, vector in zip(texts, vectors) if vector is None
+        ))
+        if not missing_texts:
+            return vectors
+
+        missing_vectors = self.embedding_client.embed_texts(texts=missing_texts, document_type=document_type)
+        if missing_vectors is None or len(missing_vectors) != len(missing_texts):
+            return None
+
+        cache.put_many(model_id, dimension, missing_texts, missing_vectors, document_type)
+        return self._merge_cached_vectors(texts, vectors, missing_texts, missing_vectors)
+
+    async def _aembed_texts_persisted(self, texts: List[str], document_type: str) -> Optional[list]:
+        cache = self.get_embedding_cache()
+        if cache is None:
+            return await self.embedding_executor.embed_texts(texts=texts, document_type=document_type)
+
+        model_id = self.embedding_client.embedding_model_id
+        dimension = self.embedding_client.embedding_size
+
+        vectors = await asyncio.to_thread(self.get_cached_vectors, cache, texts, document_type)
+        missing_texts = list(dict.fromkeys(
+            text for text, vector in zip(texts, vectors) if vector is None
+        ))
+        if not missing_texts:
+            return vectors
+
+        missing_vectors = await self.embedding_executor.embed_texts(texts=missing_texts, document_type=document_type)
+        if missing_vectors is None:
+            return None
+
+        await asyncio.to_thread(cache.put_many, model_id, dimension, missing_texts, missing_vectors, document_type)
+        return self._merge_cached_vectors(texts, vectors, missing_texts, missing_vectors)
+
+    def get_cached_vectors(self, cache, texts: List[str], document_type: str) -> List[Optional[list]]:
+        """Looks `texts` up in the cache at the current embedding size.
+
+        With reduced embeddings, misses are retried against full-size vectors
+        cached before the reduction; those are truncated, renormalized and
+        cached at the reduced size instead of being embedded again.
+        """
+        model_id = self.embedding_client.embedding_model_id
+        dimension = self.embedding_client.embedding_size
+        full_dimension = getattr(self.embedding_client, "full_embedding_size", None)
+
+        vectors = cache.get_many(model_id, dimension, texts, document_type)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if not full_dimension or not missing:
+            return vectors
+
+        full_vectors = cache.get_many(model_id, full_dimension, [texts[i] for i in missing], document_type)
+        found = [(i, vector) for i, vector in zip(missing, full_vectors) if vector is not None]
+        if not found:
+            return vectors
+
+        reduced = self.embedding_client.reduce_embeddings([vector for _, vector in found])
+        for (i, _), vector in zip(found, reduced):
+            vectors[i] = vector
+        cache.put_many(model_id, dimension, [texts[i] for i, _ in found], reduced, document_type)
+
+        return vectors
+
+    @staticmethod
+    def _merge_cached_vectors(texts: List[str], vectors: list,
+                              missing_texts: List[str], missing_vectors: list) -> list:
+        embedded = dict(zip(missing_texts, missing_vectors))
+        return [
+            vector if vector is not None else embedded[text]
+            for text, vector in zip(texts, vectors)
+        ]
+
+    def insert_chunks_into_vector_db(self, project_identifier_str: str, chunks: List[DataChunk],
+                                     vectors: list, do_reset: bool = False,
+                                     replace_asset: bool = False,
+                                     vector_config: dict = None):
+        """Stores already embedded chunks into the project's vector DB collection.
+
+        Points are appended to the existing collection. With `replace_asset`,
+        any points previously indexed for the chunks' asset are removed first,
+        so re-ingesting a document replaces it instead of duplicating it.
+        `vector_config` (the project's quantization / on_disk overrides) is
+        used if this call creates the collection; in shared collection mode
+        the collection's settings come from the VECTOR_DB_* defaults instead,
+        since they are common to every project in it.
+        """
         # step1: get collection name using the provided ID
         collection_name = self.create_collection_name(project_id=project_identifier_str)
 
@@ -52,38 +383,58 @@ class NLPController(BaseController):
             # Ensure metadata includes the asset_id
             current_chunk_meta = chunk.chunk_metadata.copy() # Start with original loader metadata
             current_chunk_meta['asset_id'] = str(chunk.chunk_asset_id) # Add the asset_id (as string)
+            current_chunk_meta['chunk_order'] = chunk.chunk_order
+            current_chunk_meta['project_id'] = str(project_identifier_str) # Tenant key in shared collections
+            if chunk.id is not None:
+                current_chunk_meta['chunk_id'] = str(chunk.id) # Link back to the Mongo chunk
             metadata_list.append(current_chunk_meta) # Append to the correctly named list
-        
-        # Re-enable original embedding code:
-        vectors = [
-            self.embedding_client.embed_text(text=text, 
-                                             document_type=DocumentTypeEnum.DOCUMENT.value)
-            for text in texts
-        ]
-        self.logger.info(f"[NLPController.index_into_vector_db] Generated embeddings. Example vector length: {len(vectors[0]) if vectors else 'N/A'}")
 
         # step3: create collection if not exists
-        self.logger.info(f"[NLPController.index_into_vector_db] Attempting to create/ensure collection: {collection_name}")
+        if self.is_shared_collection_mode():
+            # Resetting must never drop the collection other projects share
+            if do_reset:
+                self.vectordb_client.delete_by_filter(
+                    collection_name=collection_name,
+                    filters=self.get_tenant_filters(project_identifier_str)
+                )
+                do_reset = False
+            if vector_config:
+                self.logger.warning(f"Ignoring the vector config of project {project_identifier_str} in shared "
+                                    f"collection mode; the shared collection uses the VECTOR_DB_* settings")
+            vector_config = {"multitenant": True}
+
+        self.logger.info(f"[NLPController.insert_chunks_into_vector_db] Attempting to create/ensure collection: {collection_name}")
         collection_created_or_exists = self.vectordb_client.create_collection(
             collection_name=collection_name,
             embedding_size=self.embedding_client.embedding_size,
             do_reset=do_reset,
+            vector_config=vector_config,
         )
 
+        if replace_asset and not collection_created_or_exists:
+            for asset_id in {str(chunk.chunk_asset_id) for chunk in chunks}:
+                self.vectordb_client.delete_by_asset_id(
+                    collection_name=collection_name,
+                    asset_id=asset_id
+                )
+
         # step4: insert into vector db
-        # Extract ObjectIds from the chunk objects and generate UUIDs for Qdrant
-        record_ids_uuid = [str(uuid.uuid4()) for chunk in chunks]
-        self.logger.info(f"[NLPController.index_into_vector_db] Generated UUIDs for Qdrant records. Example: {record_ids_uuid[0] if record_ids_uuid else 'N/A'}")
+        # Derive point ids from (asset id, chunk order) so upserts are idempotent
+        record_ids_uuid = [
+            self.create_point_id(asset_id=str(chunk.chunk_asset_id), chunk_order=chunk.chunk_order)
+            for chunk in chunks
+        ]
+        self.logger.info(f"[NLPController.insert_chunks_into_vector_db] Derived point ids for Qdrant records. Example: {record_ids_uuid[0] if record_ids_uuid else 'N/A'}")
 
-        _ = self.vectordb_client.insert_many(
+        is_inserted = self.vectordb_client.insert_many(
             collection_name=collection_name,
             texts=texts,
             metadata=metadata_list, # Use the list with asset_id included
             vectors=vectors,
-            record_ids=record_ids_uuid, # Use the generated UUID list
+            record_ids=record_ids_uuid, # Use the deterministic id list
         )
 
-        return True
+        return is_inserted is not False
 
     def search_vector_db_collection(
         self,
@@ -99,83 +450,234 @@ class NLPController(BaseController):
             f"for '{query_text[:50]}...', limit: {limit}, file_id: {file_id}, threshold: {score_threshold}"
         )
 
-        # Use the embed_text method, consistent with indexing logic (assuming single text input)
-        query_embedding = self.embedding_client.embed_text(text=query_text)
-        # Note: Ensure embed_text returns the embedding directly for a single text input.
-        # If it expects a list and returns a list, adjust accordingly:
-        # query_embedding = self.embedding_client.embed_text(texts=[query_text])[0] # If it needs list input
-
-        # Prepare the filter for Qdrant if file_id is provided
-        # This assumes the metadata field in Qdrant is named 'file_id' or 'asset_id'
-        # We need to ensure this matches what's used during indexing.
-        # Let's assume it's 'asset_id' as per ChunkSchema.
-        query_filter = None
-        # <<< TEMPORARILY COMMENT OUT FILTER LOGIC FOR OPTION A >>>
-        # if file_id:
-        #     query_filter = rest_models.Filter(
-        #         must=[
-        #             rest_models.FieldCondition(
-        #                 key="asset_id",
-        #                 match=rest_models.MatchValue(value=file_id),
-        #             )
-        #         ]
-        #     )
-        #     self.logger.info(f"Applying Qdrant filter for asset_id: {file_id}")
-        self.logger.warning("TEMPORARILY DISABLED asset_id FILTERING for Option A testing.")
-        # <<< END TEMPORARY COMMENT OUT >>>
+        # Embed the query through the same cached path used for indexing
+        query_vectors = self.embed_texts_cached(
+            texts=[query_text],
+            document_type=DocumentTypeEnum.QUERY.value
+        )
+        if not query_vectors:
+            self.logger.error("[NLPController.search_vector_db_collection] Failed to embed query text")
+            return []
+        query_embedding = query_vectors[0]
 
         try:
-            # Perform the search with the filter enabled again
             # self.logger.info("DEBUG: About to call search_by_vector...") # REMOVE Log before call
             results = self.vectordb_client.search_by_vector(
-                collection_name=f"collection_{project_identifier_str}",
+                collection_name=self.create_collection_name(project_id=project_identifier_str),
                 vector=query_embedding,
                 limit=limit,
-                query_filter=query_filter, # Use the filter again
+                filters=self.build_search_filters(project_identifier_str=project_identifier_str, file_id=file_id),
                 score_threshold=score_threshold,
             )
-            # self.logger.info(f"DEBUG: search_by_vector returned. Type: {type(results)}") # REMOVE Log right after call
-
-            # Handle case where the underlying client search returns None
-            if results is None:
-                self.logger.info("VectorDB search returned None (no results found).")
-                return [] # Return empty list if no results
-                
-            self.logger.info(f"VectorDB search returned {len(results)} results.")
-
-            # Convert search results (RetrievedDocument) to the expected dictionary structure
-            processed_results = []
-            # self.logger.info("DEBUG: About to process results in list comprehension...") # REMOVE Log before processing
-            for hit in results:
-                try:
-                    # Adjust to use available attributes: score, text
-                    processed_results.append({
-                        # "id": hit.id, # ID is not available in RetrievedDocument
-                        "score": hit.score,
-                        "text": hit.text, # Directly access text
-                        "metadata": {}, # Metadata is not available in RetrievedDocument
-                    })
-                except AttributeError as ae:
-                    # Keep this specific logging in case the structure changes again
-                    self.logger.error(f"AttributeError processing hit: {ae}")
-                    self.logger.error(f"Problematic hit type: {type(hit)}")
-                    self.logger.error(f"Problematic hit attributes: {dir(hit)}")
-                    try:
-                        self.logger.error(f"Problematic hit object: {hit}")
-                    except Exception as log_e:
-                         self.logger.warning(f"Could not log the full problematic hit object: {log_e}")
-                    # Don't re-raise, just skip the problematic hit for now
-                    # raise ae 
-            return processed_results
-
         except Exception as e:
-            self.logger.error(f"Error during VectorDB search for project {project_identifier_str}: {e}", exc_info=True)
-            # Depending on the Qdrant client, specific exceptions like ValueError for collection not found might be raised.
-            # Handle gracefully or re-raise as appropriate.
-            # For now, return empty list if search fails.
-            if "Collection" in str(e) and "not found" in str(e):
-                 self.logger.warning(f"Collection collection_{project_identifier_str} not found during search.")
+            self.log_search_error(project_identifier_str, e)
             return [] # Return empty list on exception
+
+        return self.process_search_results(results)
+
+    async def asearch_vector_db_collection(
+        self,
+        project_identifier_str: str,
+        query_text: str,
+        limit: int = 5,
+        file_id: Optional[str] = None,
+        score_threshold: Optional[float] = None,
+    ) -> list[dict]:
+        """Async variant of search_vector_db_collection.
+
+        The query is embedded and searched without blocking the event loop,
+        through the async vector DB client when one is configured.
+        """
+        if self.async_vectordb_client is None:
+            return await asyncio.to_thread(
+                self.search_vector_db_collection,
+                project_identifier_str=project_identifier_str,
+                query_text=query_text,
+                limit=limit,
+                file_id=file_id,
+                score_threshold=score_threshold,
+            )
+
+        self.logger.info(
+            f"[NLPController.asearch_vector_db_collection] Searching project {project_identifier_str} "
+            f"for '{query_text[:50]}...', limit: {limit}, file_id: {file_id}, threshold: {score_threshold}"
+        )
+
+        if self.embedding_executor is not None:
+            query_vectors = await self.aembed_texts_cached(
+                texts=[query_text],
+                document_type=DocumentTypeEnum.QUERY.value
+            )
+        else:
+            query_vectors = await asyncio.to_thread(
+                self.embed_texts_cached,
+                texts=[query_text],
+                document_type=DocumentTypeEnum.QUERY.value
+            )
+        if not query_vectors:
+            self.logger.error("[NLPController.asearch_vector_db_collection] Failed to embed query text")
+            return []
+
+        try:
+            results = await self.async_vectordb_client.search_by_vector(
+                collection_name=self.create_collection_name(project_id=project_identifier_str),
+                vector=query_vectors[0],
+                limit=limit,
+                filters=self.build_search_filters(project_identifier_str=project_identifier_str, file_id=file_id),
+                score_threshold=score_threshold,
+            )
+        except Exception as e:
+            self.log_search_error(project_identifier_str, e)
+            return []
+
+        return self.process_search_results(results)
+
+    def search_vector_db_collection_batch(
+        self,
+        project_identifier_str: str,
+        query_texts: List[str],
+        limit: int = 5,
+        file_id: Optional[str] = None,
+        score_threshold: Optional[float] = None,
+    ) -> List[list[dict]]:
+        """Searches several queries at once: one embedding call and one vector DB request.
+
+        Returns:
+            One result list per query text, in order (empty for a failed search)
+        """
+        self.logger.info(
+            f"[NLPController.search_vector_db_collection_batch] Searching project {project_identifier_str} "
+            f"for {len(query_texts)} queries, limit: {limit}, file_id: {file_id}"
+        )
+
+        query_vectors = self.embed_texts_cached(
+            texts=query_texts,
+            document_type=DocumentTypeEnum.QUERY.value
+        )
+        if not query_vectors:
+            self.logger.error("[NLPController.search_vector_db_collection_batch] Failed to embed query texts")
+            return [[] for _ in query_texts]
+
+        try:
+            batch_results = self.vectordb_client.search_batch(
+                collection_name=self.create_collection_name(project_id=project_identifier_str),
+                vectors=query_vectors,
+                limit=limit,
+                filters=self.build_search_filters(project_identifier_str=project_identifier_str, file_id=file_id),
+                score_threshold=score_threshold,
+            )
+        except Exception as e:
+            self.log_search_error(project_identifier_str, e)
+            return [[] for _ in query_texts]
+
+        return self.process_batch_search_results(batch_results, len(query_texts))
+
+    async def asearch_vector_db_collection_batch(
+        self,
+        project_identifier_str: str,
+        query_texts: List[str],
+        limit: int = 5,
+        file_id: Optional[str] = None,
+        score_threshold: Optional[float] = None,
+    ) -> List[list[dict]]:
+        """Async variant of search_vector_db_collection_batch."""
+        if self.async_vectordb_client is None:
+            return await asyncio.to_thread(
+                self.search_vector_db_collection_batch,
+                project_identifier_str=project_identifier_str,
+                query_texts=query_texts,
+                limit=limit,
+                file_id=file_id,
+                score_threshold=score_threshold,
+            )
+
+        self.logger.info(
+            f"[NLPController.asearch_vector_db_collection_batch] Searching project {project_identifier_str} "
+            f"for {len(query_texts)} queries, limit: {limit}, file_id: {file_id}"
+        )
+
+        if self.embedding_executor is not None:
+            query_vectors = await self.aembed_texts_cached(
+                texts=query_texts,
+                document_type=DocumentTypeEnum.QUERY.value
+            )
+        else:
+            query_vectors = await asyncio.to_thread(
+                self.embed_texts_cached,
+                texts=query_texts,
+                document_type=DocumentTypeEnum.QUERY.value
+            )
+        if not query_vectors:
+            self.logger.error("[NLPController.asearch_vector_db_collection_batch] Failed to embed query texts")
+            return [[] for _ in query_texts]
+
+        try:
+            batch_results = await self.async_vectordb_client.search_batch(
+                collection_name=self.create_collection_name(project_id=project_identifier_str),
+                vectors=query_vectors,
+                limit=limit,
+                filters=self.build_search_filters(project_identifier_str=project_identifier_str, file_id=file_id),
+                score_threshold=score_threshold,
+            )
+        except Exception as e:
+            self.log_search_error(project_identifier_str, e)
+            return [[] for _ in query_texts]
+
+        return self.process_batch_search_results(batch_results, len(query_texts))
+
+    def process_batch_search_results(self, batch_results, query_count: int) -> List[list[dict]]:
+        if batch_results is None or len(batch_results) != query_count:
+            self.logger.info("VectorDB batch search returned no results.")
+            return [[] for _ in range(query_count)]
+
+        return [self.process_search_results(results) for results in batch_results]
+
+    def build_search_filters(self, project_identifier_str: str,
+                             file_id: Optional[str] = None) -> Optional[dict]:
+        # Confine the search to the project (shared collections) and optionally to one file,
+        # through keyword-indexed payload fields
+        filters = self.get_tenant_filters(project_identifier_str)
+        if file_id:
+            self.logger.info(f"Applying vector DB filter for asset_id: {file_id}")
+            filters[PayloadFieldEnums.ASSET_ID.value] = str(file_id)
+
+        return filters or None
+
+    def log_search_error(self, project_identifier_str: str, e: Exception):
+        self.logger.error(f"Error during VectorDB search for project {project_identifier_str}: {e}", exc_info=True)
+        # Depending on the Qdrant client, specific exceptions like ValueError for collection not found might be raised.
+        if "Collection" in str(e) and "not found" in str(e):
+             self.logger.warning(f"Collection collection_{project_identifier_str} not found during search.")
+
+    def process_search_results(self, results) -> list[dict]:
+        # Handle case where the underlying client search returns None
+        if results is None:
+            self.logger.info("VectorDB search returned None (no results found).")
+            return [] # Return empty list if no results
+
+        self.logger.info(f"VectorDB search returned {len(results)} results.")
+
+        # Convert search results (RetrievedDocument) to the expected dictionary structure
+        processed_results = []
+        for hit in results:
+            try:
+                processed_results.append({
+                    "id": hit.id, # Mongo chunk id, joinable via ChunkModel.get_chunks_by_ids
+                    "score": hit.score,
+                    "text": hit.text, # Directly access text
+                    "metadata": hit.metadata,
+                })
+            except AttributeError as ae:
+                # Keep this specific logging in case the structure changes again
+                self.logger.error(f"AttributeError processing hit: {ae}")
+                self.logger.error(f"Problematic hit type: {type(hit)}")
+                self.logger.error(f"Problematic hit attributes: {dir(hit)}")
+                try:
+                    self.logger.error(f"Problematic hit object: {hit}")
+                except Exception as log_e:
+                     self.logger.warning(f"Could not log the full problematic hit object: {log_e}")
+                # Don't re-raise, just skip the problematic hit for now
+        return processed_results
     
     def answer_rag_question(
         self,
@@ -183,6 +685,7 @@ class NLPController(BaseController):
         question: str,
         file_id: Optional[str] = None,
         conversation_history: list = None,
+        limit: Optional[int] = None,
     ) -> tuple[str, str, list, Optional[str], Optional[list[dict]]]:
         """Answers a question using RAG, optionally filtering by file_id.
         
@@ -191,6 +694,7 @@ class NLPController(BaseController):
             question: The user's question.
             file_id: Optional file ID to limit search to.
             conversation_history: Optional list of previous message objects with 'role' and 'content'.
+            limit: Number of chunks to retrieve before packing (defaults to RAG_RETRIEVAL_LIMIT).
             
         Returns:
             A tuple of (answer_text, full_prompt, chat_history, extracted_data, extracted_table)
@@ -204,29 +708,357 @@ class NLPController(BaseController):
         retrieved_documents = self.search_vector_db_collection(
             project_identifier_str=project_identifier_str,
             query_text=question,
-            limit=5, 
+            limit=limit or self.app_settings.RAG_RETRIEVAL_LIMIT,
             file_id=file_id
         )
 
+        return self.answer_from_documents(
+            project_identifier_str=project_identifier_str,
+            question=question,
+            retrieved_documents=retrieved_documents,
+            file_id=file_id,
+            conversation_history=conversation_history,
+        )
+
+    async def aanswer_rag_question(
+        self,
+        project_identifier_str: str,
+        question: str,
+        file_id: Optional[str] = None,
+        conversation_history: list = None,
+        index_version: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[str, str, list, Optional[str], Optional[list[dict]]]:
+        """Async variant of answer_rag_question.
+
+        Retrieval runs on the async vector DB client and generation on the
+        provider's async client, so a slow completion never blocks the event
+        loop and one worker serves many concurrent questions.
+
+        When an answer cache is configured and the project's `index_version`
+        is given, the answer is served from the cache on an exact or
+        near-duplicate question of the same scope (project, index version,
+        file, language, conversation history and retrieval limit);
+        `answer_cache_hit` tells which kind of hit it was.
+        """
+        scope, query_vector, cached = await self.alookup_cached_answer(
+            project_identifier_str=project_identifier_str,
+            question=question,
+            file_id=file_id,
+            conversation_history=conversation_history,
+            index_version=index_version,
+            limit=limit,
+        )
+        if cached is not None:
+            return cached
+
+        retrieved_documents = await self.asearch_vector_db_collection(
+            project_identifier_str=project_identifier_str,
+            query_text=question,
+            limit=limit or self.app_settings.RAG_RETRIEVAL_LIMIT,
+            file_id=file_id
+        )
+
+        result = await self.aanswer_from_documents(
+            project_identifier_str=project_identifier_str,
+            question=question,
+            retrieved_documents=retrieved_documents,
+            file_id=file_id,
+            conversation_history=conversation_history,
+        )
+
+        self.store_cached_answer(scope, question, result, query_vector)
+        return result
+
+    async def astream_rag_answer(
+        self,
+        project_identifier_str: str,
+        question: str,
+        file_id: Optional[str] = None,
+        conversation_history: list = None,
+        index_version: Optional[int] = None,
+        limit: Optional[int] = None,
+    ):
+        """Streaming variant of aanswer_rag_question, yielding (event, data) pairs.
+
+        "token" events carry text deltas as the LLM produces them and the final
+        "done" event carries the full answer with its extracted data, like the
+        non-streaming response; "error" ends the stream on an LLM failure.
+        Cached answers are replayed as a single token.
+        """
+        scope, query_vector, cached = await self.alookup_cached_answer(
+            project_identifier_str=project_identifier_str,
+            question=question,
+            file_id=file_id,
+            conversation_history=conversation_history,
+            index_version=index_version,
+            limit=limit,
+        )
+        if cached is not None:
+            yield "token", {"content": cached[0]}
+            yield "done", self.answer_to_dict(cached)
+            return
+
+        retrieved_documents = await self.asearch_vector_db_collection(
+            project_identifier_str=project_identifier_str,
+            query_text=question,
+            limit=limit or self.app_settings.RAG_RETRIEVAL_LIMIT,
+            file_id=file_id
+        )
+
+        async for event, data in self.astream_answer_from_documents(
+            project_identifier_str=project_identifier_str,
+            question=question,
+            retrieved_documents=retrieved_documents,
+            file_id=file_id,
+            conversation_history=conversation_history,
+        ):
+            if event == "token":
+                yield event, {"content": data}
+            elif event == "done":
+                self.store_cached_answer(scope, question, data, query_vector)
+                yield event, self.answer_to_dict(data)
+            else:
+                yield event, {"detail": data}
+
+    async def alookup_cached_answer(
+        self,
+        project_identifier_str: str,
+        question: str,
+        file_id: Optional[str] = None,
+        conversation_history: list = None,
+        index_version: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> tuple:
+        """Looks the question up in the answer cache, exactly first, then by its query embedding.
+
+        The semantic lookup only runs when the cache has a similarity
+        threshold and an embedding executor is configured.
+
+        Returns:
+            A tuple of (scope, query_vector, cached_answer); scope is None when no cache applies
+        """
+        self.answer_cache_hit = None
+        if self.answer_cache is None or index_version is None:
+            return None, None, None
+
+        scope = self.answer_cache.make_scope(
+            project_id=project_identifier_str,
+            index_version=index_version,
+            file_id=file_id,
+            language=self.language,
+            conversation_history=conversation_history,
+            limit=limit or self.app_settings.RAG_RETRIEVAL_LIMIT,
+        )
+
+        cached = self.answer_cache.get(scope, question)
+        if cached is not None:
+            self.answer_cache_hit = "exact"
+            return scope, None, cached
+
+        if not self.answer_cache.similarity_threshold or self.embedding_executor is None:
+            self.answer_cache.get_similar(scope, None)  # Counts the miss
+            return scope, None, None
+
+        # The query vector is kept by the query embedding cache, so the search that follows reuses it
+        query_vectors = await self.aembed_texts_cached(texts=[question], document_type=DocumentTypeEnum.QUERY.value)
+        query_vector = query_vectors[0] if query_vectors else None
+
+        cached, similarity = self.answer_cache.get_similar(scope, query_vector, question)
+        if cached is not None:
+            self.logger.info(f"Answer served from cache for a similar question (similarity {similarity:.4f})")
+            self.answer_cache_hit = "semantic"
+
+        return scope, query_vector, cached
+
+    def store_cached_answer(self, scope: Optional[tuple], question: str, result: tuple, query_vector=None):
+        # Neither "no documents found" nor LLM failures are worth remembering
+        if scope is None or not self.answer_generated:
+            return
+
+        answer_text, full_prompt = result[0], result[1]
+        if answer_text and full_prompt != "No RAG prompt generated.":
+            self.answer_cache.put(scope, question, result, query_vector)
+
+    def answer_to_dict(self, result: tuple) -> dict:
+        answer_text, full_prompt, chat_history, extracted_data, extracted_table = result
+        return {
+            "answer": answer_text,
+            "full_prompt": full_prompt if full_prompt is not None else "",
+            "chat_history": chat_history if chat_history is not None else [],
+            "extracted_data_point": extracted_data,
+            "extracted_table_data": extracted_table,
+            "cache_hit": self.answer_cache_hit,
+            "context": self.context_report,
+        }
+
+    def answer_from_documents(
+        self,
+        project_identifier_str: str,
+        question: str,
+        retrieved_documents: list,
+        file_id: Optional[str] = None,
+        conversation_history: list = None,
+    ) -> tuple[str, str, list, Optional[str], Optional[list[dict]]]:
+        """Builds the RAG prompt from already retrieved documents and asks the LLM."""
         self.logger.info(f"Retrieved {len(retrieved_documents)} documents from vector search.")
+        self.answer_generated = True
 
         if not retrieved_documents or len(retrieved_documents) == 0:
-            self.logger.warning(f"No relevant documents found in vector DB for project {project_identifier_str}, file {file_id}, query '{question[:50]}...'")
-            answer = "I couldn't find relevant information in the uploaded documents to answer that question. I can only answer based on the content you provide."
-            return answer, "No RAG prompt generated.", [], None, None # MODIFIED: Add None for table_data
-        
+            return self.answer_without_documents(project_identifier_str, question, file_id)
+
+        full_prompt, chat_history = self.build_rag_prompt(
+            question=question,
+            retrieved_documents=retrieved_documents,
+            conversation_history=conversation_history,
+        )
+
+        # step4: Retrieve the Answer
+        try:
+            answer_text = self.generation_client.generate_text(
+            prompt=full_prompt,
+            chat_history=chat_history
+        )
+        except Exception as e:
+            self.logger.error(f"Error generating response from LLM: {str(e)}")
+            self.answer_generated = False
+            answer_text = f"I'm sorry, I encountered an error while processing your request: {str(e)}"
+
+        return self.complete_answer(answer_text, full_prompt, chat_history)
+
+    async def aanswer_from_documents(
+        self,
+        project_identifier_str: str,
+        question: str,
+        retrieved_documents: list,
+        file_id: Optional[str] = None,
+        conversation_history: list = None,
+    ) -> tuple[str, str, list, Optional[str], Optional[list[dict]]]:
+        """Async variant of answer_from_documents, awaiting the provider's async client."""
+        self.logger.info(f"Retrieved {len(retrieved_documents)} documents from vector search.")
+        self.answer_generated = True
+
+        if not retrieved_documents or len(retrieved_documents) == 0:
+            return self.answer_without_documents(project_identifier_str, question, file_id)
+
+        full_prompt, chat_history = self.build_rag_prompt(
+            question=question,
+            retrieved_documents=retrieved_documents,
+            conversation_history=conversation_history,
+        )
+
+        try:
+            answer_text = await self.generation_client.agenerate_text(
+                prompt=full_prompt,
+                chat_history=chat_history
+            )
+        except Exception as e:
+            self.logger.error(f"Error generating response from LLM: {str(e)}")
+            self.answer_generated = False
+            answer_text = f"I'm sorry, I encountered an error while processing your request: {str(e)}"
+
+        return self.complete_answer(answer_text, full_prompt, chat_history)
+
+    def complete_answer(self, answer_text: Optional[str], full_prompt: str, chat_history: list) -> tuple:
+        if not answer_text or answer_text.strip() == "":
+            self.logger.error("LLM returned empty response")
+            self.answer_generated = False
+            answer_text = "I processed your request but encountered an issue generating a response. Please try rephrasing your question."
+
+        extracted_numerical_data, extracted_table_data = self.extract_answer_data(answer_text)
+
+        # Return answer, prompt, history, extracted single numerical data, and extracted table data
+        return answer_text, full_prompt, chat_history, extracted_numerical_data, extracted_table_data # MODIFIED
+
+    async def astream_answer_from_documents(
+        self,
+        project_identifier_str: str,
+        question: str,
+        retrieved_documents: list,
+        file_id: Optional[str] = None,
+        conversation_history: list = None,
+    ):
+        """Streaming variant of aanswer_from_documents.
+
+        Yields ("token", text) pairs as the LLM produces them, then a single
+        ("done", result) pair with the answer_from_documents tuple, or
+        ("error", message) if the generation failed.
+        """
+        self.logger.info(f"Retrieved {len(retrieved_documents)} documents from vector search.")
+        self.answer_generated = True
+
+        if not retrieved_documents or len(retrieved_documents) == 0:
+            result = self.answer_without_documents(project_identifier_str, question, file_id)
+            yield "token", result[0]
+            yield "done", result
+            return
+
+        full_prompt, chat_history = self.build_rag_prompt(
+            question=question,
+            retrieved_documents=retrieved_documents,
+            conversation_history=conversation_history,
+        )
+
+        deltas = []
+        try:
+            async for delta in self.generation_client.astream_text(prompt=full_prompt, chat_history=chat_history):
+                deltas.append(delta)
+                yield "token", delta
+        except Exception as e:
+            self.logger.error(f"Error streaming response from LLM: {str(e)}")
+            self.answer_generated = False
+            yield "error", f"I'm sorry, I encountered an error while processing your request: {str(e)}"
+            return
+
+        result = self.complete_answer("".join(deltas), full_prompt, chat_history)
+        if not self.answer_generated:
+            # The empty-response message replaces the (empty) streamed answer
+            yield "token", result[0]
+
+        yield "done", result
+
+    def answer_without_documents(self, project_identifier_str: str, question: str,
+                                 file_id: Optional[str] = None) -> tuple:
+        self.logger.warning(f"No relevant documents found in vector DB for project {project_identifier_str}, file {file_id}, query '{question[:50]}...'")
+        answer = "I couldn't find relevant information in the uploaded documents to answer that question. I can only answer based on the content you provide."
+        return answer, "No RAG prompt generated.", [], None, None # MODIFIED: Add None for table_data
+
+    def build_rag_prompt(self, question: str, retrieved_documents: list,
+                         conversation_history: list = None) -> tuple[str, list]:
+        """Returns the (full_prompt, chat_history) to send to the generation client."""
         # step2: Construct LLM prompt
-        system_prompt = self.template_parser.get("rag", "system_prompt")
+        system_prompt = self.template_parser.get("rag", "system_prompt", language=self.language)
+        footer_prompt = self.template_parser.get("rag", "footer_prompt", {
+            "query": question
+        }, language=self.language)
+
+        # Keep the best chunks and the latest turns that fit the input token budget
+        conversation_history = [
+            msg for msg in (conversation_history if isinstance(conversation_history, list) else [])
+            if isinstance(msg, dict) and 'role' in msg and 'content' in msg
+        ]
+        packed = self.context_packer.pack(
+            fixed_texts=[system_prompt or "", footer_prompt or ""],
+            documents=retrieved_documents,
+            history=conversation_history,
+            document_overhead=self.template_parser.get("rag", "document_prompt", {
+                    "doc_num": len(retrieved_documents),
+                    "chunk_text": "",
+            }, language=self.language) or "",
+        )
+        self.context_report = packed.to_dict()
+        if packed.dropped_documents or packed.trimmed_documents or packed.dropped_turns:
+            self.logger.info(f"Packed RAG context into the token budget: {self.context_report}")
+        retrieved_documents = packed.documents
+        conversation_history = packed.history
+
         documents_prompts = "\n".join([
             self.template_parser.get("rag", "document_prompt", {
                     "doc_num": idx + 1,
                     "chunk_text": doc["text"],
-            })
+            }, language=self.language)
             for idx, doc in enumerate(retrieved_documents)
         ])
-        footer_prompt = self.template_parser.get("rag", "footer_prompt", {
-            "query": question
-        })
 
         # Log the constructed prompts for debugging
         self.logger.info(f"System prompt: {system_prompt[:100]}...")
@@ -245,8 +1077,6 @@ class NLPController(BaseController):
         if conversation_history and isinstance(conversation_history, list):
             self.logger.info(f"[NLPController.answer_rag_question] Adding {len(conversation_history)} messages from conversation history")
             for msg in conversation_history:
-                if not isinstance(msg, dict) or 'role' not in msg or 'content' not in msg:
-                    continue
                 role = self.generation_client.enums.USER.value
                 if msg['role'] == 'assistant':
                     role = self.generation_client.enums.ASSISTANT.value
@@ -281,20 +1111,10 @@ class NLPController(BaseController):
             full_prompt = fallback_prompt
             self.logger.warning("Using fallback prompts due to template loading failure")
 
-        # step4: Retrieve the Answer
-        try:
-            answer_text = self.generation_client.generate_text(
-            prompt=full_prompt,
-            chat_history=chat_history
-        )
-
-            if not answer_text or answer_text.strip() == "":
-                self.logger.error("LLM returned empty response")
-                answer_text = "I processed your request but encountered an issue generating a response. Please try rephrasing your question."
-        except Exception as e:
-            self.logger.error(f"Error generating response from LLM: {str(e)}")
-            answer_text = f"I'm sorry, I encountered an error while processing your request: {str(e)}"
+        return full_prompt, chat_history
 
+    def extract_answer_data(self, answer_text: str) -> tuple[Optional[str], Optional[list]]:
+        """Parses the <extracted_data> value and the <table_data> rows out of an answer."""
         # Parse single numerical data from <extracted_data> tag
         extracted_numerical_data = None
         if answer_text:
@@ -339,8 +1159,7 @@ class NLPController(BaseController):
             else:
                 self.logger.info("No <table_data> tag found by regex.") # LOG 5
 
-        # Return answer, prompt, history, extracted single numerical data, and extracted table data
-        return answer_text, full_prompt, chat_history, extracted_numerical_data, extracted_table_data # MODIFIED
+        return extracted_numerical_data, extracted_table_data
         
     def direct_llm_query(self, question: str, conversation_history: list = None) -> str:
         """Sends a direct query to the LLM without using RAG context.
@@ -355,38 +1174,8 @@ class NLPController(BaseController):
         self.logger.info(f"[NLPController.direct_llm_query] Processing query: '{question[:50]}...'")
         
         try:
-            # Construct a system prompt for general chat
-            system_prompt = self.template_parser.get("general", "system_prompt", fallback="You are a helpful financial assistant that provides clear and concise answers.")
-            self.logger.info(f"[NLPController.direct_llm_query] Using system prompt: '{system_prompt[:50]}...'")
-            
-            # Create chat history with system prompt
-            chat_history = [
-                self.generation_client.construct_prompt(
-                    prompt=system_prompt,
-                    role=self.generation_client.enums.SYSTEM.value,
-                )
-            ]
-            
-            # Add conversation history if provided
-            if conversation_history and isinstance(conversation_history, list):
-                self.logger.info(f"[NLPController.direct_llm_query] Adding {len(conversation_history)} messages from conversation history")
-                
-                for msg in conversation_history:
-                    if not isinstance(msg, dict) or 'role' not in msg or 'content' not in msg:
-                        continue
-                        
-                    # Map role from frontend to LLM client roles
-                    role = self.generation_client.enums.USER.value
-                    if msg['role'] == 'assistant':
-                        role = self.generation_client.enums.ASSISTANT.value
-                        
-                    chat_history.append(
-                        self.generation_client.construct_prompt(
-                            prompt=msg['content'],
-                            role=role
-                        )
-                    )
-            
+            chat_history = self.build_general_chat_history(conversation_history)
+
             # Generate response directly from the LLM
             self.logger.info(f"[NLPController.direct_llm_query] Calling generation_client.generate_text with {len(chat_history)} messages in history")
             response = self.generation_client.generate_text(
@@ -403,4 +1192,83 @@ class NLPController(BaseController):
             
         except Exception as e:
             self.logger.error(f"[NLPController.direct_llm_query] Error in direct_llm_query: {e}", exc_info=True)
-            return "I encountered an error while processing your request. Please try again with a simpler question or check back later." 
\ No newline at end of file
+            return "I encountered an error while processing your request. Please try again with a simpler question or check back later."
+
+    async def adirect_llm_query(self, question: str, conversation_history: list = None) -> str:
+        """Async variant of direct_llm_query, awaiting the provider's async client."""
+        self.logger.info(f"[NLPController.adirect_llm_query] Processing query: '{question[:50]}...'")
+
+        try:
+            chat_history = self.build_general_chat_history(conversation_history)
+            response = await self.generation_client.agenerate_text(
+                prompt=question,
+                chat_history=chat_history
+            )
+
+            if not response:
+                self.logger.warning(f"[NLPController.adirect_llm_query] LLM returned empty response for query: '{question[:50]}...'")
+                return "I'm sorry, I couldn't generate a response for your query. Please try asking a different question."
+
+            return response
+
+        except Exception as e:
+            self.logger.error(f"[NLPController.adirect_llm_query] Error in adirect_llm_query: {e}", exc_info=True)
+            return "I encountered an error while processing your request. Please try again with a simpler question or check back later."
+
+    async def astream_direct_llm_query(self, question: str, conversation_history: list = None):
+        """Streaming variant of adirect_llm_query, yielding (event, data) pairs like astream_rag_answer."""
+        self.logger.info(f"[NLPController.astream_direct_llm_query] Processing query: '{question[:50]}...'")
+
+        deltas = []
+        try:
+            chat_history = self.build_general_chat_history(conversation_history)
+            async for delta in self.generation_client.astream_text(prompt=question, chat_history=chat_history):
+                deltas.append(delta)
+                yield "token", {"content": delta}
+        except Exception as e:
+            self.logger.error(f"[NLPController.astream_direct_llm_query] Error in astream_direct_llm_query: {e}", exc_info=True)
+            yield "error", {"detail": "I encountered an error while processing your request. Please try again with a simpler question or check back later."}
+            return
+
+        response = "".join(deltas)
+        if not response:
+            self.logger.warning(f"[NLPController.astream_direct_llm_query] LLM returned empty response for query: '{question[:50]}...'")
+            response = "I'm sorry, I couldn't generate a response for your query. Please try asking a different question."
+            yield "token", {"content": response}
+
+        yield "done", {"answer": response}
+
+    def build_general_chat_history(self, conversation_history: list = None) -> list:
+        # Construct a system prompt for general chat
+        system_prompt = self.template_parser.get("general", "system_prompt", fallback="You are a helpful financial assistant that provides clear and concise answers.", language=self.language)
+        self.logger.info(f"[NLPController.direct_llm_query] Using system prompt: '{system_prompt[:50]}...'")
+        
+        # Create chat history with system prompt
+        chat_history = [
+            self.generation_client.construct_prompt(
+                prompt=system_prompt,
+                role=self.generation_client.enums.SYSTEM.value,
+            )
+        ]
+        
+        # Add conversation history if provided
+        if conversation_history and isinstance(conversation_history, list):
+            self.logger.info(f"[NLPController.direct_llm_query] Adding {len(conversation_history)} messages from conversation history")
+            
+            for msg in conversation_history:
+                if not isinstance(msg, dict) or 'role' not in msg or 'content' not in msg:
+                    continue
+                    
+                # Map role from frontend to LLM client roles
+                role = self.generation_client.enums.USER.value
+                if msg['role'] == 'assistant':
+                    role = self.generation_client.enums.ASSISTANT.value
+                    
+                chat_history.append(
+                    self.generation_client.construct_prompt(
+                        prompt=msg['content'],
+                        role=role
+                    )
+                )
+
+        return chat_history 
\ No newline at end of file
@@ -1,5 +1,6 @@
 from .BaseController import BaseController
 from .ProjectController import ProjectController
+import asyncio
 import os
 from langchain_community.document_loaders import TextLoader
 from langchain_community.document_loaders import PyMuPDFLoader
@@ -7,6 +8,7 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 from models import ProcessingEnum
 import logging
 import sys
+from typing import AsyncIterable, AsyncIterator, Iterator, List
 from langchain.docstore.document import Document
 
 class ProcessController(BaseController):
@@ -64,6 +66,95 @@ class ProcessController(BaseController):
 
         return None
 
+    def iter_file_content(self, file_id: str) -> Iterator[Document]:
+        """Lazily yields the file's documents (one per PDF page) instead of loading them all."""
+        loader = self.get_file_loader(file_id=file_id)
+        if loader:
+            yield from loader.lazy_load()
+
+    def get_text_splitter(self, chunk_size: int, overlap_size: int):
+        return RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=overlap_size,
+            length_function=len,
+            separators=["\n\n", "\n", " ", ""],
+            add_start_index=True
+        )
+
+    def get_empty_content_chunk(self, file_id: str) -> Document:
+        return Document(
+            page_content="[This document appears to contain no extractable text content]",
+            metadata={"source": file_id, "empty_content": True}
+        )
+
+    def split_page(self, page: Document, text_splitter, page_no: int) -> List[Document]:
+        """Splits a single page into chunks carrying page and character-offset metadata.
+
+        Args:
+            page: Document holding one page (or a whole text file)
+            text_splitter: Splitter returned by get_text_splitter
+            page_no: Position of the page in the file, used when the loader set no page
+
+        Returns:
+            The page's chunks; empty for blank pages
+        """
+        if not page.page_content or not page.page_content.strip():
+            return []
+
+        metadata = page.metadata.copy() if page.metadata else {}
+        metadata.setdefault("page", page_no)
+
+        try:
+            chunks = text_splitter.create_documents([page.page_content], metadatas=[metadata])
+        except Exception as e:
+            self.logger.error(f"Error while chunking page {page_no}: {str(e)}", exc_info=True)
+            metadata["fallback_chunk"] = True
+            return [Document(page_content=page.page_content, metadata=metadata)]
+
+        for chunk in chunks:
+            chunk.metadata["end_index"] = chunk.metadata.get("start_index", 0) + len(chunk.page_content)
+
+        # Keep the page as a single chunk rather than losing its text
+        return chunks or [Document(page_content=page.page_content, metadata=metadata)]
+
+    async def iter_file_chunks(self, file_content: AsyncIterable[Document], file_id: str,
+                               chunk_size: int=100, overlap_size: int=20) -> AsyncIterator[Document]:
+        """Streaming variant of process_file_content.
+
+        Chunks are yielded page by page as `file_content` is consumed, so only
+        the current page is held in memory and callers can embed the first
+        chunks while later pages are still being parsed. Pages are split in a
+        worker thread so the event loop is never blocked.
+
+        Args:
+            file_content: Async iterable of Document objects, one per page
+            file_id: File identifier
+            chunk_size: Size of each chunk
+            overlap_size: Overlap between chunks
+
+        Yields:
+            Chunk documents with `page`, `start_index` and `end_index` metadata
+        """
+        text_splitter = self.get_text_splitter(chunk_size=chunk_size, overlap_size=overlap_size)
+
+        chunk_count = 0
+        page_no = 0
+        async for page in file_content:
+            page_chunks = await asyncio.to_thread(
+                self.split_page, page=page, text_splitter=text_splitter, page_no=page_no
+            )
+            page_no += 1
+            for chunk in page_chunks:
+                chunk_count += 1
+                yield chunk
+
+        if chunk_count == 0:
+            self.logger.warning(f"No valid text content found in file_id: {file_id}, creating fallback chunk")
+            yield self.get_empty_content_chunk(file_id=file_id)
+            return
+
+        self.logger.info(f"Streamed {chunk_count} chunks for file_id: {file_id}")
+
     def process_file_content(self, file_content: list, file_id: str,
                             chunk_size: int=100, overlap_size: int=20):
         """
@@ -401,17 +401,14 @@ async def upload_file_proxy(project_id: str, file: UploadFile):
     """
     Proxy file uploads to the backend server
     """
-    import io
-    
     try:
-        # Read the file content
-        content = await file.read()
-        
-        # Create a new file object for the backend request
-        backend_file = {"file": (file.filename, io.BytesIO(content), file.content_type)}
+        # Stream the spooled upload straight through instead of copying it into memory
+        await file.seek(0)
+        file_size = file.size or 0
+        backend_file = {"file": (file.filename, file.file, file.content_type)}
         
         # Send the file to the backend server - use the correct API path
-        logger.info(f"Proxying file upload to backend: {file.filename} (size: {len(content)} bytes)")
+        logger.info(f"Proxying file upload to backend: {file.filename} (size: {file_size} bytes)")
         
         # Use a much longer timeout for large files
         async with httpx.AsyncClient(timeout=httpx.Timeout(120.0)) as client:
@@ -452,7 +449,7 @@ async def upload_file_proxy(project_id: str, file: UploadFile):
                         new_doc = {
                             "id": response_data["file_id"],
                             "filename": file.filename,
-                            "size": f"{len(content) / 1024:.1f} KB",
+                            "size": f"{file_size / 1024:.1f} KB",
                             "date": "Today"
                         }
                         
@@ -1,5 +1,6 @@
 """API utility functions to reduce code duplication."""
 
+import json
 import logging
 import httpx
 from typing import Dict, Any, Optional, Union
@@ -65,4 +66,16 @@ def create_error_response(
     if extra_fields:
         content.update(extra_fields)
         
-    return JSONResponse(status_code=status_code, content=content) 
\ No newline at end of file
+    return JSONResponse(status_code=status_code, content=content)
+
+def format_sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Events message with a JSON payload.
+    
+    Args:
+        event: The event name (token, done or error)
+        data: The JSON-serializable event payload
+        
+    Returns:
+        The event, terminated by the blank line that dispatches it
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n" 
\ No newline at end of file
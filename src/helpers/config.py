@@ -27,9 +27,15 @@ class Settings(BaseSettings):
     GENERATION_DEFAULT_MAX_TOKENS: int = 7500
     GENERATION_DEFAULT_TEMPERATURE: float = 0.7
 
-    VECTOR_DB_BACKEND: str = "chroma"
+    RAG_RETRIEVAL_LIMIT: int = 10  # Chunks retrieved per question before packing
+    RAG_CONTEXT_MAX_TOKENS: int = 6000  # Input token budget of a RAG prompt
+    RAG_HISTORY_MAX_TOKENS: int = 1500  # Part of the budget conversation turns may use
+
+    VECTOR_DB_BACKEND: str = "qdrant"  # Options: "qdrant", "numpy"
     VECTOR_DB_PATH: str = "./data/vectordb"
     VECTOR_DB_DISTANCE_METHOD: str = "cosine"
+    VECTOR_DB_COLLECTION_MODE: str = "per_project"  # "per_project" or "shared" (one collection for all projects)
+    VECTOR_DB_SHARED_COLLECTION_NAME: str = "collection_shared"
 
     PRIMARY_LANG: str = "english"
     DEFAULT_LANG: str = "english"
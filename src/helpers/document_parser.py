@@ -0,0 +1,256 @@
+"""Process-pool document parsing with per-worker memory and time limits."""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator, List, Optional
+
+from langchain.docstore.document import Document
+from models import ProcessingEnum
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = logging.getLogger('uvicorn.error')
+
+class DocumentParserError(Exception):
+    """Raised when a document cannot be parsed within the worker limits."""
+
+def _current_address_space() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+def _init_worker(memory_limit_mb: int, worker_pids):
+    """Reports the worker's PID to the pool and caps how much address space it may add on top of its baseline."""
+    worker_pids.put(os.getpid())
+    if resource is not None and memory_limit_mb:
+        limit = _current_address_space() + memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("Parser task exceeded its time limit")
+
+def _run_with_alarm(time_limit: int, func, *args):
+    """Runs `func` under SIGALRM so a slow page range fails inside the worker."""
+    if not time_limit or not hasattr(signal, "SIGALRM"):
+        return func(*args)
+
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.alarm(time_limit)
+    try:
+        return func(*args)
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+
+def _count_pdf_pages(file_path: str) -> int:
+    import fitz
+
+    with fitz.open(file_path) as pdf:
+        return pdf.page_count
+
+def _extract_pdf_pages(file_path: str, start: int, end: int) -> list:
+    import fitz
+
+    pages = []
+    with fitz.open(file_path) as pdf:
+        total_pages = pdf.page_count
+        for page_no in range(start, min(end, total_pages)):
+            pages.append((
+                pdf[page_no].get_text(),
+                {
+                    "source": file_path,
+                    "file_path": file_path,
+                    "page": page_no,
+                    "total_pages": total_pages,
+                },
+            ))
+    return pages
+
+def _extract_text_file(file_path: str) -> list:
+    with open(file_path, encoding="utf-8") as f:
+        return [(f.read(), {"source": file_path})]
+
+def count_pdf_pages(file_path: str, time_limit: int) -> int:
+    return _run_with_alarm(time_limit, _count_pdf_pages, file_path)
+
+def extract_pdf_pages(file_path: str, start: int, end: int, time_limit: int) -> list:
+    return _run_with_alarm(time_limit, _extract_pdf_pages, file_path, start, end)
+
+def extract_text_file(file_path: str, time_limit: int) -> list:
+    return _run_with_alarm(time_limit, _extract_text_file, file_path)
+
+class DocumentParserPool:
+    """Parses PDF and text files in a pool of worker processes.
+
+    PDFs are split into page ranges that are parsed in parallel across cores.
+    Every worker runs with an address-space limit and every task with a time
+    limit, so a pathological file fails its ingestion job instead of taking
+    the API process down. A pool whose worker died or hung is torn down and
+    recreated transparently for the next document.
+    """
+
+    def __init__(self, max_workers: int = None, pages_per_task: int = 16,
+                 memory_limit_mb: int = 1024, task_timeout: int = 120):
+        """Initialize the parser pool.
+
+        Args:
+            max_workers: Number of parser processes (defaults to the CPU count)
+            pages_per_task: Number of PDF pages parsed by a single task
+            memory_limit_mb: Address space each worker may grow by while parsing (0 disables)
+            task_timeout: Seconds a single task may run before it is aborted
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_task = max(1, pages_per_task)
+        self.memory_limit_mb = memory_limit_mb
+        self.task_timeout = task_timeout
+        self.executor: Optional[ProcessPoolExecutor] = None
+        # PIDs the current pool's workers report from their initializer
+        self.worker_pid_queue = None
+        # Resubmissions after a crash run one at a time, see `_submit`
+        self.retry_lock = asyncio.Lock()
+
+    def start(self):
+        # spawn avoids forking the API process with its threads and open clients
+        mp_context = multiprocessing.get_context("spawn")
+        self.worker_pid_queue = mp_context.Queue()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(self.memory_limit_mb, self.worker_pid_queue),
+        )
+        logger.info(f"Document parser pool started with {self.max_workers} worker(s)")
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.worker_pid_queue = None
+
+    def get_worker_pids(self) -> set:
+        """PIDs of the workers the current pool has started so far."""
+        pids = set()
+        while self.worker_pid_queue is not None:
+            try:
+                pids.add(self.worker_pid_queue.get_nowait())
+            except queue.Empty:
+                break
+        return pids
+
+    def _restart(self):
+        """Kills the current workers (possibly hung or over their limits) and starts fresh ones.
+
+        Every other task still in the old pool then fails with BrokenProcessPool
+        rather than being cancelled, so `_submit` can resubmit it to the new pool.
+        """
+        if self.executor is not None:
+            # ProcessPoolExecutor offers no public way to kill running tasks. Only
+            # live children are terminated, so a recycled PID is never signalled
+            worker_pids = self.get_worker_pids()
+            for process in multiprocessing.active_children():
+                if process.pid in worker_pids:
+                    process.terminate()
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        self.start()
+
+    async def _submit(self, func, *args, retries: int = 1):
+        if self.executor is None:
+            self.start()
+
+        executor = self.executor
+        loop = asyncio.get_running_loop()
+        try:
+            # The in-worker alarm fires first; this outer timeout catches tasks
+            # stuck in native code where the signal handler cannot run
+            return await asyncio.wait_for(
+                loop.run_in_executor(executor, func, *args, self.task_timeout),
+                timeout=self.task_timeout + 5 if self.task_timeout else None,
+            )
+        except asyncio.TimeoutError:
+            if executor is self.executor:
+                logger.error(f"Parser task {func.__name__}{args} timed out, restarting parser pool")
+                self._restart()
+            raise DocumentParserError("Document parsing timed out")
+        except BrokenProcessPool:
+            # Only the first task to notice a broken pool replaces it
+            if executor is self.executor:
+                logger.error(f"Parser worker died while running {func.__name__}{args}, restarting parser pool")
+                self._restart()
+
+            # A dead worker takes every task of its pool down with it and there
+            # is no telling which one caused it, so each gets one more try on the
+            # fresh pool. Those run one at a time: a task that crashes its retry
+            # is the culprit, and it cannot take an innocent retry down with it
+            if retries > 0:
+                async with self.retry_lock:
+                    logger.warning(f"Resubmitting parser task {func.__name__}{args} to the restarted pool")
+                    return await self._submit(func, *args, retries=retries - 1)
+            raise DocumentParserError("Document parser worker crashed (likely exceeded its memory limit)")
+        except (MemoryError, TimeoutError) as e:
+            raise DocumentParserError(f"Document parsing exceeded its limits: {e}")
+
+    def get_page_ranges(self, page_count: int) -> List[tuple]:
+        return [
+            (start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        ]
+
+    async def iter_pages(self, file_path: str) -> AsyncIterator[List[Document]]:
+        """Yields parsed pages range by range, in page order.
+
+        Up to two ranges per worker are parsed ahead in parallel; results are
+        yielded in order as soon as the leading range is done, so memory stays
+        bounded however many pages the document has.
+        """
+        file_ext = os.path.splitext(file_path)[-1].lower()
+
+        if file_ext == ProcessingEnum.TXT.value:
+            pages = await self._submit(extract_text_file, file_path)
+            yield [Document(page_content=text, metadata=metadata) for text, metadata in pages]
+            return
+
+        if file_ext != ProcessingEnum.PDF.value:
+            raise DocumentParserError(f"Unsupported file type: {file_ext}")
+
+        page_count = await self._submit(count_pdf_pages, file_path)
+        page_ranges = deque(self.get_page_ranges(page_count))
+        tasks = deque()
+
+        def submit_next():
+            start, end = page_ranges.popleft()
+            tasks.append(asyncio.ensure_future(self._submit(extract_pdf_pages, file_path, start, end)))
+
+        try:
+            while page_ranges and len(tasks) < self.max_workers * 2:
+                submit_next()
+
+            while tasks:
+                pages = await tasks.popleft()
+                if page_ranges:
+                    submit_next()
+                yield [Document(page_content=text, metadata=metadata) for text, metadata in pages]
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Retrieve exceptions of abandoned tasks so they are not logged as unhandled
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def parse(self, file_path: str) -> List[Document]:
+        """Parses the whole file and returns one Document per page."""
+        documents = []
+        async for pages in self.iter_pages(file_path):
+            documents.extend(pages)
+        return documents
@@ -0,0 +1,199 @@
+"""Bounded worker pool that drains queued ingestion jobs in the background."""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import List, Optional
+
+from bson import ObjectId
+
+from controllers import IngestionController
+from models.IngestionJobModel import IngestionJobModel
+
+logger = logging.getLogger('uvicorn.error')
+
+class IngestionQueue:
+    """In-process job queue for document ingestion.
+
+    Upload requests only persist the file and enqueue a job id; a fixed number
+    of worker tasks pull job ids from the queue and run them through
+    IngestionController, so upload latency stays constant while ingestion
+    throughput scales with the number of workers.
+
+    Several API processes may share the jobs collection, so a worker first
+    claims a job atomically (queued -> running, with this process as owner
+    and a lease it keeps renewing) and skips it if another process got it.
+    A recovery task regularly enqueues the jobs waiting for a worker: queued
+    jobs that did not fit in the queue, and running jobs whose owner stopped
+    renewing its lease.
+    """
+
+    def __init__(self, app, num_workers: int = 2, max_size: int = 100, batch_size: int = 256,
+                 pipeline_queue_size: int = 2, lease_seconds: int = 300,
+                 recovery_interval: int = 30):
+        """Initialize the queue.
+
+        Args:
+            app: FastAPI application holding the shared clients
+            num_workers: Number of concurrent ingestion workers
+            max_size: Maximum number of pending jobs (0 for unbounded)
+            batch_size: Number of chunks a job stores, embeds and indexes at a time
+            pipeline_queue_size: Number of batches buffered between a job's stages
+            lease_seconds: How long a claimed job stays ours without being renewed
+            recovery_interval: Seconds between two scans for jobs waiting for a worker
+        """
+        self.app = app
+        self.num_workers = max(1, num_workers)
+        self.batch_size = batch_size
+        self.pipeline_queue_size = pipeline_queue_size
+        self.lease_seconds = max(10, lease_seconds)
+        self.recovery_interval = max(1, recovery_interval)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        # Job ids in the queue, so the recovery scan does not enqueue them twice
+        self.pending: set = set()
+        self.workers: List[asyncio.Task] = []
+        self.recovery_task: Optional[asyncio.Task] = None
+        # Set by a worker that ran out of jobs, to scan for more without waiting for the interval
+        self.wakeup = asyncio.Event()
+
+    async def start(self):
+        """Start the workers, and the recovery of jobs interrupted by a restart or left waiting."""
+        self.workers = [
+            asyncio.create_task(self._worker(worker_no=i + 1))
+            for i in range(self.num_workers)
+        ]
+        logger.info(f"Ingestion queue started with {self.num_workers} worker(s) as {self.owner}")
+
+        if self.app.db_client is None:
+            return
+
+        await IngestionJobModel.create_instance(db_client=self.app.db_client)
+        self.recovery_task = asyncio.create_task(self._recover_jobs())
+
+    async def stop(self):
+        """Cancel all workers; the jobs they were running go back to the queue."""
+        tasks = self.workers + ([self.recovery_task] if self.recovery_task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.workers = []
+        self.recovery_task = None
+        logger.info("Ingestion queue stopped")
+
+    def enqueue(self, job_id: str) -> bool:
+        """Add a job id to the queue.
+
+        Returns:
+            False when the queue is full, True otherwise
+        """
+        if job_id in self.pending:
+            return True
+
+        try:
+            self.queue.put_nowait(job_id)
+        except asyncio.QueueFull:
+            logger.warning(f"Ingestion queue is full, could not enqueue job {job_id}")
+            return False
+
+        self.pending.add(job_id)
+        return True
+
+    def qsize(self) -> int:
+        return self.queue.qsize()
+
+    async def _worker(self, worker_no: int):
+        while True:
+            job_id = await self.queue.get()
+            self.pending.discard(job_id)
+            try:
+                await self._run_job(job_id=job_id, worker_no=worker_no)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ingestion worker {worker_no} crashed on job {job_id}: {e}", exc_info=True)
+            finally:
+                self.queue.task_done()
+                if self.queue.empty():
+                    self.wakeup.set()
+
+    async def _recover_jobs(self):
+        job_model = IngestionJobModel(db_client=self.app.db_client)
+        while True:
+            try:
+                free_slots = self.queue.maxsize - self.queue.qsize() if self.queue.maxsize else 0
+                if free_slots or not self.queue.maxsize:
+                    # Jobs already in our queue are listed too, hence the larger limit
+                    limit = free_slots + len(self.pending) if free_slots else 0
+                    for job_id in await job_model.get_claimable_job_ids(limit=limit):
+                        # Jobs that do not fit stay queued in the database for the next scan
+                        if not self.enqueue(str(job_id)):
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ingestion job recovery failed: {e}")
+
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=self.recovery_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+
+    async def _renew_lease(self, job_model: IngestionJobModel, job_id: ObjectId, run_task: asyncio.Task):
+        """Keeps the job's lease alive; once it is lost, stops the run so two workers never write the same asset.
+
+        Returns:
+            True when the lease was lost
+        """
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if not await job_model.renew_lease(job_id=job_id, owner=self.owner,
+                                                   lease_seconds=self.lease_seconds):
+                    logger.warning(f"Lost the lease of ingestion job {job_id}, stopping it")
+                    run_task.cancel()
+                    return True
+            except Exception as e:
+                logger.error(f"Could not renew the lease of ingestion job {job_id}: {e}")
+
+    async def _run_job(self, job_id: str, worker_no: int):
+        job_model = IngestionJobModel(db_client=self.app.db_client)
+        job = await job_model.claim_job(job_id=ObjectId(job_id), owner=self.owner,
+                                        lease_seconds=self.lease_seconds)
+        if job is None:
+            logger.info(f"Ingestion worker {worker_no}: job {job_id} is done or claimed by another worker")
+            return
+
+        logger.info(f"Ingestion worker {worker_no} picked up job {job_id}")
+        ingestion_controller = IngestionController(
+            db_client=self.app.db_client,
+            vectordb_client=self.app.vectordb_client,
+            generation_client=self.app.generation_client,
+            embedding_client=self.app.embedding_client,
+            template_parser=self.app.template_parser,
+            logger=logger,
+            embedding_executor=self.app.embedding_executor,
+            embedding_cache=self.app.embedding_cache,
+            document_parser=self.app.document_parser,
+            batch_size=self.batch_size,
+            queue_size=self.pipeline_queue_size
+        )
+
+        run_task = asyncio.create_task(ingestion_controller.run_job(job=job, owner=self.owner))
+        lease_task = asyncio.create_task(self._renew_lease(job_model, job.id, run_task))
+        try:
+            # Cancelling this worker cancels the awaited run as well
+            await run_task
+        except asyncio.CancelledError:
+            if lease_task.done() and not lease_task.cancelled() and lease_task.result():
+                # Another worker owns the job now and runs it from the start
+                logger.warning(f"Ingestion worker {worker_no} abandoned job {job_id} after losing its lease")
+                return
+            # Shutting down: let the next start (or another process) resume the job right away
+            await job_model.release_job(job_id=job.id, owner=self.owner)
+            raise
+        finally:
+            lease_task.cancel()
@@ -0,0 +1,131 @@
+"""Coalescing of identical concurrent computations within one process."""
+
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+class StreamFlight:
+    """One in-flight stream: the events produced so far and its subscribers."""
+
+    def __init__(self):
+        self.events: list = []
+        self.finished = False
+        self.error = None
+        self.subscribers = 0
+        self.task = None
+        self.condition = asyncio.Condition()
+
+class SingleFlight:
+    """Runs a computation once for all concurrent callers asking for the same key.
+
+    The first caller of a key starts the computation in its own task and
+    later callers await that task instead of repeating the work, until it
+    finishes; the next caller then starts a new one. Results and exceptions
+    are shared as they are.
+
+    stream() does the same for async generators: followers first replay the
+    events the leader's stream already produced, then receive the following
+    ones as they arrive, so every subscriber sees the same sequence. A stream
+    is cancelled once all of its subscribers are gone; an awaited computation
+    always runs to completion. Meant to be used from the event loop.
+    """
+
+    def __init__(self):
+        self.calls: dict = {}
+        self.streams: "dict[str, StreamFlight]" = {}
+
+        self.leaders = 0
+        self.followers = 0
+        self.stream_leaders = 0
+        self.stream_followers = 0
+        self.cancelled_streams = 0
+
+    async def run(self, key: str, compute: Callable[[], Awaitable]):
+        """Returns the result of `compute()`, shared with concurrent callers of `key`."""
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.create_task(compute())
+            self.calls[key] = task
+            task.add_done_callback(lambda done: self._forget_call(key, done))
+            self.leaders += 1
+        else:
+            self.followers += 1
+
+        # A caller that goes away does not cancel the computation of the others
+        return await asyncio.shield(task)
+
+    async def stream(self, key: str, produce: Callable[[], AsyncIterator]) -> AsyncIterator:
+        """Yields the items of `produce()`, shared with concurrent subscribers of `key`."""
+        flight = self.streams.get(key)
+        if flight is None:
+            flight = StreamFlight()
+            self.streams[key] = flight
+            flight.task = asyncio.create_task(self._pump(key, flight, produce()))
+            self.stream_leaders += 1
+        else:
+            self.stream_followers += 1
+
+        flight.subscribers += 1
+        position = 0
+        try:
+            while True:
+                async with flight.condition:
+                    await flight.condition.wait_for(lambda: position < len(flight.events) or flight.finished)
+                    events = flight.events[position:]
+
+                if not events:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+
+                for event in events:
+                    position += 1
+                    yield event
+        finally:
+            flight.subscribers -= 1
+            if not flight.subscribers and not flight.task.done():
+                # Nobody is listening anymore: stop the producer, and let a new caller start afresh
+                self.cancelled_streams += 1
+                self._forget_stream(key, flight)
+                flight.task.cancel()
+
+    async def _pump(self, key: str, flight: StreamFlight, events: AsyncIterator):
+        try:
+            async for event in events:
+                async with flight.condition:
+                    flight.events.append(event)
+                    flight.condition.notify_all()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            flight.error = e
+        finally:
+            self._forget_stream(key, flight)
+            await events.aclose()
+            async with flight.condition:
+                flight.finished = True
+                flight.condition.notify_all()
+
+    def _forget_call(self, key: str, task: asyncio.Task):
+        if self.calls.get(key) is task:
+            del self.calls[key]
+        # Mark a failure as retrieved even when every caller went away
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Single-flight computation for {key} failed: {task.exception()}")
+
+    def _forget_stream(self, key: str, flight: StreamFlight):
+        if self.streams.get(key) is flight:
+            del self.streams[key]
+
+    def get_stats(self) -> dict:
+        return {
+            "in_flight": len(self.calls),
+            "in_flight_streams": len(self.streams),
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "stream_leaders": self.stream_leaders,
+            "stream_followers": self.stream_followers,
+            "cancelled_streams": self.cancelled_streams,
+        }
@@ -0,0 +1,45 @@
+"""Throughput accounting for the stages of a pipelined job."""
+
+import time
+from contextlib import contextmanager
+
+class StageMetrics:
+    """Counters and timings of one pipeline stage.
+
+    Time is split into `busy` (doing the stage's own work), `starved`
+    (waiting for input from the previous stage) and `blocked` (waiting for
+    room in the next stage's queue). The stage with the most busy time bounds
+    the pipeline; blocked time upstream of it is backpressure at work.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+        self.starved_seconds = 0.0
+        self.blocked_seconds = 0.0
+
+    @contextmanager
+    def timed(self, kind: str = "busy"):
+        """Adds the duration of the block to the `kind` timer (busy, starved or blocked)."""
+        attr = f"{kind}_seconds"
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            setattr(self, attr, getattr(self, attr) + time.perf_counter() - started_at)
+
+    def add(self, items: int):
+        self.items += items
+        self.batches += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "starved_seconds": round(self.starved_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "items_per_second": round(self.items / self.busy_seconds, 2) if self.busy_seconds else None,
+        }
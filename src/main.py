@@ -1,4 +1,5 @@
 import os
+import asyncio
 from typing import Dict, List, Optional, Union
 import httpx
 import logging
@@ -13,8 +14,18 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from config import get_settings
 from stores.llm.LLMProviderFactory import LLMProviderFactory
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from stores.vectordb.providers.ThreadedVectorDBAdapter import ThreadedVectorDBAdapter
 from stores.llm.templates.template_parser import TemplateParser
 from stores.llm.providers.FallbackProvider import FallbackProvider
+from stores.llm.AsyncEmbeddingExecutor import AsyncEmbeddingExecutor
+from stores.llm.EmbeddingCache import EmbeddingCache
+from stores.llm.QueryEmbeddingCache import QueryEmbeddingCache
+from stores.llm.AnswerCache import AnswerCache
+from stores.llm.ConversationManager import ConversationManager
+from controllers.BaseController import BaseController
+from helpers.ingestion_queue import IngestionQueue
+from helpers.document_parser import DocumentParserPool
+from helpers.single_flight import SingleFlight
 
 from routes import base, data, nlp
 from langdetect import detect
@@ -26,6 +37,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def close_idle_vector_collections(vectordb_client, interval: int = 60):
+    """Periodically closes embedded vector collections that have been idle too long."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(vectordb_client.close_idle_collections)
+        except Exception as e:
+            logger.error(f"Closing idle vector collections failed: {str(e)}")
+
 # Define lifespan context manager
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -36,6 +56,7 @@ async def lifespan(app: FastAPI):
     - LLM providers
     - Vector database
     - Template parser
+    - Ingestion worker pool
     """
     # Startup code
     settings = get_settings()
@@ -45,8 +66,17 @@ async def lifespan(app: FastAPI):
     app.db_client = None
     app.generation_client = None
     app.embedding_client = None
+    app.embedding_executor = None
+    app.embedding_cache = None
+    app.query_embedding_cache = None
+    app.answer_cache = None
+    app.single_flight = None
     app.vectordb_client = None
+    app.async_vectordb_client = None
     app.template_parser = None
+    app.conversation_manager = None
+    app.ingestion_queue = None
+    app.document_parser = None
     
     # Try to connect to MongoDB
     try:
@@ -61,6 +91,7 @@ async def lifespan(app: FastAPI):
         logger.warning("Starting server with MongoDB functionality disabled")
 
     # Try to initialize LLM providers
+    llm_provider_factory = None
     try:
         llm_provider_factory = LLMProviderFactory(settings)
         vectordb_provider_factory = VectorDBProviderFactory(settings)
@@ -106,6 +137,57 @@ async def lifespan(app: FastAPI):
             model_id=settings.EMBEDDING_MODEL_ID, 
             embedding_size=settings.EMBEDDING_MODEL_SIZE
         )
+
+    app.embedding_client.set_embedding_dimensions(settings.EMBEDDING_DIMENSIONS)
+    if app.embedding_client.full_embedding_size:
+        logger.info(
+            f"Embeddings reduced from {app.embedding_client.full_embedding_size} "
+            f"to {app.embedding_client.embedding_size} dimensions"
+        )
+    
+    # Concurrent, rate-limited batch embedding for ingestion
+    app.embedding_executor = AsyncEmbeddingExecutor(
+        embedding_client=app.embedding_client,
+        max_concurrency=settings.EMBEDDING_MAX_CONCURRENCY,
+        query_max_concurrency=settings.EMBEDDING_QUERY_MAX_CONCURRENCY,
+        requests_per_minute=settings.EMBEDDING_REQUESTS_PER_MINUTE,
+        tokens_per_minute=settings.EMBEDDING_TOKENS_PER_MINUTE,
+        max_retries=settings.EMBEDDING_MAX_RETRIES,
+        retry_base_delay=settings.EMBEDDING_RETRY_BASE_DELAY,
+        retry_max_delay=settings.EMBEDDING_RETRY_MAX_DELAY,
+    )
+    
+    # Persistent embedding cache shared by indexing and search
+    if settings.EMBEDDING_CACHE_ENABLED:
+        try:
+            cache_dir = BaseController().get_database_path(db_name=settings.embedding_cache_path)
+            app.embedding_cache = EmbeddingCache(
+                db_path=os.path.join(cache_dir, "embeddings.sqlite3"),
+                max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            )
+            logger.info(f"Embedding cache opened at {cache_dir} with {app.embedding_cache.entries} entries")
+        except Exception as e:
+            logger.error(f"Embedding cache initialization failed: {str(e)}")
+            app.embedding_cache = None
+
+    # In-memory LRU of query embeddings in front of the persistent cache
+    if settings.QUERY_EMBEDDING_CACHE_ENABLED:
+        app.query_embedding_cache = QueryEmbeddingCache(
+            max_entries=settings.QUERY_EMBEDDING_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+        )
+
+    # Answers of /index/answer, keyed by the project's index version
+    if settings.ANSWER_CACHE_ENABLED:
+        app.answer_cache = AnswerCache(
+            max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+            similarity_threshold=settings.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+        )
+
+    # Identical /index/answer questions in flight at the same time are computed once
+    if settings.SINGLE_FLIGHT_ENABLED:
+        app.single_flight = SingleFlight()
     
     # Try to connect to vector DB
     try:
@@ -146,6 +228,10 @@ async def lifespan(app: FastAPI):
                 self.logger.warning("Fallback: delete_collection called but not implemented")
                 return True
             
+            def delete_by_asset_id(self, *args, **kwargs):
+                self.logger.warning("Fallback: delete_by_asset_id called but not implemented")
+                return True
+            
             def add_embeddings(self, *args, **kwargs):
                 self.logger.warning("Fallback: add_embeddings called but not implemented")
                 return True
@@ -190,6 +276,16 @@ async def lifespan(app: FastAPI):
                 
                 # Return only the requested number of results (limit)
                 return mock_docs[:limit]
+
+            def search_batch(self, collection_name=None, vectors=None, limit=5, **kwargs):
+                return [
+                    self.search_by_vector(collection_name=collection_name, limit=limit)
+                    for _ in vectors or []
+                ]
+
+            def delete_by_filter(self, *args, **kwargs):
+                self.logger.warning("Fallback: delete_by_filter called but not implemented")
+                return True
                 
             def similarity_search(self, *args, **kwargs):
                 self.logger.warning("Fallback: similarity_search called but not implemented")
@@ -198,6 +294,18 @@ async def lifespan(app: FastAPI):
         # Use the fallback implementation
         app.vectordb_client = FallbackVectorDB()
 
+    # Async vector DB client for request handlers
+    try:
+        app.async_vectordb_client = vectordb_provider_factory.create_async(
+            provider=settings.VECTOR_DB_BACKEND,
+            vectordb_client=app.vectordb_client
+        )
+        await app.async_vectordb_client.connect()
+        logger.info(f"Async vector DB client ready: {type(app.async_vectordb_client).__name__}")
+    except Exception as e:
+        logger.error(f"Async vector DB client initialization failed: {str(e)}")
+        app.async_vectordb_client = ThreadedVectorDBAdapter(vectordb_client=app.vectordb_client)
+
     # Try to initialize template parser
     try:
         app.template_parser = TemplateParser(
@@ -208,18 +316,83 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Template parser initialization failed: {str(e)}")
         logger.warning("Starting server with template parsing functionality disabled")
+
+    # Running summaries of long chats, written by the generation model
+    if settings.CONVERSATION_SUMMARY_ENABLED and app.template_parser \
+            and not isinstance(app.generation_client, FallbackProvider):
+        app.conversation_manager = ConversationManager(
+            generation_client=app.generation_client,
+            template_parser=app.template_parser,
+            keep_messages=settings.CONVERSATION_KEEP_MESSAGES,
+            summary_max_tokens=settings.CONVERSATION_SUMMARY_MAX_TOKENS,
+            max_sessions=settings.CONVERSATION_MAX_SESSIONS,
+            ttl_seconds=settings.CONVERSATION_SESSION_TTL_SECONDS,
+        )
+
+    # Start the document parser processes
+    try:
+        app.document_parser = DocumentParserPool(
+            max_workers=settings.PARSER_MAX_WORKERS or None,
+            pages_per_task=settings.PARSER_PAGES_PER_TASK,
+            memory_limit_mb=settings.PARSER_MEMORY_LIMIT_MB,
+            task_timeout=settings.PARSER_TASK_TIMEOUT,
+        )
+        app.document_parser.start()
+    except Exception as e:
+        logger.error(f"Document parser pool initialization failed: {str(e)}")
+        logger.warning("Documents will be parsed in the API process")
+        app.document_parser = None
+
+    # Start the background ingestion workers
+    app.ingestion_queue = IngestionQueue(
+        app=app,
+        num_workers=settings.INGESTION_WORKERS,
+        max_size=settings.INGESTION_QUEUE_MAX_SIZE,
+        batch_size=settings.INGESTION_BATCH_SIZE,
+        pipeline_queue_size=settings.INGESTION_PIPELINE_QUEUE_SIZE,
+        lease_seconds=settings.INGESTION_JOB_LEASE_SECONDS,
+        recovery_interval=settings.INGESTION_RECOVERY_INTERVAL_SECONDS,
+    )
+    await app.ingestion_queue.start()
+
+    vectordb_maintenance_task = None
+    if hasattr(app.vectordb_client, "close_idle_collections"):
+        vectordb_maintenance_task = asyncio.create_task(
+            close_idle_vector_collections(app.vectordb_client)
+        )
     
     logger.info("Server startup complete")
     yield  # This is where the app runs
     
     # Shutdown code
+    if vectordb_maintenance_task:
+        vectordb_maintenance_task.cancel()
+
+    if app.ingestion_queue:
+        await app.ingestion_queue.stop()
+
+    if app.conversation_manager:
+        await app.conversation_manager.aclose()
+
+    if app.document_parser:
+        app.document_parser.shutdown()
+
+    if app.embedding_cache:
+        app.embedding_cache.close()
+
     if app.mongo_conn:
         app.mongo_conn.close()
         logger.info("MongoDB connection closed")
         
+    if app.async_vectordb_client:
+        await app.async_vectordb_client.disconnect()
+
     if app.vectordb_client:
         app.vectordb_client.disconnect()
         logger.info("Vector DB connection closed")
+
+    if llm_provider_factory:
+        await llm_provider_factory.aclose()
     
     logger.info("Server shutdown complete")
 
@@ -272,7 +445,11 @@ async def general_chat_endpoint(request: Request, req_body: dict = Body(...)):
         async with httpx.AsyncClient() as client:
             response = await client.post(
                 "http://localhost:8000/nlp/general/answer",
-                json={"text": req_body.get("text", ""), "conversation_history": req_body.get("conversation_history", [])}
+                json={
+                    "text": req_body.get("text", ""),
+                    "conversation_history": req_body.get("conversation_history", []),
+                    "session_id": req_body.get("session_id", None),
+                }
             )
             
             if response.status_code != 200:
@@ -304,9 +481,10 @@ async def nlp_index_answer(
         
         # Extract request parameters
         text = req_body.get("text", "")
-        limit = req_body.get("limit", 5)
+        limit = req_body.get("limit")  # None lets the RAG endpoint use RAG_RETRIEVAL_LIMIT
         document_id = req_body.get("document_id", None)
         conversation_history = req_body.get("conversation_history", [])
+        session_id = req_body.get("session_id", None)
         
         logging.info(f"Question: {text}")
         if document_id:
@@ -318,7 +496,8 @@ async def nlp_index_answer(
             json_data = {
                 "text": text,
                 "limit": limit,
-                "conversation_history": conversation_history
+                "conversation_history": conversation_history,
+                "session_id": session_id
             }
             
             # Add document_id if provided
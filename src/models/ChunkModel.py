@@ -46,18 +46,25 @@ class ChunkModel(BaseDataModel):
         return DataChunk(**result)
         
     async def insert_many_chunks(self, chunks: list, batch_size: int=100): #changed from 100 to 10
+        """Bulk inserts chunks and returns their ObjectIds in input order.
+
+        Ids are assigned client-side (and set on each chunk) so callers can
+        link vector DB points back to the stored chunks without a re-read.
+        """
         operations = []
         for i in range(0, len(chunks), batch_size):
             batch = chunks[i:i+batch_size]
-            operations.extend([
-                InsertOne(chunk.dict(by_alias=True, exclude_unset=True))
-                for chunk in batch
-            ])
+            for chunk in batch:
+                if chunk.id is None:
+                    chunk.id = ObjectId()
+                document = chunk.dict(by_alias=True, exclude_unset=True)
+                document["_id"] = chunk.id
+                operations.append(InsertOne(document))
 
         if operations:
-            await self.collection.bulk_write(operations)
+            await self.collection.bulk_write(operations, ordered=False)
 
-        return len(chunks)
+        return [chunk.id for chunk in chunks]
     
     async def delete_chunks_by_project_id(self, project_id: ObjectId):
         result = await self.collection.delete_many({
@@ -66,6 +73,30 @@ class ChunkModel(BaseDataModel):
 
         return result.deleted_count
     
+    async def delete_chunks_by_asset_id(self, asset_id: ObjectId):
+        result = await self.collection.delete_many({
+            "chunk_asset_id": asset_id
+        })
+
+        return result.deleted_count
+    
+    async def get_chunks_by_ids(self, chunk_ids: list):
+        """Fetches chunks for a list of ids (e.g. search hits) in one $in query, preserving order."""
+        object_ids = [
+            ObjectId(chunk_id) if isinstance(chunk_id, str) else chunk_id
+            for chunk_id in chunk_ids
+        ]
+        records = await self.collection.find({
+            "_id": {"$in": object_ids}
+        }).to_list(length=None)
+
+        records_by_id = {record["_id"]: record for record in records}
+        return [
+            DataChunk(**records_by_id[object_id])
+            for object_id in object_ids
+            if object_id in records_by_id
+        ]
+    
     async def get_project_chunks(self, project_id: ObjectId, page_no: int=1, page_size: int=50):
         records = await self.collection.find({
             "chunk_project_id": project_id
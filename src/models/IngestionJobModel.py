@@ -0,0 +1,196 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import IngestionJob
+from .enums.DataBaseEnum import DataBaseEnum
+from .enums.JobStatusEnum import JobStatusEnum, JobStageStatusEnum
+from bson import ObjectId
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+import logging
+
+logger = logging.getLogger('uvicorn.error')
+
+class IngestionJobModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.collection = self.db_client[DataBaseEnum.COLLECTION_INGESTION_JOB_NAME.value]
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        await instance.init_collection()
+        return instance
+
+    async def init_collection(self):
+        # Indexes are (re)created on every start: create_index is a no-op for
+        # existing ones, and collections created before an index was added get it
+        self.collection = self.db_client[DataBaseEnum.COLLECTION_INGESTION_JOB_NAME.value]
+        indexes = IngestionJob.get_indexes()
+        for index in indexes:
+            options = {}
+            if index.get("partial_filter"):
+                options["partialFilterExpression"] = index["partial_filter"]
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"],
+                **options
+            )
+
+    async def create_job(self, job: IngestionJob):
+
+        result = await self.collection.insert_one(job.dict(by_alias=True, exclude_unset=False, exclude={"id"}))
+        job.id = result.inserted_id
+
+        return job
+
+    async def create_or_get_active_job(self, job: IngestionJob):
+        """Creates `job` unless its asset already has a queued or running job.
+
+        Returns:
+            A tuple of (job, created); job is the asset's active job when created is False
+        """
+        job.job_active_asset_id = job.job_asset_id
+        for _ in range(3):
+            try:
+                return await self.create_job(job=job), True
+            except DuplicateKeyError:
+                record = await self.collection.find_one({"job_active_asset_id": job.job_asset_id})
+                if record:
+                    return IngestionJob(**record), False
+                # The active job finished in between: try again
+
+        logger.error(f"Could not create an ingestion job for asset {job.job_asset_id}")
+        return None, False
+
+    async def get_job(self, job_id: str):
+        try:
+            obj_id = ObjectId(job_id) if isinstance(job_id, str) else job_id
+        except Exception:
+            logger.error(f"Invalid ObjectId format for job_id: {job_id}")
+            return None
+
+        record = await self.collection.find_one({"_id": obj_id})
+
+        if record:
+            return IngestionJob(**record)
+
+        return None
+
+    @staticmethod
+    def claimable_filter(now: datetime) -> dict:
+        # Queued jobs, and running jobs whose owner stopped renewing its lease (e.g. a crashed process)
+        return {"$or": [
+            {"job_status": JobStatusEnum.QUEUED.value},
+            {"job_status": JobStatusEnum.RUNNING.value, "job_lease_expires_at": {"$lt": now}},
+            {"job_status": JobStatusEnum.RUNNING.value, "job_lease_expires_at": None},
+        ]}
+
+    async def get_claimable_job_ids(self, limit: int = 0) -> list:
+        """Returns the ids of jobs waiting for a worker, oldest first."""
+        records = await self.collection.find(
+            self.claimable_filter(datetime.utcnow()), {"_id": 1}
+        ).sort("job_created_at", 1).to_list(length=limit or None)
+
+        return [record["_id"] for record in records]
+
+    async def claim_job(self, job_id: ObjectId, owner: str, lease_seconds: int):
+        """Atomically marks a claimable job as running for `owner`.
+
+        Returns:
+            The claimed job, or None when another worker holds it or it finished
+        """
+        now = datetime.utcnow()
+        record = await self.collection.find_one_and_update(
+            {"_id": job_id, **self.claimable_filter(now)},
+            {"$set": {
+                "job_status": JobStatusEnum.RUNNING.value,
+                "job_owner": owner,
+                "job_lease_expires_at": now + timedelta(seconds=lease_seconds),
+                "job_updated_at": now,
+            }},
+            return_document=ReturnDocument.AFTER,
+        )
+
+        return IngestionJob(**record) if record else None
+
+    async def renew_lease(self, job_id: ObjectId, owner: str, lease_seconds: int) -> bool:
+        """Extends the lease of a running job, as long as `owner` still holds it."""
+        result = await self.collection.update_one(
+            {"_id": job_id, "job_owner": owner, "job_status": JobStatusEnum.RUNNING.value},
+            {"$set": {"job_lease_expires_at": datetime.utcnow() + timedelta(seconds=lease_seconds)}},
+        )
+
+        return result.matched_count > 0
+
+    async def release_job(self, job_id: ObjectId, owner: str):
+        """Puts a job `owner` stopped working on (e.g. at shutdown) back in the queue."""
+        await self.collection.update_one(
+            {"_id": job_id, "job_owner": owner, "job_status": JobStatusEnum.RUNNING.value},
+            {"$set": {
+                "job_status": JobStatusEnum.QUEUED.value,
+                "job_owner": None,
+                "job_lease_expires_at": None,
+                "job_updated_at": datetime.utcnow(),
+            }},
+        )
+
+    async def set_job_status(self, job_id: ObjectId, status: str, error: str = None,
+                             owner: str = None) -> bool:
+        """Sets the status of a job; with `owner`, only while that worker still holds it.
+
+        Returns:
+            False when the job is not held by `owner` (its lease was lost)
+        """
+        update = {
+            "job_status": status,
+            "job_updated_at": datetime.utcnow(),
+        }
+        if error is not None:
+            update["job_error"] = error
+
+        operations = {"$set": update}
+        if status in (JobStatusEnum.COMPLETED.value, JobStatusEnum.FAILED.value):
+            # Lets a new job be created for the asset
+            operations["$unset"] = {"job_active_asset_id": ""}
+
+        query = {"_id": job_id}
+        if owner is not None:
+            query["job_owner"] = owner
+
+        result = await self.collection.update_one(query, operations)
+        return result.matched_count > 0
+
+    async def set_stage_progress(self, job_id: ObjectId, stage: str, status: str = None,
+                                 completed: int = None, total: int = None):
+        """Updates the progress counters of a single ingestion stage."""
+        update = {
+            "job_updated_at": datetime.utcnow(),
+        }
+        if status is not None:
+            update[f"job_stages.{stage}.status"] = status
+            if status == JobStageStatusEnum.RUNNING.value:
+                update["job_stage"] = stage
+        if completed is not None:
+            update[f"job_stages.{stage}.completed"] = completed
+        if total is not None:
+            update[f"job_stages.{stage}.total"] = total
+
+        await self.collection.update_one({"_id": job_id}, {"$set": update})
+
+    async def set_job_metrics(self, job_id: ObjectId, metrics: dict):
+        await self.collection.update_one({"_id": job_id}, {"$set": {
+            "job_metrics": metrics,
+            "job_updated_at": datetime.utcnow(),
+        }})
+
+    async def set_stages_completed(self, job_id: ObjectId, completed: dict):
+        """Updates the completed counters of several stages in a single write."""
+        update = {
+            "job_updated_at": datetime.utcnow(),
+        }
+        for stage, count in completed.items():
+            update[f"job_stages.{stage}.completed"] = count
+
+        await self.collection.update_one({"_id": job_id}, {"$set": update})
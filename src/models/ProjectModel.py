@@ -93,6 +93,37 @@ class ProjectModel(BaseDataModel):
             logger.exception(f"Error in get_project_or_create_one for project_id '{project_id_str}': {e}")
             return None
 
+    async def get_project_vector_config(self, project_object_id) -> Optional[dict]:
+        """Returns the project's vector storage overrides (None when it uses the defaults)."""
+        if self.collection is None:
+            return None
+
+        project_data = await self.collection.find_one(
+            {"_id": project_object_id},
+            {"project_vector_config": 1}
+        )
+        return (project_data or {}).get("project_vector_config")
+
+    async def set_project_vector_config(self, project_id_str: str, vector_config: dict) -> bool:
+        if self.collection is None:
+            logger.error("Cannot set project vector config: collection is None (db_client may be unavailable)")
+            return False
+
+        result = await self.collection.update_one(
+            {"project_id": project_id_str},
+            {"$set": {"project_vector_config": vector_config}}
+        )
+        return result.matched_count > 0
+
+    async def bump_index_version(self, project_object_id=None, project_id_str: str = None) -> bool:
+        if self.collection is None:
+            logger.error("Cannot bump project index version: collection is None (db_client may be unavailable)")
+            return False
+
+        query = {"_id": project_object_id} if project_object_id is not None else {"project_id": project_id_str}
+        result = await self.collection.update_one(query, {"$inc": {"project_index_version": 1}})
+        return result.matched_count > 0
+
     async def get_all_projects(self, page: int=1, page_size: int=10):
 
         # count total number of documents
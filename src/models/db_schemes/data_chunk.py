@@ -22,9 +22,18 @@ class DataChunk(BaseModel):
                 ],
                 "name": "chunk_project_id_index_1",
                 "unique": False
+            },
+            {
+                "key": [
+                    ("chunk_asset_id", 1)
+                ],
+                "name": "chunk_asset_id_index_1",
+                "unique": False
             }
         ]
     
 class RetrievedDocument(BaseModel):
     text: str
-    score: float
\ No newline at end of file
+    score: float
+    id: Optional[str] = None
+    metadata: dict = Field(default_factory=dict)
\ No newline at end of file
@@ -0,0 +1,65 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from bson.objectid import ObjectId
+from datetime import datetime
+from models.enums.JobStatusEnum import JobStatusEnum, JobStageEnum, JobStageStatusEnum
+
+def default_job_stages():
+    return {
+        stage.value: {
+            "status": JobStageStatusEnum.PENDING.value,
+            "completed": 0,
+            "total": None,
+        }
+        for stage in JobStageEnum
+    }
+
+class IngestionJob(BaseModel):
+    id: Optional[ObjectId] = Field(None, alias="_id")
+    job_project_id: ObjectId
+    job_asset_id: ObjectId
+    # The asset's id while the job is queued or running, unset once it finishes;
+    # a unique index on it allows a single active job per asset
+    job_active_asset_id: Optional[ObjectId] = None
+    job_status: str = Field(default=JobStatusEnum.QUEUED.value)
+    job_stage: Optional[str] = None
+    job_stages: dict = Field(default_factory=default_job_stages)
+    job_config: dict = Field(default_factory=dict)
+    job_error: Optional[str] = None
+    # Process running the job, and until when its claim holds without being renewed
+    job_owner: Optional[str] = None
+    job_lease_expires_at: Optional[datetime] = None
+    job_metrics: dict = Field(default_factory=dict)
+    job_created_at: datetime = Field(default_factory=datetime.utcnow)
+    job_updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @classmethod
+    def get_indexes(cls):
+
+        return [
+            {
+                "key": [
+                    ("job_project_id", 1)
+                ],
+                "name": "job_project_id_index_1",
+                "unique": False
+            },
+            {
+                "key": [
+                    ("job_status", 1)
+                ],
+                "name": "job_status_index_1",
+                "unique": False
+            },
+            {
+                "key": [
+                    ("job_active_asset_id", 1)
+                ],
+                "name": "job_active_asset_id_index_1",
+                "unique": True,
+                "partial_filter": {"job_active_asset_id": {"$type": "objectId"}},
+            },
+        ]
@@ -5,6 +5,10 @@ from bson.objectid import ObjectId
 class Project(BaseModel):
     id: Optional[ObjectId] = Field(None, alias="_id")
     project_id: str = Field(..., min_length=1)
+    # Overrides of the default vector storage options (quantization, on_disk, always_ram)
+    project_vector_config: Optional[dict] = None
+    # Incremented whenever the project's index changes; cached answers are keyed by it
+    project_index_version: int = 0
 
     @field_validator('project_id')
     def validate_project_id(cls, value):
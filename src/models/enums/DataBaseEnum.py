@@ -4,4 +4,5 @@ class DataBaseEnum(Enum):
 
     COLLECTION_PROJECT_NAME = "projects"
     COLLECTION_CHUNK_NAME = "chunks"
-    COLLECTION_ASSET_NAME = "asset"
\ No newline at end of file
+    COLLECTION_ASSET_NAME = "asset"
+    COLLECTION_INGESTION_JOB_NAME = "ingestion_jobs"
@@ -0,0 +1,22 @@
+from enum import Enum
+
+class JobStatusEnum(Enum):
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class JobStageEnum(Enum):
+
+    PARSE = "parse"
+    CHUNK = "chunk"
+    EMBED = "embed"
+    INDEX = "index"
+
+class JobStageStatusEnum(Enum):
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
@@ -21,4 +21,15 @@ class ResponseSignal(Enum):
     RAG_ANSWER_ERROR = "rag_answer_error"
     PROCESSING_STARTED = "processing_started"
     GENERAL_CHAT_SUCCESS = "general_chat_success"
+    GENERAL_CHAT_ERROR = "general_chat_error"
+    INGESTION_JOB_QUEUED = "ingestion_job_queued"
+    INGESTION_JOB_IN_PROGRESS = "ingestion_job_in_progress"
+    INGESTION_JOB_DEFERRED = "ingestion_job_deferred"
+    INGESTION_JOB_RETRIEVED = "ingestion_job_retrieved"
+    INGESTION_JOB_NOT_FOUND = "ingestion_job_not_found"
+    VECTOR_CONFIG_UPDATED = "vector_config_updated"
+    VECTOR_CONFIG_INVALID = "vector_config_invalid"
+    VECTOR_CONFIG_SHARED_COLLECTION = "vector_config_not_supported_for_shared_collection"
+    VECTOR_DB_RECALL_RETRIEVED = "vector_db_recall_retrieved"
+    VECTOR_DB_RECALL_ERROR = "vector_db_recall_error"
     
\ No newline at end of file
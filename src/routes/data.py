@@ -2,20 +2,18 @@ from fastapi import FastAPI, APIRouter, Depends, UploadFile, status, Request, Ba
 from fastapi.responses import JSONResponse
 import os
 from helpers.config import get_settings, Settings
-from controllers import DataController, ProjectController, ProcessController, NLPController
-import aiofiles
+from controllers import DataController, NLPController
 from models import ResponseSignal
 import logging
 from .schemes.data import ProcessRequest
 from models.ProjectModel import ProjectModel
-from models.ChunkModel import ChunkModel
 from models.AssetModel import AssetModel
-from models.db_schemes import DataChunk, Asset
+from models.ChunkModel import ChunkModel
+from models.IngestionJobModel import IngestionJobModel
+from models.db_schemes import Asset, IngestionJob
 from models.enums.AssetTypeEnum import AssetTypeEnum
-from helpers import utils
+from models.enums.ProcessingEnum import ProcessingEnum
 from bson.objectid import ObjectId
-from langchain_community.document_loaders import TextLoader, PyMuPDFLoader
-import tempfile
 
 logger = logging.getLogger('uvicorn.error')
 
@@ -27,7 +25,11 @@ data_router = APIRouter(
 @data_router.post("/upload/{project_id}")
 async def upload_data(request: Request, project_id: str, file: UploadFile,
                       app_settings: Settings = Depends(get_settings)):
-        
+    """Persists the uploaded file and enqueues it for background ingestion.
+
+    Parsing, chunking, embedding and indexing run in the ingestion worker pool;
+    poll `/api/v1/data/jobs/{job_id}` for progress.
+    """
     
     project_model = ProjectModel(db_client=request.app.db_client)
     asset_model = AssetModel(db_client=request.app.db_client)
@@ -46,28 +48,12 @@ async def upload_data(request: Request, project_id: str, file: UploadFile,
          logger.error(f"Project dictionary missing '_id' field for project_id: {project_id}")
          raise HTTPException(status_code=500, detail="Project record is missing ID")
 
-    # Generate a unique filename to avoid collisions
-    unique_filename = f"{utils.generate_random_string()}_{file.filename}"
-
     # validate the file properties
     data_controller = DataController()
 
     is_valid, result_signal = data_controller.validate_uploaded_file(file=file)
 
-    # --- Start Synchronous Processing Logic --- 
-    file_content_bytes = await file.read() # Read the entire file content into memory
-    await file.seek(0) # Reset file pointer in case it's needed again (e.g., for saving)
-
-    # Generate a temporary file path to use with Langchain loaders
-    # Langchain loaders often work best with file paths
-    file_ext = os.path.splitext(file.filename)[-1].lower()
-    with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-        temp_file.write(file_content_bytes)
-        temp_file_path = temp_file.name
-    logger.info(f"Saved uploaded content to temporary file: {temp_file_path}")
-
     if not is_valid:
-        os.unlink(temp_file_path) # Clean up temp file
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={
@@ -75,23 +61,21 @@ async def upload_data(request: Request, project_id: str, file: UploadFile,
             }
         )
 
+    file_ext = os.path.splitext(file.filename)[-1].lower()
+    if file_ext not in [ProcessingEnum.TXT.value, ProcessingEnum.PDF.value]:
+        logger.warning(f"Unsupported file extension '{file_ext}' for {file.filename}.")
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_ext}")
+
     # Use the actual resolved project's ID string for path generation
     # Access the ID using dictionary lookup
     resolved_project_id_str = str(project["_id"]) 
 
-    # project_dir_path = ProjectController().get_project_path(project_id=project_id) # Old way
-    project_dir_path = ProjectController().get_project_path(project_id=resolved_project_id_str) # New way
-    
-    file_path, file_id = data_controller.generate_unique_filepath(
-        orig_file_name=file.filename,
-        # project_id=project_id # Old way
-        project_id=resolved_project_id_str # New way
-    )
-
+    # Stream the body once to its content-addressed location, enforcing the size limit
     try:
-        async with aiofiles.open(file_path, "wb") as f:
-            while chunk := await file.read(app_settings.FILE_DEFAULT_CHUNK_SIZE):
-                await f.write(chunk)
+        is_saved, save_signal, file_path, file_id, file_hash, file_size = await data_controller.save_upload_stream(
+            file=file,
+            project_id=resolved_project_id_str
+        )
     except Exception as e:
 
         logger.error(f"Error while uploading file: {e}")
@@ -103,131 +87,128 @@ async def upload_data(request: Request, project_id: str, file: UploadFile,
             }
         )
 
-    # store the assets into the database
-    asset_resource = Asset(
-        # Use dictionary lookup and convert to ObjectId
-        asset_project_id=ObjectId(project["_id"]),
-        asset_type=AssetTypeEnum.FILE.value,
-        asset_name=unique_filename, # Use the generated unique filename
-        asset_size=os.path.getsize(file_path)
-    )
-
-    # --- Load content using LangChain loader --- 
-    logger.info(f"Attempting to load content from temp file: {temp_file_path}")
-    loader = None
-    loaded_documents = None
-    try:
-        if file_ext == '.txt':
-            loader = TextLoader(temp_file_path, encoding="utf-8")
-        elif file_ext == '.pdf':
-            loader = PyMuPDFLoader(temp_file_path)
-        
-        if loader:
-            loaded_documents = loader.load()
-            logger.info(f"Successfully loaded {len(loaded_documents)} document(s) from temp file using {type(loader).__name__}.")
-        else:
-            logger.warning(f"Unsupported file extension '{file_ext}' for temporary file based on {file.filename}. Skipping processing.")
-            os.unlink(temp_file_path) # Clean up temp file
-            raise HTTPException(status_code=400, detail=f"Unsupported file type: {file_ext}")
-    except Exception as load_err:
-        logger.error(f"Error loading file content from temp path {temp_file_path}: {load_err}", exc_info=True)
-        os.unlink(temp_file_path) # Clean up temp file
-        raise HTTPException(status_code=500, detail=f"Error processing file content: {load_err}")
-    finally:
-        # Ensure temp file is deleted even if loader fails later
-        if os.path.exists(temp_file_path):
-            logger.info(f"Cleaning up temporary file: {temp_file_path}")
-            os.unlink(temp_file_path)
-
-    if not loaded_documents:
-        logger.error(f"Loaded_documents is empty or None after loading attempt for {file.filename}. Cannot proceed.")
-        raise HTTPException(status_code=500, detail="Failed to load document content after successful upload.")
+    if not is_saved:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": save_signal
+            }
+        )
 
-    # +++ Create the Asset record in DB BEFORE chunking/indexing +++
-    asset_resource = await asset_model.create_asset(asset=asset_resource)
-    if not asset_resource or not asset_resource.id:
-        logger.error(f"Failed to create asset record in DB for file {unique_filename} or asset record has no ID.")
-        raise HTTPException(status_code=500, detail="Failed to save file metadata to database.")
-    logger.info(f"Asset record created in DB with ID: {asset_resource.id}")
-    # +++ Asset record now exists with a valid ID +++
+    # Identical content re-uploaded to the same project reuses its asset,
+    # so ingestion replaces the existing points instead of duplicating them
+    asset_resource = await asset_model.get_asset_record(
+        asset_project_id=project["_id"],
+        asset_name=file_id
+    )
+    if asset_resource is None:
+        # store the assets into the database
+        asset_resource = Asset(
+            # Use dictionary lookup and convert to ObjectId
+            asset_project_id=ObjectId(project["_id"]),
+            asset_type=AssetTypeEnum.FILE.value,
+            asset_name=file_id, # Content-addressed name of the file inside the project directory
+            asset_size=file_size,
+            asset_config={
+                "original_name": file.filename,
+                "sha256": file_hash,
+            }
+        )
+        asset_resource = await asset_model.create_asset(asset=asset_resource)
+        if not asset_resource or not asset_resource.id:
+            logger.error(f"Failed to create asset record in DB for file {file_id} or asset record has no ID.")
+            raise HTTPException(status_code=500, detail="Failed to save file metadata to database.")
+        logger.info(f"Asset record created in DB with ID: {asset_resource.id}")
+    else:
+        logger.info(f"Reusing existing asset {asset_resource.id} for identical upload of {file.filename}")
 
-    # --- Chunking --- 
-    # Use ProcessController just for its chunking logic (or move chunking logic here)
-    process_controller = ProcessController(project_id=resolved_project_id_str) # Init with resolved ID
+    # --- Enqueue background ingestion ---
     # TODO: Get chunk/overlap size from config or request if needed
-    chunk_size = 512 
-    overlap_size = 64
-    logger.info(f"Chunking content for {file.filename} (asset: {asset_resource.id}) using size={chunk_size}, overlap={overlap_size}")
-    file_chunks = process_controller.process_file_content(
-        file_content=loaded_documents, # Pass loaded LangChain documents
-        file_id=str(asset_resource.id), # Pass asset_id for metadata
-        chunk_size=chunk_size,
-        overlap_size=overlap_size
-    )
+    job_model = IngestionJobModel(db_client=request.app.db_client)
+    # A single active job per asset: re-uploads while it is queued or running get that job back
+    job, created = await job_model.create_or_get_active_job(job=IngestionJob(
+        job_project_id=ObjectId(project["_id"]),
+        job_asset_id=asset_resource.id,
+        job_config={
+            "project_id": resolved_project_id_str,
+            "file_name": file_id,
+            "chunk_size": 512,
+            "overlap_size": 64,
+            # Append to the project's collection; only this asset's points are (re)written
+            "do_reset": False,
+        }
+    ))
 
-    if file_chunks is None or not file_chunks:
-        logger.error(f"No chunks generated for file: {file.filename}, asset_id: {asset_resource.id}. Skipping indexing.")
-        # Decide if this should be an error response or just a warning
-        raise HTTPException(status_code=500, detail="Failed to generate chunks from the document.")
-    logger.info(f"Generated {len(file_chunks)} chunks for asset_id: {asset_resource.id}")
+    if job is None:
+        raise HTTPException(status_code=500, detail="Failed to create the ingestion job.")
 
-    # --- Save Chunks to DB --- 
-    chunk_model = ChunkModel(db_client=request.app.db_client)
-    file_chunks_records = [
-        DataChunk(
-            chunk_text=chunk.page_content,
-            chunk_metadata=chunk.metadata,
-            chunk_order=i+1,
-            chunk_project_id=ObjectId(project["_id"]), # Use actual ObjectId
-            chunk_asset_id=asset_resource.id # Use the asset ObjectId
-        )
-        for i, chunk in enumerate(file_chunks)
-    ]
-    inserted_count = await chunk_model.insert_many_chunks(chunks=file_chunks_records)
-    logger.info(f"Inserted {inserted_count} chunks into DB for asset_id: {asset_resource.id}")
-    # NOTE: The inserted_count confirms the number saved. 
-    # The file_chunks_records list holds the objects (though their .id might not be populated yet by the driver).
-    # We rely on NLPController.index_into_vector_db to handle the DataChunk objects directly.
+    if not created:
+        logger.info(f"Asset {asset_resource.id} already has ingestion job {job.id} ({job.job_status})")
+        return JSONResponse(
+                content={
+                    "signal": ResponseSignal.INGESTION_JOB_IN_PROGRESS.value,
+                    "file_id": str(asset_resource.id),
+                    "project_id": str(project["_id"]),
+                    "job_id": str(job.id)
+                }
+            )
 
-    # --- Index Chunks into Vector DB --- 
-    logger.info(f"Initiating indexing for {inserted_count} chunks of asset_id: {asset_resource.id}")
-    nlp_controller = NLPController(
-        db_client=request.app.db_client,
-        vectordb_client=request.app.vectordb_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser,
-        logger=logger
-    )
-    try:
-        # Note: We are resetting the collection for this specific project on *every* upload
-        # This might not be desired if you want multiple files per project later.
-        # Set do_reset=False if you want to add to existing collection.
-        # For simplicity now, we reset to ensure only current file content is indexed.
-        is_indexed = nlp_controller.index_into_vector_db(
-            project_identifier_str=resolved_project_id_str, # Use the correct parameter name
-            chunks=file_chunks_records, # Pass the chunk objects we created
-            do_reset=True # Reset collection for this project on each upload (for now)
+    if not request.app.ingestion_queue.enqueue(str(job.id)):
+        # The job stays queued in the database; the queue's recovery scan
+        # hands it to a worker once there is room
+        logger.info(f"Ingestion queue is full, deferred job {job.id} for asset_id: {asset_resource.id}")
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "signal": ResponseSignal.INGESTION_JOB_DEFERRED.value,
+                "file_id": str(asset_resource.id),
+                "project_id": str(project["_id"]),
+                "job_id": str(job.id)
+            }
         )
-        if is_indexed:
-            logger.info(f"Successfully indexed {inserted_count} chunks for asset_id: {asset_resource.id}")
-        else:
-            logger.error(f"Indexing failed for asset_id: {asset_resource.id}")
-            raise HTTPException(status_code=500, detail="Failed to index document chunks.")
-    except Exception as index_err:
-        logger.error(f"Error during indexing for asset_id {asset_resource.id}: {index_err}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Error indexing document: {index_err}")
 
-    # --- End Synchronous Processing Logic ---
+    logger.info(f"Enqueued ingestion job {job.id} for asset_id: {asset_resource.id}")
 
     return JSONResponse(
             content={
-                "signal": ResponseSignal.FILE_UPLOAD_SUCCESS.value,
+                "signal": ResponseSignal.INGESTION_JOB_QUEUED.value,
                 "file_id": str(asset_resource.id),
-                "project_id": str(project["_id"])
+                "project_id": str(project["_id"]),
+                "job_id": str(job.id)
             }
         )
 
+@data_router.get("/jobs/{job_id}")
+async def get_ingestion_job(request: Request, job_id: str):
+    """Returns the status and per-stage progress of an ingestion job."""
+
+    job_model = IngestionJobModel(db_client=request.app.db_client)
+    job = await job_model.get_job(job_id)
+
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.INGESTION_JOB_NOT_FOUND.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.INGESTION_JOB_RETRIEVED.value,
+            "job_id": str(job.id),
+            "file_id": str(job.job_asset_id),
+            "project_id": str(job.job_project_id),
+            "status": job.job_status,
+            "stage": job.job_stage,
+            "stages": job.job_stages,
+            "error": job.job_error,
+            "metrics": job.job_metrics,
+            "created_at": job.job_created_at.isoformat(),
+            "updated_at": job.job_updated_at.isoformat(),
+        }
+    )
+
 @data_router.delete("/document/{document_id}")
 async def delete_document(document_id: str, request: Request, project_data: dict = Body(...)):
     """Delete a document from a project."""
@@ -253,13 +234,33 @@ async def delete_document(document_id: str, request: Request, project_data: dict
         
         if delete_result.deleted_count == 0:
             raise HTTPException(status_code=404, detail=f"Document {document_id} not found or could not be deleted")
+
+        # Drop the document's chunks too, so a re-index cannot push them back into the vector store
+        if ObjectId.is_valid(document_id):
+            chunk_model = ChunkModel(db_client=app.db_client)
+            deleted_chunks = await chunk_model.delete_chunks_by_asset_id(asset_id=ObjectId(document_id))
+            logger.info(f"Deleted {deleted_chunks} chunks of document {document_id}")
             
         # Delete document from vector database if configured
         if app.vectordb_client:
             try:
-                # Use the document ID as the collection name
-                app.vectordb_client.delete_collection(document_id)
-                logger.info(f"Deleted document collection {document_id} from vector database")
+                # Remove only this document's points from the project collection
+                nlp_controller = NLPController(
+                    db_client=app.db_client,
+                    vectordb_client=app.vectordb_client,
+                    generation_client=app.generation_client,
+                    embedding_client=app.embedding_client,
+                    template_parser=app.template_parser,
+                    logger=logger,
+                    async_vectordb_client=app.async_vectordb_client
+                )
+                await nlp_controller.adelete_asset_from_vector_db(
+                    project_identifier_str=project_id,
+                    asset_id=document_id
+                )
+                logger.info(f"Deleted points of document {document_id} from vector collection of project {project_id}")
+                # Answers cached against the previous index must not be served any more
+                await ProjectModel(db_client=app.db_client).bump_index_version(project_id_str=project_id)
             except Exception as e:
                 logger.error(f"Failed to delete document from vector database: {str(e)}")
                 # We continue even if vector DB deletion fails
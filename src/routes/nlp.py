@@ -1,15 +1,19 @@
 from fastapi import FastAPI, APIRouter, status, Request, HTTPException
-from fastapi.responses import JSONResponse
-from routes.schemes.nlp import PushRequest, SearchRequest
+from fastapi.responses import JSONResponse, StreamingResponse
+from routes.schemes.nlp import PushRequest, SearchRequest, BatchSearchRequest, VectorConfigRequest
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
 from controllers import NLPController
 from models import ResponseSignal
+from stores.vectordb.VectorDBEnums import QuantizationEnums
+from helpers.api_utils import format_sse_event
+from stores.llm.AnswerCache import AnswerCache
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 from bson import ObjectId
 from langdetect import detect, LangDetectException
 
+import asyncio
 import logging
 
 logger = logging.getLogger('uvicorn.error')
@@ -19,6 +23,60 @@ nlp_router = APIRouter(
     tags=["api_v1", "nlp"],
     )
 
+# Keep proxies from buffering the event stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+def detect_request_language(request: Request, text: str) -> str:
+    """Returns the template language detected in `text`, or the default one.
+
+    The template parser is shared by concurrent requests, so the language is
+    passed along with the request instead of being set on the parser.
+    """
+    template_parser = request.app.template_parser
+    try:
+        # Detect language from user question
+        detected_lang = detect(text)
+        logger.info(f"Detected language: {detected_lang}")
+        return template_parser.resolve_language(detected_lang)
+    except LangDetectException:
+        logger.warning(f"Could not detect language for text: '{text[:50]}...'. Defaulting to '{template_parser.default_language}'.")
+    except Exception as lang_e: # Catch any other potential error during detection
+        logger.error(f"Error detecting language: {lang_e}. Defaulting language.")
+    return template_parser.resolve_language(None) # Use default
+
+def compact_history(request: Request, session_id: Optional[str], history: List[Dict[str, str]],
+                    language: Optional[str] = None) -> List[Dict[str, str]]:
+    """Replaces the turns already summarized for `session_id` with their summary."""
+    conversation_manager = getattr(request.app, "conversation_manager", None)
+    if conversation_manager is None:
+        return history or []
+    return conversation_manager.compact(session_id, history or [], language=language)
+
+def answer_flight_key(kind: str, nlp_controller: NLPController, project_id_str: str, index_version: int,
+                      question: str, file_id: Optional[str], conversation_history: List[Dict[str, str]],
+                      limit: Optional[int]) -> str:
+    """Single-flight key of a RAG answer, built like its answer cache key.
+
+    The language is the one `nlp_controller` renders its prompts in, so
+    requests only share an answer written in their own language.
+    """
+    scope = AnswerCache.make_scope(
+        project_id=project_id_str,
+        index_version=index_version,
+        file_id=file_id,
+        language=nlp_controller.language,
+        conversation_history=conversation_history,
+        limit=limit or nlp_controller.app_settings.RAG_RETRIEVAL_LIMIT,
+    )
+    return f"{kind}:{AnswerCache.make_key(scope, question)}"
+
+def remember_turn(request: Request, session_id: Optional[str], history: List[Dict[str, str]],
+                  question: str, answer: Optional[str], language: Optional[str] = None):
+    """Folds the turns that left the verbatim window into the session summary, in the background."""
+    conversation_manager = getattr(request.app, "conversation_manager", None)
+    if conversation_manager is not None:
+        conversation_manager.schedule_update(session_id, history or [], question, answer, language=language)
+
 @nlp_router.get("/index/info/{project_id}")
 async def get_project_index_info(request: Request, project_id: str):
     
@@ -42,11 +100,15 @@ async def get_project_index_info(request: Request, project_id: str):
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
-        logger=app_logger
+        logger=app_logger,
+        embedding_cache=request.app.embedding_cache
     )
 
     # Pass project_db_id string to controller
-    collection_info = nlp_controller.get_vector_db_collection_info(project=project)
+    collection_info = await asyncio.to_thread(
+        nlp_controller.get_vector_db_collection_info,
+        project_identifier_str=project_id
+    )
 
     return JSONResponse(
         content={
@@ -55,6 +117,111 @@ async def get_project_index_info(request: Request, project_id: str):
         }
     )
 
+@nlp_router.post("/index/config/{project_id}")
+async def set_project_index_config(request: Request, project_id: str, config_request: VectorConfigRequest):
+    """Sets the project's vector quantization and storage options.
+
+    They are used when the project's collection is created; an existing
+    collection is updated in place where the vector DB backend supports it.
+    In shared collection mode the VECTOR_DB_* settings apply to every
+    project and per-project options are refused.
+    """
+    vector_config = {key: value for key, value in config_request.dict().items() if value is not None}
+    if "quantization" in vector_config:
+        vector_config["quantization"] = vector_config["quantization"].lower()
+        if vector_config["quantization"] not in [q.value for q in QuantizationEnums]:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTOR_CONFIG_INVALID.value
+                }
+            )
+
+    app_logger = request.app.logger if hasattr(request.app, 'logger') else logger
+
+    nlp_controller = NLPController(
+        db_client=request.app.db_client,
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        logger=app_logger,
+        embedding_cache=request.app.embedding_cache
+    )
+
+    # One collection serves every project, so its settings cannot differ per project
+    if nlp_controller.is_shared_collection_mode():
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTOR_CONFIG_SHARED_COLLECTION.value
+            }
+        )
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Project {project_id} not found.")
+
+    vector_config = {**(project.get("project_vector_config") or {}), **vector_config}
+    await project_model.set_project_vector_config(project_id_str=project_id, vector_config=vector_config)
+
+    is_applied = await asyncio.to_thread(
+        nlp_controller.update_vector_db_config,
+        project_identifier_str=project_id,
+        vector_config=vector_config
+    )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTOR_CONFIG_UPDATED.value,
+            "vector_config": vector_config,
+            "applied_to_existing_collection": bool(is_applied)
+        }
+    )
+
+@nlp_router.get("/index/recall/{project_id}")
+async def get_project_index_recall(request: Request, project_id: str,
+                                   sample_size: int = 20, limit: int = 10):
+    """Estimates recall@limit of the project's (possibly quantized) search against exact search."""
+
+    app_logger = request.app.logger if hasattr(request.app, 'logger') else logger
+
+    nlp_controller = NLPController(
+        db_client=request.app.db_client,
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        logger=app_logger,
+        embedding_cache=request.app.embedding_cache
+    )
+
+    recall = await asyncio.to_thread(
+        nlp_controller.estimate_vector_db_recall,
+        project_identifier_str=project_id,
+        sample_size=min(max(sample_size, 1), 200),
+        limit=min(max(limit, 1), 100)
+    )
+
+    if recall is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTOR_DB_RECALL_ERROR.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTOR_DB_RECALL_RETRIEVED.value,
+            "recall": recall
+        }
+    )
+
 @nlp_router.post("/index/search/{project_id}")
 async def search_index(request: Request, project_id: str, search_request: SearchRequest):
     
@@ -78,11 +245,15 @@ async def search_index(request: Request, project_id: str, search_request: Search
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
-        logger=app_logger
+        logger=app_logger,
+        embedding_cache=request.app.embedding_cache,
+        embedding_executor=request.app.embedding_executor,
+        async_vectordb_client=request.app.async_vectordb_client,
+        query_embedding_cache=request.app.query_embedding_cache
     )
 
     # Pass project_id string and other params to controller
-    results = nlp_controller.search_vector_db_collection(
+    results = await nlp_controller.asearch_vector_db_collection(
         project_identifier_str=project_id, 
         query_text=search_request.text, 
         limit=search_request.limit
@@ -103,13 +274,63 @@ async def search_index(request: Request, project_id: str, search_request: Search
         }
     )
 
+@nlp_router.post("/index/search/batch/{project_id}")
+async def search_index_batch(request: Request, project_id: str, search_request: BatchSearchRequest):
+    """Searches several queries in one go: one embedding call and one vector DB request."""
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(project_id)
+    if not project:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Project {project_id} not found.")
+
+    app_logger = request.app.logger if hasattr(request.app, 'logger') else logger
+
+    nlp_controller = NLPController(
+        db_client=request.app.db_client,
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        logger=app_logger,
+        embedding_cache=request.app.embedding_cache,
+        embedding_executor=request.app.embedding_executor,
+        async_vectordb_client=request.app.async_vectordb_client,
+        query_embedding_cache=request.app.query_embedding_cache
+    )
+
+    batch_results = await nlp_controller.asearch_vector_db_collection_batch(
+        project_identifier_str=project_id,
+        query_texts=search_request.texts,
+        limit=search_request.limit,
+        file_id=search_request.file_id
+    )
+
+    if not any(batch_results):
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value
+                }
+            )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": batch_results
+        }
+    )
+
 class AnswerRAGRequest(BaseModel):
     """Request model for answering questions using RAG."""
     text: str = Field(..., description="The user's question text.")
-    limit: int = Field(5, description="Maximum number of search results to retrieve.", ge=1, le=50)
+    limit: Optional[int] = Field(None, description="Maximum number of search results to retrieve before they are packed into the context budget (defaults to RAG_RETRIEVAL_LIMIT).", ge=1, le=50)
     # Corrected type hint for Python 3.9
     file_id: Optional[str] = Field(None, description="Optional: The specific file_id (asset_id) to focus the answer on within the project.")
     conversation_history: Optional[List[Dict[str, str]]] = Field([], description="Optional: Previous conversation history for context")
+    session_id: Optional[str] = Field(None, description="Optional: Chat session id; older turns of the session are replaced by a running summary")
 
 class AnswerRAGResponse(BaseModel):
     """Response model for RAG answers."""
@@ -119,6 +340,10 @@ class AnswerRAGResponse(BaseModel):
     chat_history: list
     extracted_data_point: Optional[str] = None
     extracted_table_data: Optional[List[Dict[str, Any]]] = None
+    # "exact" or "semantic" when the answer was served from the answer cache
+    cache_hit: Optional[str] = None
+    # Token budget report of the context packer (kept, trimmed and dropped chunks and turns)
+    context: Optional[Dict[str, Any]] = None
 
 @nlp_router.post("/index/answer/{project_id_str}", response_model=AnswerRAGResponse)
 async def answer_rag(request: Request, project_id_str: str, answer_rag_request: AnswerRAGRequest):
@@ -162,20 +387,7 @@ async def answer_rag(request: Request, project_id_str: str, answer_rag_request:
         
         logger.info(f"Request for project_id_str: '{project_id_str}'. Found project with _id: '{project_db_id}'")
 
-        # <<< ADD Language Detection and Setting >>>
-        try:
-            # Detect language from user question
-            detected_lang = detect(answer_rag_request.text)
-            logger.info(f"Detected language: {detected_lang}")
-            # Set the language in the template parser for this request
-            request.app.template_parser.set_language(detected_lang)
-        except LangDetectException:
-            logger.warning(f"Could not detect language for text: '{answer_rag_request.text[:50]}...'. Defaulting to '{request.app.template_parser.default_language}'.")
-            request.app.template_parser.set_language(None) # Use default
-        except Exception as lang_e: # Catch any other potential error during detection/setting
-             logger.error(f"Error setting language: {lang_e}. Defaulting language.")
-             request.app.template_parser.set_language(None) # Use default
-        # <<< END Language Detection and Setting >>>
+        language = detect_request_language(request, answer_rag_request.text)
 
         # Initialize NLPController with dependencies
         app_logger = request.app.logger if hasattr(request.app, 'logger') else logging.getLogger('uvicorn.error')
@@ -185,16 +397,43 @@ async def answer_rag(request: Request, project_id_str: str, answer_rag_request:
             generation_client=request.app.generation_client,
             embedding_client=request.app.embedding_client,
             template_parser=request.app.template_parser,
-            logger=app_logger
+            logger=app_logger,
+            embedding_cache=request.app.embedding_cache,
+            embedding_executor=request.app.embedding_executor,
+            async_vectordb_client=request.app.async_vectordb_client,
+            query_embedding_cache=request.app.query_embedding_cache,
+            answer_cache=request.app.answer_cache,
+            language=language
         )
         
-        # Correctly access parameters from the request body model
-        answer, full_prompt, chat_history, extracted_data, extracted_table = nlp_controller.answer_rag_question(
-            project_identifier_str=project_id_str, # Use the ID string from the URL
-            question=answer_rag_request.text,  # Access 'text' from body model
-            file_id=answer_rag_request.file_id, # Access 'file_id' from body model
-            conversation_history=answer_rag_request.conversation_history if hasattr(answer_rag_request, 'conversation_history') else []
-        )
+        conversation_history = compact_history(request, answer_rag_request.session_id,
+                                               answer_rag_request.conversation_history, language)
+        index_version = project.get("project_index_version", 0)
+
+        async def compute_answer():
+            # Correctly access parameters from the request body model
+            result = await nlp_controller.aanswer_rag_question(
+                project_identifier_str=project_id_str, # Use the ID string from the URL
+                question=answer_rag_request.text,  # Access 'text' from body model
+                file_id=answer_rag_request.file_id, # Access 'file_id' from body model
+                conversation_history=conversation_history,
+                index_version=index_version,
+                limit=answer_rag_request.limit
+            )
+            return result, nlp_controller.answer_cache_hit, nlp_controller.context_report
+
+        # Identical questions already in flight are awaited instead of being answered again
+        single_flight = getattr(request.app, "single_flight", None)
+        if single_flight is None:
+            shared_answer = await compute_answer()
+        else:
+            shared_answer = await single_flight.run(
+                answer_flight_key("answer", nlp_controller, project_id_str, index_version,
+                                  answer_rag_request.text, answer_rag_request.file_id,
+                                  conversation_history, answer_rag_request.limit),
+                compute_answer,
+            )
+        (answer, full_prompt, chat_history, extracted_data, extracted_table), cache_hit, context_report = shared_answer
 
         # Handle case where answer_rag_question returns the "Cannot answer" message directly
         if full_prompt == "No RAG prompt generated.":
@@ -217,6 +456,9 @@ async def answer_rag(request: Request, project_id_str: str, answer_rag_request:
                 status_code=status.HTTP_404_NOT_FOUND, 
                 detail="Could not generate an answer. No relevant documents found or an error occurred."
             )
+
+        remember_turn(request, answer_rag_request.session_id, answer_rag_request.conversation_history,
+                      answer_rag_request.text, answer, language)
         
         # Ensure this returns a dict or Pydantic model for automatic JSON conversion by FastAPI
         return AnswerRAGResponse(
@@ -225,7 +467,9 @@ async def answer_rag(request: Request, project_id_str: str, answer_rag_request:
             full_prompt=full_prompt if full_prompt is not None else "",
             chat_history=chat_history if chat_history is not None else [],
             extracted_data_point=extracted_data,
-            extracted_table_data=extracted_table
+            extracted_table_data=extracted_table,
+            cache_hit=cache_hit,
+            context=context_report
         )
     except HTTPException:
         # Re-raise any HTTPExceptions we've already raised
@@ -247,10 +491,101 @@ async def answer_rag(request: Request, project_id_str: str, answer_rag_request:
             detail=f"Critical error during answer operation for project {project_id_str}: {str(e)}"
         )
 
+@nlp_router.post("/index/answer/stream/{project_id_str}")
+async def answer_rag_stream(request: Request, project_id_str: str, answer_rag_request: AnswerRAGRequest):
+    """Streams the answer of /index/answer as Server-Sent Events.
+
+    Emits "token" events with text deltas as the LLM produces them, then a
+    "done" event with the AnswerRAGResponse fields, or an "error" event.
+    """
+    logger.info(f"[/index/answer/stream/{project_id_str}] CALLED. Request body: {answer_rag_request.dict()}")
+
+    if request.app.db_client is None:
+        logger.error("Database client is not available - MongoDB connection may have failed during startup")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database service is not available. Please try again later."
+        )
+
+    project_model = ProjectModel(db_client=request.app.db_client)
+    project = await project_model.get_project_or_create_one(project_id_str)
+    if project is None:
+        logger.error(f"Project not found or could not be created for ID: {project_id_str} in answer_rag_stream")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Project context '{project_id_str}' not found.")
+
+    language = detect_request_language(request, answer_rag_request.text)
+
+    app_logger = request.app.logger if hasattr(request.app, 'logger') else logging.getLogger('uvicorn.error')
+    nlp_controller = NLPController(
+        db_client=request.app.db_client,
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        logger=app_logger,
+        embedding_cache=request.app.embedding_cache,
+        embedding_executor=request.app.embedding_executor,
+        async_vectordb_client=request.app.async_vectordb_client,
+        query_embedding_cache=request.app.query_embedding_cache,
+        answer_cache=request.app.answer_cache,
+        language=language
+    )
+
+    conversation_history = compact_history(request, answer_rag_request.session_id,
+                                           answer_rag_request.conversation_history, language)
+    index_version = project.get("project_index_version", 0)
+
+    def produce_events():
+        return nlp_controller.astream_rag_answer(
+            project_identifier_str=project_id_str,
+            question=answer_rag_request.text,
+            file_id=answer_rag_request.file_id,
+            conversation_history=conversation_history,
+            index_version=index_version,
+            limit=answer_rag_request.limit,
+        )
+
+    # Followers of an identical stream in flight replay its tokens, then receive the rest as they come
+    single_flight = getattr(request.app, "single_flight", None)
+    if single_flight is None:
+        answer_events = produce_events()
+    else:
+        answer_events = single_flight.stream(
+            answer_flight_key("stream", nlp_controller, project_id_str, index_version,
+                              answer_rag_request.text, answer_rag_request.file_id,
+                              conversation_history, answer_rag_request.limit),
+            produce_events,
+        )
+
+    async def events():
+        try:
+            async for event, data in answer_events:
+                # Events may be shared with other subscribers of the same stream
+                data = dict(data)
+                if event == "done":
+                    data["signal"] = ResponseSignal.RAG_ANSWER_SUCCESS.value
+                    remember_turn(request, answer_rag_request.session_id, answer_rag_request.conversation_history,
+                                  answer_rag_request.text, data.get("answer"), language)
+                elif event == "error":
+                    data["signal"] = ResponseSignal.RAG_ANSWER_ERROR.value
+                yield format_sse_event(event, data)
+        except Exception as e:
+            logger.exception(f"[NLP_ANSWER_STREAM] Error while streaming answer for project {project_id_str}: {e}")
+            yield format_sse_event("error", {
+                "signal": ResponseSignal.RAG_ANSWER_ERROR.value,
+                "detail": f"Error during answer operation for project {project_id_str}: {str(e)}",
+            })
+        finally:
+            # Leaves a shared stream right away when the client disconnects
+            await answer_events.aclose()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 class GeneralChatRequest(BaseModel):
     """Request model for general chat without RAG context."""
     text: str = Field(..., description="The user's message text.")
     conversation_history: Optional[List[Dict[str, str]]] = Field([], description="Optional: Previous conversation history for context")
+    session_id: Optional[str] = Field(None, description="Optional: Chat session id; older turns of the session are replaced by a running summary")
 
 class GeneralChatResponse(BaseModel):
     """Response model for general chat."""
@@ -271,13 +606,7 @@ async def general_chat(request: Request, chat_request: GeneralChatRequest):
     
     try:
         # Detect language from user message
-        try:
-            detected_lang = detect(chat_request.text)
-            logger.info(f"Detected language: {detected_lang}")
-            request.app.template_parser.set_language(detected_lang)
-        except Exception as lang_e:
-            logger.warning(f"Language detection failed: {lang_e}. Using default.")
-            request.app.template_parser.set_language(None)
+        language = detect_request_language(request, chat_request.text)
         
         # Initialize NLPController with dependencies
         app_logger = request.app.logger if hasattr(request.app, 'logger') else logging.getLogger('uvicorn.error')
@@ -287,13 +616,15 @@ async def general_chat(request: Request, chat_request: GeneralChatRequest):
             generation_client=request.app.generation_client,
             embedding_client=request.app.embedding_client,
             template_parser=request.app.template_parser,
-            logger=app_logger
+            logger=app_logger,
+            embedding_cache=request.app.embedding_cache,
+            language=language
         )
         
         # Get a direct answer from the generation client (LLM)
         # Extract conversation history from request if available
-        conversation_history = getattr(chat_request, 'conversation_history', [])
-        answer = nlp_controller.direct_llm_query(
+        conversation_history = compact_history(request, chat_request.session_id, chat_request.conversation_history, language)
+        answer = await nlp_controller.adirect_llm_query(
             question=chat_request.text,
             conversation_history=conversation_history
         )
@@ -306,6 +637,9 @@ async def general_chat(request: Request, chat_request: GeneralChatRequest):
         if len(answer) < 10:
             logger.warning(f"[/general/answer] Suspiciously short answer: '{answer}'")
             answer = f"{answer} (I apologize if this answer seems incomplete. Please try phrasing your question differently.)"
+
+        remember_turn(request, chat_request.session_id, chat_request.conversation_history,
+                      chat_request.text, answer, language)
         
         return GeneralChatResponse(
             signal=ResponseSignal.GENERAL_CHAT_SUCCESS.value,
@@ -317,4 +651,74 @@ async def general_chat(request: Request, chat_request: GeneralChatRequest):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing general chat request: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@nlp_router.post("/general/answer/stream")
+async def general_chat_stream(request: Request, chat_request: GeneralChatRequest):
+    """Streams the answer of /general/answer as Server-Sent Events.
+
+    Emits "token" events with text deltas as the LLM produces them, then a
+    "done" event with the full answer, or an "error" event.
+    """
+    logger.info(f"[/general/answer/stream] CALLED. Request body: {chat_request.dict()}")
+
+    language = detect_request_language(request, chat_request.text)
+
+    app_logger = request.app.logger if hasattr(request.app, 'logger') else logging.getLogger('uvicorn.error')
+    nlp_controller = NLPController(
+        db_client=request.app.db_client,
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        logger=app_logger,
+        embedding_cache=request.app.embedding_cache,
+        language=language
+    )
+
+    async def events():
+        try:
+            async for event, data in nlp_controller.astream_direct_llm_query(
+                question=chat_request.text,
+                conversation_history=compact_history(request, chat_request.session_id,
+                                                     chat_request.conversation_history, language),
+            ):
+                if event == "done":
+                    data["signal"] = ResponseSignal.GENERAL_CHAT_SUCCESS.value
+                    remember_turn(request, chat_request.session_id, chat_request.conversation_history,
+                                  chat_request.text, data.get("answer"), language)
+                elif event == "error":
+                    data["signal"] = ResponseSignal.GENERAL_CHAT_ERROR.value
+                yield format_sse_event(event, data)
+        except Exception as e:
+            logger.exception(f"[GENERAL_CHAT_STREAM] ERROR in /general/answer/stream: {e}")
+            yield format_sse_event("error", {
+                "signal": ResponseSignal.GENERAL_CHAT_ERROR.value,
+                "detail": f"Error processing general chat request: {str(e)}",
+            })
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@nlp_router.get("/stats")
+async def get_nlp_stats(request: Request):
+    """Reports embedding cache, query cache, answer cache, conversation, single-flight, embedding executor and vector DB counters."""
+
+    embedding_cache = request.app.embedding_cache
+    query_embedding_cache = request.app.query_embedding_cache
+    answer_cache = request.app.answer_cache
+    conversation_manager = getattr(request.app, "conversation_manager", None)
+    single_flight = getattr(request.app, "single_flight", None)
+    embedding_executor = request.app.embedding_executor
+    vectordb_client = request.app.vectordb_client
+
+    return JSONResponse(
+        content={
+            "embedding_cache": embedding_cache.get_stats() if embedding_cache else None,
+            "query_embedding_cache": query_embedding_cache.get_stats() if query_embedding_cache else None,
+            "answer_cache": answer_cache.get_stats() if answer_cache else None,
+            "conversations": conversation_manager.get_stats() if conversation_manager else None,
+            "single_flight": single_flight.get_stats() if single_flight else None,
+            "embedding_executor": dict(embedding_executor.stats) if embedding_executor else None,
+            "vectordb": vectordb_client.get_stats() if hasattr(vectordb_client, "get_stats") else None,
+        }
+    )
@@ -1,9 +1,19 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
 
+class VectorConfigRequest(BaseModel):
+    quantization: Optional[str] = None  # "none", "scalar" or "binary"
+    on_disk: Optional[bool] = None
+    always_ram: Optional[bool] = None
+
 class SearchRequest(BaseModel):
     text: str
-    limit: Optional[int] = 10
\ No newline at end of file
+    limit: Optional[int] = 10
+
+class BatchSearchRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1, max_length=64)
+    limit: Optional[int] = 10
+    file_id: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,218 @@
+from collections import OrderedDict
+import hashlib
+import json
+import re
+import threading
+import time
+from typing import Any, Optional, Tuple
+import numpy as np
+from .EmbeddingCache import EmbeddingCache
+
+class AnswerCacheEntry:
+
+    def __init__(self, scope: tuple, value: Any, vector: Optional[np.ndarray], expires_at: float,
+                 numbers: tuple = ()):
+        self.scope = scope
+        self.value = value
+        self.vector = vector
+        self.expires_at = expires_at
+        # Numbers of the question; a near-duplicate must ask about the same ones
+        self.numbers = numbers
+
+class AnswerCache:
+    """In-memory cache of RAG answers, with exact and near-duplicate lookup.
+
+    Every answer is stored under a scope of (project, project index version,
+    file_id, answer language, conversation history digest, retrieval limit)
+    plus the normalized question. A question matches exactly on its
+    normalized text, or, when `similarity_threshold` is set, semantically
+    when its query embedding has at least that cosine similarity with a
+    cached question of the same scope that mentions the same numbers:
+    "revenue in 2022" and "revenue in 2023" embed almost identically but
+    never share an answer.
+
+    Index versions are bumped whenever a project's index changes, so older
+    answers can no longer match; they are dropped as soon as a newer version
+    of the project is seen. Entries also expire after `ttl_seconds` and the
+    cache is bounded to `max_entries` (least recently used first).
+    """
+
+    def __init__(self, max_entries: int = 2000, ttl_seconds: int = 86400,
+                 similarity_threshold: float = 0.0):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached answers
+            ttl_seconds: Seconds an answer stays valid (0 for no expiry)
+            similarity_threshold: Minimum cosine similarity of a near-duplicate question (0 disables)
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+
+        self.entries: "OrderedDict[str, AnswerCacheEntry]" = OrderedDict()
+        # scope -> keys of its entries, for the semantic scan and invalidation
+        self.scopes: dict = {}
+        self.project_versions: dict = {}
+        self.lock = threading.Lock()
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_scope(project_id: str, index_version: int, file_id: Optional[str] = None,
+                   language: Optional[str] = None, conversation_history: list = None,
+                   limit: Optional[int] = None) -> tuple:
+        history_digest = hashlib.sha256(
+            json.dumps(conversation_history or [], sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        return (str(project_id), int(index_version or 0), file_id or "", language or "", history_digest,
+                int(limit or 0))
+
+    @staticmethod
+    def make_key(scope: tuple, question: str) -> str:
+        question_digest = hashlib.sha256(
+            EmbeddingCache.normalize_text(question).lower().encode("utf-8")
+        ).hexdigest()
+        return ":".join(str(part) for part in scope) + f":{question_digest}"
+
+    @staticmethod
+    def extract_numbers(question: str) -> tuple:
+        # int() also reads Arabic-Indic digits, so "٢٠٢٣" and "2023" are the same number
+        return tuple(sorted(str(int(number)) for number in re.findall(r"\d+", question or "")))
+
+    @staticmethod
+    def normalize_vector(vector) -> Optional[np.ndarray]:
+        if vector is None:
+            return None
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def get(self, scope: tuple, question: str) -> Optional[Any]:
+        """Exact lookup on the normalized question; needs no embedding.
+
+        A miss is only counted by the get_similar call that follows it.
+        """
+        with self.lock:
+            self._observe_version(scope)
+            entry = self._get_entry(self.make_key(scope, question))
+            if entry is None:
+                return None
+
+            self.exact_hits += 1
+            return entry.value
+
+    def get_similar(self, scope: tuple, query_vector: list, question: str = "") -> Tuple[Optional[Any], float]:
+        """Returns the answer of the most similar cached question of `scope` and its similarity.
+
+        Only cached questions with the same numbers as `question` are considered.
+        """
+        query = self.normalize_vector(query_vector)
+        numbers = self.extract_numbers(question)
+
+        with self.lock:
+            entries = []
+            if self.similarity_threshold and query is not None:
+                entries = [
+                    (key, self.entries[key]) for key in self.scopes.get(scope, ())
+                    if self.entries[key].vector is not None and len(self.entries[key].vector) == len(query)
+                    and self.entries[key].numbers == numbers
+                ]
+
+            if not entries:
+                self.misses += 1
+                return None, 0.0
+
+            similarities = np.stack([entry.vector for _, entry in entries]) @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.similarity_threshold:
+                self.misses += 1
+                return None, float(similarities[best])
+
+            entry = self._get_entry(entries[best][0])
+            if entry is None:
+                self.misses += 1
+                return None, 0.0
+
+            self.semantic_hits += 1
+            return entry.value, float(similarities[best])
+
+    def put(self, scope: tuple, question: str, value: Any, query_vector: list = None):
+        key = self.make_key(scope, question)
+        entry = AnswerCacheEntry(
+            scope=scope,
+            value=value,
+            vector=self.normalize_vector(query_vector),
+            expires_at=time.monotonic() + self.ttl_seconds,
+            numbers=self.extract_numbers(question),
+        )
+
+        with self.lock:
+            self._observe_version(scope)
+            if scope[1] < self.project_versions.get(scope[0], 0):
+                # Answered against an index that changed meanwhile
+                return
+
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            self.scopes.setdefault(scope, set()).add(key)
+
+            while len(self.entries) > self.max_entries:
+                old_key, old_entry = self.entries.popitem(last=False)
+                self._forget(old_key, old_entry.scope)
+                self.evictions += 1
+
+    def invalidate_project(self, project_id: str):
+        """Drops every cached answer of a project."""
+        with self.lock:
+            self._drop_scopes(lambda scope: scope[0] == str(project_id))
+
+    def _observe_version(self, scope: tuple):
+        project_id, index_version = scope[0], scope[1]
+        if index_version > self.project_versions.get(project_id, -1):
+            if project_id in self.project_versions:
+                self._drop_scopes(lambda s: s[0] == project_id and s[1] < index_version)
+            self.project_versions[project_id] = index_version
+
+    def _drop_scopes(self, predicate):
+        for scope in [scope for scope in self.scopes if predicate(scope)]:
+            for key in self.scopes.pop(scope):
+                if self.entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def _get_entry(self, key: str) -> Optional[AnswerCacheEntry]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        if self.ttl_seconds and entry.expires_at <= time.monotonic():
+            del self.entries[key]
+            self._forget(key, entry.scope)
+            return None
+
+        self.entries.move_to_end(key)
+        return entry
+
+    def _forget(self, key: str, scope: tuple):
+        keys = self.scopes.get(scope)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.scopes[scope]
+
+    def get_stats(self) -> dict:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.exact_hits + self.semantic_hits) / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
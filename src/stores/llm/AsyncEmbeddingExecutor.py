@@ -0,0 +1,172 @@
+from .RateLimiter import RateLimiter
+from .LLMEnums import DocumentTypeEnum
+import asyncio
+import httpx
+import logging
+import openai
+import random
+from typing import List, Optional
+
+RETRYABLE_EXCEPTIONS = (
+    openai.APIConnectionError,
+    httpx.TransportError,
+    asyncio.TimeoutError,
+    ConnectionError,
+)
+
+class AsyncEmbeddingExecutor:
+    """Runs embedding batches concurrently against a provider's async client.
+
+    Batches are sent under a semaphore of `max_concurrency` in-flight requests,
+    each gated by a RateLimiter that follows the provider's rate-limit headers.
+    Query embeddings have their own semaphore of `query_max_concurrency` and
+    skip the limiter's queue (while still counting against its budget), so
+    an interactive search never waits behind a large ingestion job.
+    429 and 5xx responses (and transport errors) are retried with full-jitter
+    exponential backoff; a 429 also pauses the limiter so the other in-flight
+    batches back off together instead of stampeding the provider.
+    """
+
+    def __init__(self, embedding_client,
+                       max_concurrency: int = 4,
+                       query_max_concurrency: int = 8,
+                       batch_size: int = None,
+                       requests_per_minute: int = 3000,
+                       tokens_per_minute: int = 1000000,
+                       max_retries: int = 5,
+                       retry_base_delay: float = 0.5,
+                       retry_max_delay: float = 30.0):
+
+        self.embedding_client = embedding_client
+        self.max_concurrency = max(1, max_concurrency)
+        self.query_max_concurrency = max(1, query_max_concurrency)
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.query_semaphore = asyncio.Semaphore(self.query_max_concurrency)
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+        )
+
+        self.stats = {
+            "batches": 0,
+            "texts": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "failures": 0,
+        }
+        self.logger = logging.getLogger(__name__)
+
+    def get_batch_size(self) -> int:
+        if self.batch_size:
+            return self.batch_size
+        return getattr(self.embedding_client, "embedding_batch_size", None) or 96
+
+    async def embed_texts(self, texts: List[str],
+                          document_type: str = DocumentTypeEnum.DOCUMENT.value) -> Optional[List[list]]:
+        """Embeds `texts` in provider-sized batches, several batches in flight.
+
+        Returns:
+            The vectors in input order, or None if any batch ultimately failed
+        """
+        if not texts:
+            return []
+
+        batch_size = self.get_batch_size()
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+        results = await asyncio.gather(*[
+            self._embed_batch(batch=batch, document_type=document_type)
+            for batch in batches
+        ])
+
+        if any(result is None for result in results):
+            return None
+
+        return [vector for result in results for vector in result]
+
+    async def _embed_batch(self, batch: List[str], document_type: str) -> Optional[List[list]]:
+        is_query = document_type == DocumentTypeEnum.QUERY.value
+        async with (self.query_semaphore if is_query else self.semaphore):
+            for attempt in range(self.max_retries + 1):
+                await self.rate_limiter.acquire(tokens=self.estimate_tokens(batch), priority=is_query)
+                try:
+                    vectors, headers = await self.embedding_client.aembed_batch(
+                        texts=batch,
+                        document_type=document_type
+                    )
+                except Exception as e:
+                    status_code = self.get_status_code(e)
+                    if not self.is_retryable(e, status_code) or attempt == self.max_retries:
+                        self.logger.error(f"Embedding batch failed after {attempt + 1} attempt(s): {e}")
+                        self.stats["failures"] += 1
+                        return None
+
+                    delay = self.get_retry_after(e) or self.backoff_delay(attempt)
+                    if status_code == 429:
+                        self.stats["rate_limited"] += 1
+                        self.rate_limiter.pause(delay)
+
+                    self.stats["retries"] += 1
+                    self.logger.warning(f"Embedding batch failed with status {status_code}, retrying in {delay:.2f}s: {e}")
+                    await asyncio.sleep(delay)
+                    continue
+
+                self.rate_limiter.update_from_headers(headers)
+
+                if vectors is None or len(vectors) != len(batch):
+                    self.logger.error("Embedding client returned no vectors or a mismatched count for batch")
+                    self.stats["failures"] += 1
+                    return None
+
+                self.stats["batches"] += 1
+                self.stats["texts"] += len(batch)
+                return vectors
+
+        return None
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt)))
+
+    @staticmethod
+    def estimate_tokens(texts: List[str]) -> int:
+        # Roughly 4 characters per token for English text
+        return sum(len(text) // 4 + 1 for text in texts)
+
+    @staticmethod
+    def get_status_code(error: Exception) -> Optional[int]:
+        status_code = getattr(error, "status_code", None)
+        if status_code is None:
+            response = getattr(error, "response", None)
+            status_code = getattr(response, "status_code", None)
+        return status_code
+
+    @staticmethod
+    def is_retryable(error: Exception, status_code: Optional[int]) -> bool:
+        if status_code is not None:
+            return status_code == 429 or status_code >= 500
+        return isinstance(error, RETRYABLE_EXCEPTIONS)
+
+    @staticmethod
+    def get_retry_after(error: Exception) -> Optional[float]:
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or getattr(error, "headers", None)
+        if not headers:
+            return None
+
+        for header in ("retry-after-ms", "retry-after"):
+            value = headers.get(header)
+            if value is None:
+                continue
+            try:
+                seconds = float(value)
+            except ValueError:
+                continue
+            return seconds / 1000.0 if header == "retry-after-ms" else seconds
+
+        return None
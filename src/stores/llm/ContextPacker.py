@@ -0,0 +1,186 @@
+import logging
+import math
+import time
+from functools import lru_cache
+from typing import List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # Token counts are estimated from the text length without it
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Rough ratios used when no tokenizer is available for the model. Non-Latin
+# scripts such as Arabic take far more tokens per character than English.
+CHARS_PER_TOKEN = 4
+NON_ASCII_CHARS_PER_TOKEN = 1.5
+# Role and separator tokens every chat message costs on top of its content
+MESSAGE_OVERHEAD_TOKENS = 4
+# A tokenizer that failed to load (e.g. its BPE file could not be downloaded) is retried after this delay
+ENCODING_RETRY_SECONDS = 60
+
+_encodings: dict = {}
+_encoding_failures: dict = {}
+
+def get_encoding(model_id: Optional[str]):
+    if tiktoken is None:
+        return None
+
+    encoding = _encodings.get(model_id)
+    if encoding is not None:
+        return encoding
+
+    failed_at = _encoding_failures.get(model_id)
+    if failed_at is not None and time.monotonic() - failed_at < ENCODING_RETRY_SECONDS:
+        return None
+
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model_id or "")
+        except KeyError:
+            # Unknown (or non-OpenAI) model: the GPT-4 encoding is a close enough count
+            encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # Only successes are kept, so a transient failure does not disable exact counts for good
+        _encoding_failures[model_id] = time.monotonic()
+        logger.warning(f"Could not load a tokenizer for {model_id}, estimating token counts: {e}")
+        return None
+
+    _encodings[model_id] = encoding
+    _encoding_failures.pop(model_id, None)
+    return encoding
+
+def estimate_tokens(text: str) -> int:
+    non_ascii = sum(1 for char in text if ord(char) > 127)
+    return math.ceil((len(text) - non_ascii) / CHARS_PER_TOKEN + non_ascii / NON_ASCII_CHARS_PER_TOKEN)
+
+@lru_cache(maxsize=10000)
+def _count_encoded_tokens(model_id: Optional[str], text: str) -> int:
+    return len(get_encoding(model_id).encode(text, disallowed_special=()))
+
+def count_tokens(model_id: Optional[str], text: str) -> int:
+    if not text:
+        return 0
+
+    if get_encoding(model_id) is None:
+        return estimate_tokens(text)
+    return _count_encoded_tokens(model_id, text)
+
+class PackedContext:
+
+    def __init__(self, max_input_tokens: int):
+        self.max_input_tokens = max_input_tokens
+        self.documents: List[dict] = []
+        self.history: List[dict] = []
+        self.used_tokens = 0
+        self.dropped_documents = 0
+        self.trimmed_documents = 0
+        self.dropped_turns = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "max_input_tokens": self.max_input_tokens,
+            "used_tokens": self.used_tokens,
+            "documents": len(self.documents),
+            "dropped_documents": self.dropped_documents,
+            "trimmed_documents": self.trimmed_documents,
+            "history_turns": len(self.history),
+            "dropped_turns": self.dropped_turns,
+        }
+
+class ContextPacker:
+    """Fits retrieved chunks and conversation turns into an input token budget.
+
+    The fixed parts of the prompt (system prompt, question) are always kept.
+    The most recent conversation turns are added next, up to
+    `max_history_tokens`, then retrieved chunks from the highest score down
+    until `max_input_tokens` is reached. The first chunk that no longer fits
+    is trimmed when at least `MIN_TRIMMED_CHUNK_TOKENS` remain; the rest is
+    dropped and reported.
+
+    Tokens are counted with the model's tiktoken encoding when tiktoken is
+    installed, and estimated from the text length otherwise.
+    """
+
+    MIN_TRIMMED_CHUNK_TOKENS = 64
+
+    def __init__(self, max_input_tokens: int = 6000, max_history_tokens: int = 1500,
+                 model_id: Optional[str] = None):
+        """Initialize the packer.
+
+        Args:
+            max_input_tokens: Token budget of the whole prompt
+            max_history_tokens: Share of the budget conversation turns may use
+            model_id: Generation model, used to pick its tokenizer
+        """
+        self.max_input_tokens = max_input_tokens
+        self.max_history_tokens = max_history_tokens
+        self.model_id = model_id
+
+    def count_tokens(self, text: str) -> int:
+        return count_tokens(self.model_id, text or "")
+
+    def trim_to_tokens(self, text: str, max_tokens: int) -> str:
+        encoding = get_encoding(self.model_id)
+        if encoding is None:
+            # Cut where the estimate reaches max_tokens
+            used = 0.0
+            for position, char in enumerate(text):
+                used += 1 / (NON_ASCII_CHARS_PER_TOKEN if ord(char) > 127 else CHARS_PER_TOKEN)
+                if used > max_tokens:
+                    return text[:position]
+            return text
+
+        tokens = encoding.encode(text, disallowed_special=())
+        return encoding.decode(tokens[:max_tokens])
+
+    def pack(self, fixed_texts: List[str], documents: List[dict], history: List[dict] = None,
+             document_overhead: str = "") -> PackedContext:
+        """Selects the documents and conversation turns to put in the prompt.
+
+        Args:
+            fixed_texts: Prompt parts that are always sent
+            documents: Retrieved documents with "text" and "score"
+            history: Conversation messages with "role" and "content", oldest first
+            document_overhead: The document template rendered without a chunk
+
+        Returns:
+            A PackedContext; documents are ordered by score and history keeps its order
+        """
+        packed = PackedContext(self.max_input_tokens)
+        remaining = self.max_input_tokens - sum(
+            self.count_tokens(text) + MESSAGE_OVERHEAD_TOKENS for text in fixed_texts
+        )
+
+        # Most recent turns first, stopping at the first one that does not fit
+        history = history or []
+        history_budget = min(self.max_history_tokens, max(remaining, 0))
+        kept_turns = []
+        for message in reversed(history):
+            cost = self.count_tokens(message.get("content", "")) + MESSAGE_OVERHEAD_TOKENS
+            if cost > history_budget:
+                break
+            kept_turns.append(message)
+            history_budget -= cost
+            remaining -= cost
+
+        packed.history = kept_turns[::-1]
+        packed.dropped_turns = len(history) - len(kept_turns)
+
+        overhead = self.count_tokens(document_overhead)
+        for document in sorted(documents, key=lambda doc: doc.get("score") or 0.0, reverse=True):
+            cost = self.count_tokens(document["text"]) + overhead
+            if cost <= remaining:
+                packed.documents.append(document)
+                remaining -= cost
+            elif remaining - overhead >= self.MIN_TRIMMED_CHUNK_TOKENS:
+                trimmed = dict(document, text=self.trim_to_tokens(document["text"], remaining - overhead))
+                packed.documents.append(trimmed)
+                packed.trimmed_documents += 1
+                remaining -= self.count_tokens(trimmed["text"]) + overhead
+            else:
+                packed.dropped_documents += 1
+
+        packed.used_tokens = self.max_input_tokens - remaining
+        return packed
@@ -0,0 +1,197 @@
+from collections import OrderedDict
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import List, Optional
+
+class ConversationSummary:
+
+    def __init__(self, text: str, folded_messages: int, prefix_digest: str, expires_at: float):
+        self.text = text
+        # Number of leading history messages the summary stands for
+        self.folded_messages = folded_messages
+        self.prefix_digest = prefix_digest
+        self.expires_at = expires_at
+
+class ConversationManager:
+    """Keeps long chats short by folding older turns into a running summary.
+
+    Clients keep sending their full `conversation_history`. For a chat with a
+    session id, compact() replaces the messages covered by the session's
+    summary with a single summary message and keeps the last `keep_messages`
+    verbatim. After each answer, schedule_update() folds the messages that
+    fell out of that window into the summary in a background task, so
+    summarization never delays the next request: until it finishes, the
+    messages it has not covered yet are sent verbatim.
+
+    Summaries are cached per session (LRU bounded by `max_sessions`, expiring
+    after `ttl_seconds`) along with a digest of the messages they cover, so a
+    client that edits or restarts its history under the same session id
+    does not get a stale summary. Meant to be used from the event loop.
+    """
+
+    def __init__(self, generation_client, template_parser, keep_messages: int = 6,
+                 summary_max_tokens: int = 300, max_sessions: int = 10000,
+                 ttl_seconds: int = 86400):
+        """Initialize the manager.
+
+        Args:
+            generation_client: LLM provider used to write the summaries
+            template_parser: Parser of the "summary" prompt templates
+            keep_messages: Most recent messages always sent verbatim
+            summary_max_tokens: Output token limit of a summary
+            max_sessions: Maximum number of cached session summaries
+            ttl_seconds: Seconds a session summary stays valid (0 for no expiry)
+        """
+        self.generation_client = generation_client
+        self.template_parser = template_parser
+        self.keep_messages = max(2, keep_messages)
+        self.summary_max_tokens = summary_max_tokens
+        self.max_sessions = max(1, max_sessions)
+        self.ttl_seconds = ttl_seconds
+
+        self.summaries: "OrderedDict[str, ConversationSummary]" = OrderedDict()
+        self.pending: dict = {}
+        self.logger = logging.getLogger(__name__)
+
+        self.compacted_requests = 0
+        self.folded_messages = 0
+        self.summaries_written = 0
+        self.summary_failures = 0
+
+    @staticmethod
+    def digest(messages: List[dict]) -> str:
+        # Only role and content, so extra client-side fields do not invalidate summaries
+        return hashlib.sha256(json.dumps(
+            [[message.get("role"), message.get("content")] for message in messages],
+            ensure_ascii=False,
+        ).encode("utf-8")).hexdigest()
+
+    def get_summary(self, session_id: str, history: List[dict]) -> Optional[ConversationSummary]:
+        """Returns the session's summary if it still describes the start of `history`."""
+        summary = self.summaries.get(session_id)
+        if summary is None:
+            return None
+
+        if self.ttl_seconds and summary.expires_at <= time.monotonic():
+            del self.summaries[session_id]
+            return None
+
+        if summary.folded_messages > len(history) \
+                or self.digest(history[:summary.folded_messages]) != summary.prefix_digest:
+            return None
+
+        self.summaries.move_to_end(session_id)
+        return summary
+
+    def compact(self, session_id: Optional[str], history: List[dict], language: Optional[str] = None) -> List[dict]:
+        """Returns the history to send: the session summary, then the messages it does not cover."""
+        if not session_id or not history:
+            return history
+
+        summary = self.get_summary(session_id, history)
+        if summary is None or not summary.folded_messages:
+            return history
+
+        summary_message = self.template_parser.get("summary", "summary_message", {"summary": summary.text},
+                                                   language=language)
+        if not summary_message:
+            return history
+
+        self.compacted_requests += 1
+        self.folded_messages += summary.folded_messages
+        return [{"role": "assistant", "content": summary_message}] + history[summary.folded_messages:]
+
+    def schedule_update(self, session_id: Optional[str], history: List[dict], question: str, answer: str,
+                        language: Optional[str] = None):
+        """Folds the messages that left the verbatim window into the summary, in the background.
+
+        The summary is written in `language`, the language of the request that
+        produced the answer; the shared template parser's language is not used.
+        """
+        if not session_id or not answer:
+            return
+
+        messages = list(history or []) + [
+            {"role": "user", "content": question},
+            {"role": "assistant", "content": answer},
+        ]
+        fold_until = len(messages) - self.keep_messages
+        if fold_until <= 0 or session_id in self.pending:
+            return
+
+        summary = self.get_summary(session_id, messages)
+        folded = summary.folded_messages if summary else 0
+        if fold_until <= folded:
+            return
+
+        system_prompt = self.template_parser.get("summary", "system_prompt", {
+            "max_words": int(self.summary_max_tokens * 0.75),
+        }, language=language)
+        prompt = self.template_parser.get("summary", "summary_prompt", {
+            "summary": summary.text if summary else "-",
+            "messages": "\n".join(
+                f"{message.get('role', 'user')}: {message.get('content', '')}"
+                for message in messages[folded:fold_until]
+            ),
+        }, language=language)
+        if not system_prompt or not prompt:
+            return
+
+        task = asyncio.create_task(self._update(session_id, messages[:fold_until], system_prompt, prompt))
+        self.pending[session_id] = task
+        task.add_done_callback(lambda _: self.pending.pop(session_id, None))
+
+    async def _update(self, session_id: str, folded_messages: List[dict], system_prompt: str, prompt: str):
+        try:
+            text = await self.generation_client.agenerate_text(
+                prompt=prompt,
+                chat_history=[
+                    self.generation_client.construct_prompt(
+                        prompt=system_prompt,
+                        role=self.generation_client.enums.SYSTEM.value,
+                    )
+                ],
+                max_output_tokens=self.summary_max_tokens,
+            )
+        except Exception as e:
+            self.summary_failures += 1
+            self.logger.error(f"Error while summarizing conversation {session_id}: {e}")
+            return
+
+        if not text or not text.strip():
+            self.summary_failures += 1
+            self.logger.error(f"Empty summary returned for conversation {session_id}")
+            return
+
+        self.summaries[session_id] = ConversationSummary(
+            text=text.strip(),
+            folded_messages=len(folded_messages),
+            prefix_digest=self.digest(folded_messages),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self.summaries.move_to_end(session_id)
+        self.summaries_written += 1
+
+        while len(self.summaries) > self.max_sessions:
+            self.summaries.popitem(last=False)
+
+    async def aclose(self):
+        """Cancels the summaries still being written."""
+        tasks = list(self.pending.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> dict:
+        return {
+            "sessions": len(self.summaries),
+            "max_sessions": self.max_sessions,
+            "pending_summaries": len(self.pending),
+            "summaries_written": self.summaries_written,
+            "summary_failures": self.summary_failures,
+            "compacted_requests": self.compacted_requests,
+            "folded_messages": self.folded_messages,
+        }
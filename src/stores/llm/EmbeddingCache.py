@@ -0,0 +1,150 @@
+from array import array
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import List, Optional
+
+class EmbeddingCache:
+    """Persistent, content-addressed embedding cache stored in SQLite.
+
+    Entries are keyed on (embedding model id, dimension, input type, sha256 of
+    the normalized text) and hold float32 vectors. The cache is bounded to
+    `max_entries`; when it overflows, the least recently used entries are
+    evicted in bulk down to `evict_to_ratio` of the bound.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 200000, evict_to_ratio: float = 0.9):
+        """Initialize the cache.
+
+        Args:
+            db_path: Path of the SQLite database file
+            max_entries: Maximum number of cached vectors
+            evict_to_ratio: Fraction of max_entries kept after an eviction pass
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.evict_to_ratio = evict_to_ratio
+        self.logger = logging.getLogger(__name__)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access REAL NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings (last_access)"
+        )
+        self.connection.commit()
+
+        self.entries = self.connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        text = unicodedata.normalize("NFKC", text)
+        return re.sub(r"\s+", " ", text).strip()
+
+    @classmethod
+    def make_key(cls, model_id: str, dimension: int, text: str, document_type: str = None) -> str:
+        digest = hashlib.sha256(cls.normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{model_id}:{dimension}:{document_type or ''}:{digest}"
+
+    def get_many(self, model_id: str, dimension: int, texts: List[str],
+                 document_type: str = None) -> List[Optional[list]]:
+        """Looks up vectors for `texts`; missing entries are returned as None."""
+        keys = [self.make_key(model_id, dimension, text, document_type) for text in texts]
+        found = {}
+
+        with self.lock:
+            unique_keys = list(dict.fromkeys(keys))
+            # Stay below SQLite's bound-variable limit
+            for i in range(0, len(unique_keys), 500):
+                batch = unique_keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                found.update(rows)
+
+            if found:
+                now = time.time()
+                self.connection.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self.connection.commit()
+
+        results = []
+        for key in keys:
+            blob = found.get(key)
+            if blob is None:
+                self.misses += 1
+                results.append(None)
+            else:
+                self.hits += 1
+                results.append(array("f", blob).tolist())
+
+        return results
+
+    def put_many(self, model_id: str, dimension: int, texts: List[str], vectors: List[list],
+                 document_type: str = None):
+        """Stores vectors for `texts`, evicting least recently used entries if needed."""
+        now = time.time()
+        rows = [
+            (self.make_key(model_id, dimension, text, document_type), array("f", vector).tobytes(), now)
+            for text, vector in zip(texts, vectors)
+            if vector is not None
+        ]
+        if not rows:
+            return
+
+        with self.lock:
+            before = self.connection.total_changes
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)", rows
+            )
+            self.entries += self.connection.total_changes - before
+
+            if self.entries > self.max_entries:
+                self._evict()
+
+            self.connection.commit()
+
+    def _evict(self):
+        target = int(self.max_entries * self.evict_to_ratio)
+        to_remove = self.entries - target
+        self.connection.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (to_remove,)
+        )
+        self.entries = target
+        self.evictions += to_remove
+        self.logger.info(f"Evicted {to_remove} least recently used embeddings from cache")
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self.entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
+import asyncio
+import numpy as np
 
 class LLMInterface(ABC):
 
+    # The model's full embedding size when set_embedding_dimensions reduced
+    # `embedding_size`, None when embeddings are used at full size
+    full_embedding_size = None
+
     @abstractmethod
     def set_generation_model(self, model_id: str):
         pass
@@ -10,15 +16,88 @@ class LLMInterface(ABC):
     def set_embedding_model(self, model_id: str, embedding_size: int):
         pass
 
+    def set_embedding_dimensions(self, dimensions: int):
+        """Reduces embeddings to their leading `dimensions` components.
+
+        Models trained with Matryoshka representation learning (such as the
+        text-embedding-3 family) keep most of their retrieval quality when
+        truncated. Must be called after set_embedding_model; providers either
+        request reduced embeddings from their API or call reduce_embeddings.
+        """
+        if not dimensions or not self.embedding_size or dimensions >= self.embedding_size:
+            return
+
+        self.full_embedding_size = self.embedding_size
+        self.embedding_size = dimensions
+
+    def reduce_embeddings(self, vectors: list) -> list:
+        """Truncates full-size vectors to `embedding_size` and renormalizes them to unit length."""
+        if not self.full_embedding_size or not vectors:
+            return vectors
+
+        truncated = np.asarray(vectors, dtype=np.float32)[:, :self.embedding_size]
+        norms = np.linalg.norm(truncated, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (truncated / norms).tolist()
+
     @abstractmethod
     def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
                             temperature: float = None):
         pass
 
+    @abstractmethod
+    def stream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                          temperature: float = None):
+        """Yields the completion as text deltas, as soon as the provider produces them."""
+        pass
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                             temperature: float = None):
+        """Generates text without blocking the event loop.
+
+        Providers with a native async client override this; the default runs
+        generate_text in a worker thread.
+        """
+        return await asyncio.to_thread(self.generate_text, prompt, chat_history,
+                                       max_output_tokens, temperature)
+
+    async def astream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                           temperature: float = None):
+        """Async variant of stream_text.
+
+        Providers with a native async client override this; the default yields
+        the agenerate_text completion as a single delta.
+        """
+        text = await self.agenerate_text(prompt, chat_history, max_output_tokens, temperature)
+        if text:
+            yield text
+
     @abstractmethod
     def embed_text(self, text: str, document_type: str = None):
         pass
 
+    @abstractmethod
+    def embed_texts(self, texts: list, document_type: str = None):
+        pass
+
+    async def aembed_batch(self, texts: list, document_type: str = None):
+        """Embeds one batch without blocking the event loop.
+
+        Returns a tuple of (vectors, rate_limit_headers). Providers with a
+        native async client override this; the default runs embed_texts in a
+        worker thread and reports no headers.
+        """
+        vectors = await asyncio.to_thread(self.embed_texts, texts, document_type)
+        return vectors, {}
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        """Embeds a single text without blocking the event loop."""
+        vectors, _ = await self.aembed_batch([text], document_type)
+        if not vectors:
+            return None
+
+        return vectors[0]
+
     @abstractmethod
     def construct_prompt(self, prompt: str, role: str):
         pass
\ No newline at end of file
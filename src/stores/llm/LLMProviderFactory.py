@@ -1,6 +1,7 @@
 from .LLMEnums import LLMEnums
 from .providers.OpenAIProvider import OpenAIProvider
 from .providers.CoHereProvider import CoHereProvider
+import httpx
 import logging
 
 class LLMProviderFactory:
@@ -19,6 +20,31 @@ class LLMProviderFactory:
         """
         self.config = config
         self.logger = logging.getLogger(__name__)
+        self.async_http_client = None
+
+    def get_async_http_client(self) -> httpx.AsyncClient:
+        """Return the HTTP client shared by the async clients of every created provider.
+        
+        Generation and embedding providers reuse the same pool of keep-alive
+        connections, so concurrent requests do not each pay a TLS handshake.
+        """
+        if self.async_http_client is None:
+            self.async_http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.config.LLM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=self.config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+                # Provider SDKs set their own per-request timeouts
+                timeout=httpx.Timeout(600.0, connect=5.0),
+                follow_redirects=True,
+            )
+        return self.async_http_client
+
+    async def aclose(self):
+        """Close the shared HTTP client and its pooled connections."""
+        if self.async_http_client is not None:
+            await self.async_http_client.aclose()
+            self.async_http_client = None
         
     def create(self, provider: str):
         """Create and return an LLM provider instance.
@@ -37,7 +63,8 @@ class LLMProviderFactory:
                     api_url = self.config.openai_api_url,
                     default_input_max_characters = self.config.input_default_max_character,
                     default_generation_max_output_tokens = self.config.generation_default_max_tokens,
-                    default_generation_temperature = self.config.generation_default_temperature
+                    default_generation_temperature = self.config.generation_default_temperature,
+                    async_http_client = self.get_async_http_client()
                 )
             except Exception as e:
                 self.logger.error(f"Error creating OpenAI provider: {str(e)}")
@@ -49,7 +76,8 @@ class LLMProviderFactory:
                     api_key = self.config.cohere_api_key,
                     default_input_max_characters = self.config.input_default_max_character,
                     default_generation_max_output_tokens = self.config.generation_default_max_tokens,
-                    default_generation_temperature = self.config.generation_default_temperature
+                    default_generation_temperature = self.config.generation_default_temperature,
+                    async_http_client = self.get_async_http_client()
                 )
             except Exception as e:
                 self.logger.error(f"Error creating Cohere provider: {str(e)}")
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+import threading
+import time
+from typing import List, Optional
+from .EmbeddingCache import EmbeddingCache
+
+class QueryEmbeddingCache:
+    """In-process LRU of query embeddings with a time-to-live.
+
+    Sits in front of the persistent EmbeddingCache on the search path, so a
+    repeated question is answered from memory without a SQLite lookup or a
+    provider call. Keys are built like EmbeddingCache keys (model id,
+    dimension, input type and the hash of the normalized text), so "What is
+    the total revenue?" and "what is the  total revenue?" share an entry
+    only when their normalized forms match.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: int = 3600):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached query vectors
+            ttl_seconds: Seconds an entry stays valid (0 for no expiry)
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def get_many(self, model_id: str, dimension: int, texts: List[str],
+                 document_type: str = None) -> List[Optional[list]]:
+        """Looks up vectors for `texts`; missing or expired entries are returned as None."""
+        now = time.monotonic()
+        results = []
+
+        with self.lock:
+            for text in texts:
+                key = EmbeddingCache.make_key(model_id, dimension, text, document_type)
+                entry = self.entries.get(key)
+
+                if entry is not None and self.ttl_seconds and entry[0] <= now:
+                    del self.entries[key]
+                    self.expirations += 1
+                    entry = None
+
+                if entry is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self.hits += 1
+                    self.entries.move_to_end(key)
+                    results.append(entry[1])
+
+        return results
+
+    def put_many(self, model_id: str, dimension: int, texts: List[str], vectors: List[list],
+                 document_type: str = None):
+        expires_at = time.monotonic() + self.ttl_seconds
+
+        with self.lock:
+            for text, vector in zip(texts, vectors):
+                if vector is None:
+                    continue
+                key = EmbeddingCache.make_key(model_id, dimension, text, document_type)
+                self.entries[key] = (expires_at, vector)
+                self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
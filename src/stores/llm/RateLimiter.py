@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Mapping, Optional
+
+class TokenBucket:
+    """Async token bucket refilled continuously up to a per-minute capacity."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(max(1, per_minute))
+        self.level = self.capacity
+        self.updated_at = time.monotonic()
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / 60.0
+
+    def refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if available now)."""
+        self.refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.refill_rate
+
+    def consume(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+    def borrow(self, amount: float):
+        """Consumes `amount` now, even if that leaves the bucket in debt."""
+        self.refill()
+        self.consume(amount)
+
+class RateLimiter:
+    """Client-side request/token limiter driven by provider rate-limit headers.
+
+    Two token buckets track requests-per-minute and tokens-per-minute. Each
+    response's `x-ratelimit-*` headers resize the buckets to the account's
+    real limits and clamp them to the remaining budget the server reports,
+    so concurrent callers slow down before the provider starts returning 429s.
+    """
+
+    def __init__(self, requests_per_minute: int = 3000, tokens_per_minute: int = 1000000):
+        self.requests = TokenBucket(per_minute=requests_per_minute)
+        self.tokens = TokenBucket(per_minute=tokens_per_minute)
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    async def acquire(self, tokens: int = 1, priority: bool = False):
+        """Wait until one request carrying `tokens` tokens may be sent.
+
+        Priority requests (interactive queries) do not queue behind other
+        callers: they only honour a pause after a 429 and take their share of
+        the budget right away, borrowing from the buckets if needed, which
+        makes the queued callers wait a little longer instead.
+        """
+        if priority:
+            wait = self.paused_until - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.requests.borrow(1)
+            self.tokens.borrow(tokens)
+            return
+
+        async with self.lock:
+            while True:
+                wait = max(
+                    self.paused_until - time.monotonic(),
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(tokens),
+                )
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            self.requests.consume(1)
+            self.tokens.consume(tokens)
+
+    def pause(self, seconds: float):
+        """Hold back every caller for `seconds`, e.g. after a 429 response."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]):
+        """Sync the buckets with the provider's `x-ratelimit-*` response headers."""
+        if not headers:
+            return
+
+        headers = {key.lower(): value for key, value in headers.items()}
+
+        for name, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            limit = self._parse_number(headers.get(f"x-ratelimit-limit-{name}"))
+            remaining = self._parse_number(headers.get(f"x-ratelimit-remaining-{name}"))
+            reset = self.parse_duration(headers.get(f"x-ratelimit-reset-{name}"))
+
+            if limit:
+                bucket.refill()
+                bucket.capacity = limit
+            if remaining is not None:
+                bucket.refill()
+                bucket.level = min(bucket.level, remaining)
+                if remaining <= 0 and reset:
+                    self.pause(reset)
+
+    @staticmethod
+    def _parse_number(value: Optional[str]) -> Optional[float]:
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def parse_duration(value: Optional[str]) -> Optional[float]:
+        """Parses durations such as '1s', '6m0s', '20ms' or '0.5' into seconds."""
+        if not value:
+            return None
+
+        try:
+            return float(value)
+        except ValueError:
+            pass
+
+        units = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+        parts = re.findall(r"([\d.]+)(ms|h|m|s)", value)
+        if not parts:
+            return None
+
+        return sum(float(amount) * units[unit] for amount, unit in parts)
@@ -8,7 +8,9 @@ class CoHereProvider(LLMInterface):
     def __init__(self, api_key: str,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       embedding_batch_size: int=96,
+                       async_http_client=None):
         
         self.api_key = api_key
 
@@ -20,8 +22,12 @@ class CoHereProvider(LLMInterface):
 
         self.embedding_model_id = None
         self.embedding_size = None
+        # The embed endpoint accepts up to 96 texts per request
+        self.embedding_batch_size = min(embedding_batch_size, 96)
 
         self.client = cohere.Client(api_key=self.api_key)
+        # The async client reuses the pooled connections of the shared HTTP client when given one
+        self.async_client = cohere.AsyncClient(api_key=self.api_key, httpx_client=async_http_client)
 
         self.enums = CoHereEnums
         self.logger = logging.getLogger(__name__)
@@ -63,8 +69,95 @@ class CoHereProvider(LLMInterface):
             return None
         
         return response.text
+
+    def stream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                          temperature: float = None):
+
+        if not self.client:
+            self.logger.error("CoHere client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        events = self.client.chat_stream(
+            model = self.generation_model_id,
+            chat_history = chat_history,
+            message = self.process_text(prompt),
+            temperature = temperature,
+            max_tokens = max_output_tokens
+        )
+
+        for event in events:
+            if event.event_type == "text-generation" and event.text:
+                yield event.text
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                             temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        response = await self.async_client.chat(
+            model = self.generation_model_id,
+            chat_history = chat_history,
+            message = self.process_text(prompt),
+            temperature = temperature,
+            max_tokens = max_output_tokens
+        )
+
+        if not response or not response.text:
+            self.logger.error("Error while generating text with CoHere")
+            return None
+
+        return response.text
+
+    async def astream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                           temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        events = self.async_client.chat_stream(
+            model = self.generation_model_id,
+            chat_history = chat_history,
+            message = self.process_text(prompt),
+            temperature = temperature,
+            max_tokens = max_output_tokens
+        )
+
+        async for event in events:
+            if event.event_type == "text-generation" and event.text:
+                yield event.text
     
     def embed_text(self, text: str, document_type: str = None):
+        vectors = self.embed_texts(texts=[text], document_type=document_type)
+        if not vectors:
+            return None
+
+        return vectors[0]
+
+    def embed_texts(self, texts: list, document_type: str = None):
         if not self.client:
             self.logger.error("CoHere client was not set")
             return None
@@ -73,22 +166,59 @@ class CoHereProvider(LLMInterface):
             self.logger.error("Embedding model for CoHere was not set")
             return None
         
-        input_type = CoHereEnums.DOCUMENT
-        if document_type == DocumentTypeEnum.QUERY:
-            input_type = CoHereEnums.QUERY
+        input_type = CoHereEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY.value
+
+        vectors = []
+        for i in range(0, len(texts), self.embedding_batch_size):
+            batch = texts[i:i + self.embedding_batch_size]
+
+            response = self.client.embed(
+                model = self.embedding_model_id,
+                texts = [self.process_text(text) for text in batch],
+                input_type = input_type,
+                embedding_types=['float'],
+            )
+
+            if not response or not response.embeddings or not response.embeddings.float \
+                    or len(response.embeddings.float) != len(batch):
+                self.logger.error("Error while embedding batch with CoHere")
+                return None
+
+            vectors.extend(response.embeddings.float)
 
-        response = self.client.embed(
+        # The embed API has no output dimension parameter, so reduce locally
+        return self.reduce_embeddings(vectors)
+
+    async def aembed_batch(self, texts: list, document_type: str = None):
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return None, {}
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for CoHere was not set")
+            return None, {}
+
+        input_type = CoHereEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY.value
+
+        response = await self.async_client.embed(
             model = self.embedding_model_id,
-            texts = [self.process_text(text)],
+            texts = [self.process_text(text) for text in texts],
             input_type = input_type,
             embedding_types=['float'],
         )
 
-        if not response or not response.embeddings or not response.embeddings.float:
-            self.logger.error("Error while embedding text with CoHere")
-            return None
-        
-        return response.embeddings.float[0]
+        if not response or not response.embeddings or not response.embeddings.float \
+                or len(response.embeddings.float) != len(texts):
+            self.logger.error("Error while embedding batch with CoHere")
+            return None, {}
+
+        # The CoHere SDK does not expose response headers, so the limiter
+        # relies on the configured limits and 429 backoff for this provider
+        return self.reduce_embeddings(response.embeddings.float), {}
     
     def construct_prompt(self, prompt: str, role: str):
         return {
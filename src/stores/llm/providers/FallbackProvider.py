@@ -76,6 +76,33 @@ class FallbackProvider(LLMInterface):
         """
         self.logger.info(f"Fallback generate_text called with prompt: {prompt[:50]}...")
         return self.fallback_message
+
+    def stream_text(self,
+                    prompt: str,
+                    chat_history: List[Dict[str, str]] = None,
+                    max_output_tokens: Optional[int] = None,
+                    temperature: Optional[float] = None):
+        """Stream text response (yields the fallback message at once).
+
+        Args:
+            prompt: The input prompt
+            chat_history: Optional chat history
+            max_output_tokens: Maximum tokens to generate (ignored)
+            temperature: Temperature parameter (ignored)
+
+        Yields:
+            The fallback message
+        """
+        self.logger.info(f"Fallback stream_text called with prompt: {prompt[:50]}...")
+        yield self.fallback_message
+
+    async def agenerate_text(self,
+                             prompt: str,
+                             chat_history: List[Dict[str, str]] = None,
+                             max_output_tokens: Optional[int] = None,
+                             temperature: Optional[float] = None) -> str:
+        """Async variant of generate_text (returns fallback message)."""
+        return self.generate_text(prompt, chat_history, max_output_tokens, temperature)
     
     def embed_text(self, text: str, document_type: Optional[str] = None) -> List[float]:
         """Generate embeddings (returns zero vector).
@@ -89,6 +116,19 @@ class FallbackProvider(LLMInterface):
         """
         self.logger.info(f"Fallback embed_text called for text: {text[:50]}...")
         return [0.0] * self.embedding_size
+
+    def embed_texts(self, texts: List[str], document_type: Optional[str] = None) -> List[List[float]]:
+        """Generate embeddings for a batch of texts (returns zero vectors).
+        
+        Args:
+            texts: The texts to embed
+            document_type: Optional document type
+            
+        Returns:
+            One zero vector of the configured embedding size per input text
+        """
+        self.logger.info(f"Fallback embed_texts called for {len(texts)} texts")
+        return [[0.0] * self.embedding_size for _ in texts]
     
     def construct_prompt(self, prompt: str, role: str) -> Dict[str, str]:
         """Construct a prompt object for the chat history.
@@ -1,6 +1,6 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import OpenAIEnums
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, NOT_GIVEN
 import logging
 
 class OpenAIProvider(LLMInterface):
@@ -8,7 +8,9 @@ class OpenAIProvider(LLMInterface):
     def __init__(self, api_key: str, api_url: str=None,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       embedding_batch_size: int=512,
+                       async_http_client=None):
         
         self.api_key = api_key
         self.api_url = api_url if api_url and len(api_url) else None
@@ -21,12 +23,21 @@ class OpenAIProvider(LLMInterface):
 
         self.embedding_model_id = None
         self.embedding_size = None
+        # The embeddings endpoint accepts up to 2048 inputs per request
+        self.embedding_batch_size = min(embedding_batch_size, 2048)
 
         self.client = OpenAI(
             api_key = self.api_key,
             base_url = self.api_url if self.api_url and len(self.api_url) else None
         )
 
+        # The async client reuses the pooled connections of the shared HTTP client when given one
+        self.async_client = AsyncOpenAI(
+            api_key = self.api_key,
+            base_url = self.api_url if self.api_url and len(self.api_url) else None,
+            http_client = async_http_client
+        )
+
         self.enums = OpenAIEnums
         self.logger = logging.getLogger(__name__)
 
@@ -37,6 +48,10 @@ class OpenAIProvider(LLMInterface):
         self.embedding_model_id = model_id
         self.embedding_size = embedding_size
 
+    def get_dimensions_param(self):
+        # text-embedding-3 models return reduced, normalized embeddings natively
+        return self.embedding_size if self.full_embedding_size else NOT_GIVEN
+
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
@@ -71,6 +86,109 @@ class OpenAIProvider(LLMInterface):
 
         return response.choices[0].message.content
 
+    def stream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                          temperature: float = None):
+
+        if not self.client:
+            self.logger.error("OpenAI client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
+        )
+
+        stream = self.client.chat.completions.create(
+            model = self.generation_model_id,
+            messages = chat_history,
+            max_tokens = max_output_tokens,
+            temperature = temperature,
+            stream = True
+        )
+
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        finally:
+            # Stops the generation when the consumer goes away early
+            stream.close()
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                             temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
+        )
+
+        response = await self.async_client.chat.completions.create(
+            model = self.generation_model_id,
+            messages = chat_history,
+            max_tokens = max_output_tokens,
+            temperature = temperature
+        )
+
+        if not response or not response.choices or len(response.choices) == 0 or not response.choices[0].message:
+            self.logger.error("Error while generating text with OpenAI")
+            return None
+
+        return response.choices[0].message.content
+
+    async def astream_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                           temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
+        )
+
+        stream = await self.async_client.chat.completions.create(
+            model = self.generation_model_id,
+            messages = chat_history,
+            max_tokens = max_output_tokens,
+            temperature = temperature,
+            stream = True
+        )
+
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        finally:
+            await stream.close()
 
     def embed_text(self, text: str, document_type: str = None):
         
@@ -85,6 +203,7 @@ class OpenAIProvider(LLMInterface):
         response = self.client.embeddings.create(
             model = self.embedding_model_id,
             input = text,
+            dimensions = self.get_dimensions_param(),
         )
 
         if not response or not response.data or len(response.data) == 0 or not response.data[0].embedding:
@@ -93,6 +212,67 @@ class OpenAIProvider(LLMInterface):
 
         return response.data[0].embedding
 
+    def embed_texts(self, texts: list, document_type: str = None):
+
+        if not self.client:
+            self.logger.error("OpenAI client was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for OpenAI was not set")
+            return None
+
+        vectors = []
+        for i in range(0, len(texts), self.embedding_batch_size):
+            batch = texts[i:i + self.embedding_batch_size]
+
+            response = self.client.embeddings.create(
+                model = self.embedding_model_id,
+                input = batch,
+                dimensions = self.get_dimensions_param(),
+            )
+
+            if not response or not response.data or len(response.data) != len(batch):
+                self.logger.error("Error while embedding batch with OpenAI")
+                return None
+
+            # Embeddings are not guaranteed to come back in input order
+            vectors.extend(
+                record.embedding
+                for record in sorted(response.data, key=lambda record: record.index)
+            )
+
+        return vectors
+
+    async def aembed_batch(self, texts: list, document_type: str = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return None, {}
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for OpenAI was not set")
+            return None, {}
+
+        # Use the raw response so the executor can read the x-ratelimit-* headers
+        raw_response = await self.async_client.embeddings.with_raw_response.create(
+            model = self.embedding_model_id,
+            input = texts,
+            dimensions = self.get_dimensions_param(),
+        )
+        response = raw_response.parse()
+
+        if not response or not response.data or len(response.data) != len(texts):
+            self.logger.error("Error while embedding batch with OpenAI")
+            return None, dict(raw_response.headers)
+
+        vectors = [
+            record.embedding
+            for record in sorted(response.data, key=lambda record: record.index)
+        ]
+
+        return vectors, dict(raw_response.headers)
+
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
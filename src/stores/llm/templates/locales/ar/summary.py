@@ -0,0 +1,24 @@
+from string import Template
+
+#### CONVERSATION SUMMARY PROMPTS ####
+
+#### System ####
+
+system_prompt: Template = Template("""أنت تلخص المحادثات بين المستخدم و'فرقد'، المساعد المالي. يحل الملخص محل الرسائل السابقة في الطلبات اللاحقة، لذا احتفظ بكل معلومة قد تعتمد عليها المحادثة: الأرقام والتواريخ وأسماء الشركات والمستندات وأهداف المستخدم وأي أسئلة لم تتم الإجابة عنها. اكتب بلغة المحادثة، في $max_words كلمة كحد أقصى، بجمل بسيطة دون عناوين.""")
+
+#### Update ####
+summary_prompt = Template("\n".join([
+    "## الملخص الحالي:",
+    "$summary",
+    "",
+    "## الرسائل الجديدة:",
+    "$messages",
+    "",
+    "## الملخص المحدث:",
+]))
+
+#### Message sent in place of the summarized turns ####
+summary_message = Template("\n".join([
+    "ملخص المحادثة السابقة:",
+    "$summary",
+]))
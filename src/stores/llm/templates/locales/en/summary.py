@@ -0,0 +1,24 @@
+from string import Template
+
+#### CONVERSATION SUMMARY PROMPTS ####
+
+#### System ####
+
+system_prompt: Template = Template("""You summarize conversations between a user and 'Farqad', a financial assistant. The summary replaces the earlier messages in later prompts, so keep every fact the conversation may rely on: figures, dates, company and document names, the user's goals and any open questions. Write in the language of the conversation, in at most $max_words words, as plain sentences without headings.""")
+
+#### Update ####
+summary_prompt = Template("\n".join([
+    "## Current summary:",
+    "$summary",
+    "",
+    "## New messages:",
+    "$messages",
+    "",
+    "## Updated summary:",
+]))
+
+#### Message sent in place of the summarized turns ####
+summary_message = Template("\n".join([
+    "Summary of the earlier conversation:",
+    "$summary",
+]))
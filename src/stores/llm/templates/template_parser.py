@@ -11,22 +11,29 @@ class TemplateParser:
 
     
     def set_language(self, language: str):
+        self.language = self.resolve_language(language)
+
+    def resolve_language(self, language: str) -> str:
+        """Returns `language` when it has locales, the default language otherwise."""
         if not language:
-            self.language = self.default_language
-            return
+            return self.default_language
 
         language_path = os.path.join(self.current_path, "locales", language)
         if os.path.exists(language_path):
-            self.language = language
-        else:
-            self.language = self.default_language
+            return language
+        return self.default_language
+
+    def get(self, group: str, key: str, vars: dict={}, fallback: str=None, language: str=None):
+        """Renders a template in `language`, or in the parser's language when none is given.
 
-    def get(self, group: str, key: str, vars: dict={}, fallback: str=None):
+        The parser is shared by concurrent requests, so request handlers pass
+        their own language instead of calling set_language.
+        """
         if not group or not key:
             return fallback
         
-        group_path = os.path.join(self.current_path, "locales", self.language, f"{group}.py" )
-        targeted_language = self.language
+        targeted_language = self.resolve_language(language) if language else self.language
+        group_path = os.path.join(self.current_path, "locales", targeted_language, f"{group}.py" )
         if not os.path.exists(group_path):
             group_path = os.path.join(self.current_path, "locales", self.default_language, f"{group}.py" )
             targeted_language = self.default_language
@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+from typing import List
+from models.db_schemes.data_chunk import RetrievedDocument
+
+class AsyncVectorDBInterface(ABC):
+    """Coroutine counterpart of VectorDBInterface, used from async request handlers."""
+
+    @abstractmethod
+    async def connect(self):
+        pass
+
+    @abstractmethod
+    async def disconnect(self):
+        pass
+
+    @abstractmethod
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def delete_collection(self, collection_name: str):
+        pass
+
+    @abstractmethod
+    async def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False,
+                                vector_config: dict = None):
+        pass
+
+    @abstractmethod
+    async def insert_many(self, collection_name: str, texts: list,
+                          vectors: list, metadata: list = None,
+                          record_ids: list = None, batch_size: int = 50):
+        pass
+
+    @abstractmethod
+    async def delete_by_asset_id(self, collection_name: str, asset_id: str):
+        pass
+
+    @abstractmethod
+    async def delete_by_filter(self, collection_name: str, filters: dict):
+        pass
+
+    @abstractmethod
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int,
+                               filters: dict = None) -> List[RetrievedDocument]:
+        pass
+
+    @abstractmethod
+    async def search_batch(self, collection_name: str, vectors: list, limit: int,
+                           filters: dict = None) -> List[List[RetrievedDocument]]:
+        pass
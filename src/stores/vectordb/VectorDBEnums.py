@@ -3,9 +3,24 @@ from enum import Enum
 class VectorDBEnums(Enum):
     QDRANT = "qdrant"
     CHROMA = "chroma"
+    NUMPY = "numpy"
 
 class DistanceMethodEnums(Enum):
     COSINE = "cosine"
     DOT = "dot"
 
+class QuantizationEnums(Enum):
+    NONE = "none"
+    SCALAR = "scalar"  # int8, 4x smaller than float32
+    BINARY = "binary"  # 1 bit per dimension, 32x smaller than float32
+
+class CollectionModeEnums(Enum):
+    PER_PROJECT = "per_project"  # One collection (and HNSW graph) per project
+    SHARED = "shared"  # All projects in one collection, partitioned by project_id
+
+class PayloadFieldEnums(Enum):
+    # Top-level payload keys that carry a keyword index for filtered search
+    ASSET_ID = "asset_id"
+    PROJECT_ID = "project_id"
+
     
\ No newline at end of file
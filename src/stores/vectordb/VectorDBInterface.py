@@ -24,6 +24,10 @@ class VectorDBInterface(ABC):
     def get_collection_info(self, collection_name: str) -> dict:
         pass
 
+    @abstractmethod
+    def count_points(self, collection_name: str, filters: dict = None) -> int:
+        pass
+
     @abstractmethod
     def delete_collection(self, collection_name: str):
         pass
@@ -31,7 +35,8 @@ class VectorDBInterface(ABC):
     @abstractmethod
     def create_collection(self, collection_name: str,
                           embedding_size: int, 
-                          do_reset: bool = False):
+                          do_reset: bool = False,
+                          vector_config: dict = None):
         pass
 
     @abstractmethod
@@ -47,7 +52,21 @@ class VectorDBInterface(ABC):
         pass
 
     @abstractmethod
-    def search_by_vector(self, collection_name: str, vector:list, limit: int) -> List[RetrievedDocument]:
+    def delete_by_asset_id(self, collection_name: str, asset_id: str):
+        pass
+
+    @abstractmethod
+    def delete_by_filter(self, collection_name: str, filters: dict):
+        pass
+
+    @abstractmethod
+    def search_by_vector(self, collection_name: str, vector:list, limit: int,
+                         filters: dict = None) -> List[RetrievedDocument]:
+        pass
+
+    @abstractmethod
+    def search_batch(self, collection_name: str, vectors: list, limit: int,
+                     filters: dict = None) -> List[List[RetrievedDocument]]:
         pass
 
 
@@ -1,4 +1,8 @@
 from .providers.QdrantDBProvider import QdrantDBProvider
+from .providers.AsyncQdrantDBProvider import AsyncQdrantDBProvider
+from .providers.ThreadedVectorDBAdapter import ThreadedVectorDBAdapter
+from .providers.NumpyFlatDBProvider import NumpyFlatDBProvider
+from .providers.LazyQdrantDBProvider import LazyQdrantDBProvider
 from .VectorDBEnums import VectorDBEnums, DistanceMethodEnums
 from controllers.BaseController import BaseController
 import logging
@@ -8,6 +12,16 @@ class VectorDBProviderFactory:
         self.config = config
         self.base_controller = BaseController()
 
+    def get_vector_config(self) -> dict:
+        """Default quantization and storage options of new collections."""
+        return {
+            "quantization": self.config.VECTOR_DB_QUANTIZATION.lower(),
+            "on_disk": self.config.VECTOR_DB_ON_DISK,
+            "always_ram": self.config.VECTOR_DB_QUANTIZATION_ALWAYS_RAM,
+            "oversampling": self.config.VECTOR_DB_SEARCH_OVERSAMPLING,
+            "rescore": self.config.VECTOR_DB_SEARCH_RESCORE,
+        }
+
     def create(self, provider: str):
         # Case-insensitive comparison to handle both "qdrant" and "QDRANT"
         if provider.lower() == VectorDBEnums.QDRANT.value.lower():
@@ -17,11 +31,61 @@ class VectorDBProviderFactory:
             logger = logging.getLogger(__name__)
             logger.info(f"Initializing QdrantDBProvider with db_path: {db_path}")
             logger.info(f"VECTOR_DB_BACKEND config value: {provider}")
+
+            # Embedded storage: open each project's collection only while it is in use
+            if not self.config.VECTOR_DB_URL and self.config.VECTOR_DB_LAZY_COLLECTIONS:
+                return LazyQdrantDBProvider(
+                    db_path=db_path,
+                    distance_method=DistanceMethodEnums.COSINE.value,
+                    max_open_collections=self.config.VECTOR_DB_MAX_OPEN_COLLECTIONS,
+                    max_resident_bytes=self.config.VECTOR_DB_MAX_RESIDENT_MB * 1024 * 1024,
+                    idle_seconds=self.config.VECTOR_DB_IDLE_SECONDS,
+                    vector_config=self.get_vector_config()
+                )
             
             # Use the correct constructor parameters to match QdrantDBProvider's __init__ method
             return QdrantDBProvider(
                 db_path=db_path,
-                distance_method=DistanceMethodEnums.COSINE.value
+                distance_method=DistanceMethodEnums.COSINE.value,
+                url=self.config.VECTOR_DB_URL,
+                api_key=self.config.VECTOR_DB_KEY,
+                vector_config=self.get_vector_config()
+            )
+        elif provider.lower() == VectorDBEnums.NUMPY.value:
+            db_path = self.base_controller.get_database_path(db_name=self.config.vector_db_path)
+            logging.getLogger(__name__).info(f"Initializing NumpyFlatDBProvider with db_path: {db_path}")
+
+            return NumpyFlatDBProvider(
+                db_path=db_path,
+                distance_method=DistanceMethodEnums.COSINE.value,
+                dtype=self.config.VECTOR_DB_DTYPE
             )
         else:
-            raise ValueError(f"Unknown VectorDB provider: {provider}")
\ No newline at end of file
+            raise ValueError(f"Unknown VectorDB provider: {provider}")
+
+    def create_async(self, provider: str, vectordb_client):
+        """Creates the async client used by request handlers.
+
+        A Qdrant server gets a native AsyncQdrantClient; every other backend
+        (including local-mode Qdrant, whose storage only one client may open)
+        is wrapped so its blocking calls run in worker threads. The native
+        client shares the sync client's collection caches, so a collection
+        reset by ingestion is not searched with its old dimension.
+        """
+        if provider.lower() == VectorDBEnums.QDRANT.value.lower() and self.config.VECTOR_DB_URL:
+            shared_caches = {}
+            if isinstance(vectordb_client, QdrantDBProvider):
+                shared_caches = {
+                    "collection_dimensions": vectordb_client.collection_dimensions,
+                    "indexed_collections": vectordb_client.indexed_collections,
+                }
+
+            return AsyncQdrantDBProvider(
+                distance_method=DistanceMethodEnums.COSINE.value,
+                url=self.config.VECTOR_DB_URL,
+                api_key=self.config.VECTOR_DB_KEY,
+                vector_config=self.get_vector_config(),
+                **shared_caches
+            )
+
+        return ThreadedVectorDBAdapter(vectordb_client=vectordb_client)
\ No newline at end of file
@@ -0,0 +1,213 @@
+from qdrant_client import models, AsyncQdrantClient
+from ..AsyncVectorDBInterface import AsyncVectorDBInterface
+from .QdrantProviderMixin import QdrantProviderMixin
+import logging
+from typing import List, Optional
+from models.db_schemes.data_chunk import RetrievedDocument
+
+class AsyncQdrantDBProvider(QdrantProviderMixin, AsyncVectorDBInterface):
+    """Qdrant provider built on AsyncQdrantClient.
+
+    Meant for a Qdrant server (`url`): a local-mode database directory can
+    only be opened by one client, so local setups use ThreadedVectorDBAdapter
+    around QdrantDBProvider instead. Requests are built by QdrantProviderMixin,
+    as in QdrantDBProvider, so both providers can share a collection.
+    """
+
+    def __init__(self, distance_method: str, url: str = None, api_key: str = None,
+                 db_path: str = None, vector_config: dict = None,
+                 collection_dimensions: dict = None, indexed_collections: set = None):
+        """`collection_dimensions` / `indexed_collections` share the sync provider's caches, if any."""
+
+        self.client = None
+        self.url = url
+        self.api_key = api_key
+        self.db_path = db_path
+
+        self.init_collection_settings(
+            distance_method=distance_method,
+            vector_config=vector_config,
+            collection_dimensions=collection_dimensions,
+            indexed_collections=indexed_collections,
+        )
+
+        self.logger = logging.getLogger(__name__)
+
+    async def connect(self):
+        if self.url:
+            self.client = AsyncQdrantClient(url=self.url, api_key=self.api_key)
+        else:
+            self.client = AsyncQdrantClient(path=self.db_path)
+
+    async def disconnect(self):
+        if self.client is not None:
+            await self.client.close()
+        self.client = None
+
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        return await self.client.collection_exists(collection_name=collection_name)
+
+    async def delete_collection(self, collection_name: str):
+        self.forget_collection(collection_name)
+        if await self.is_collection_existed(collection_name):
+            return await self.client.delete_collection(collection_name=collection_name)
+
+    async def ensure_payload_indexes(self, collection_name: str):
+        """Creates the keyword payload indexes used by filtered search (once per collection)."""
+        if collection_name in self.indexed_collections:
+            return
+
+        try:
+            collection_info = await self.client.get_collection(collection_name=collection_name)
+            for field_name in self.missing_payload_indexes(collection_info.payload_schema):
+                await self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=models.PayloadSchemaType.KEYWORD,
+                )
+        except Exception as e:
+            self.logger.error(f"Error while creating payload indexes for {collection_name}: {e}")
+            return
+
+        self.indexed_collections.add(collection_name)
+
+    async def check_vector_dimension(self, collection_name: str, vector: list) -> bool:
+        """Refuses vectors whose dimension differs from the collection's."""
+        if self.cached_dimension_matches(collection_name, vector):
+            return True
+
+        collection_info = await self.client.get_collection(collection_name=collection_name)
+        return self.validate_vector_dimension(collection_name, collection_info.config.params.vectors.size, vector)
+
+    async def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False,
+                                vector_config: dict = None):
+        if do_reset:
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        if not await self.is_collection_existed(collection_name):
+            _ = await self.client.create_collection(
+                collection_name=collection_name,
+                **self.build_collection_params(embedding_size, vector_config)
+            )
+            await self.ensure_payload_indexes(collection_name=collection_name)
+
+            return True
+
+        await self.ensure_payload_indexes(collection_name=collection_name)
+        return False
+
+    async def insert_many(self, collection_name: str, texts: list,
+                          vectors: list, metadata: list = None,
+                          record_ids: list = None, batch_size: int = 50):
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = list(range(0, len(texts)))
+
+        try:
+            if vectors and not await self.check_vector_dimension(collection_name, vectors[0]):
+                return False
+        except Exception as e:
+            self.logger.error(f"Error while reading the dimension of {collection_name}: {e}")
+            return False
+
+        for i in range(0, len(texts), batch_size):
+            batch_end = i + batch_size
+
+            batch_points = self.build_points(
+                texts[i:batch_end], vectors[i:batch_end],
+                metadata[i:batch_end], record_ids[i:batch_end]
+            )
+            try:
+                _ = await self.client.upsert(
+                    collection_name=collection_name,
+                    points=batch_points,
+                )
+            except Exception as e:
+                self.logger.error(f"Error while inserting batch: {e}")
+                return False
+
+        return True
+
+    async def delete_by_asset_id(self, collection_name: str, asset_id: str):
+        """Deletes every point that belongs to the given asset (document)."""
+        if not await self.is_collection_existed(collection_name):
+            return False
+
+        try:
+            await self.client.delete(
+                collection_name=collection_name,
+                points_selector=models.FilterSelector(filter=self.build_asset_filter(asset_id)),
+            )
+        except Exception as e:
+            self.logger.error(f"Error while deleting points of asset {asset_id}: {e}")
+            return False
+
+        return True
+
+    async def delete_by_filter(self, collection_name: str, filters: dict):
+        """Deletes every point matching all `filters`."""
+        if not filters or not await self.is_collection_existed(collection_name):
+            return False
+
+        try:
+            await self.client.delete(
+                collection_name=collection_name,
+                points_selector=models.FilterSelector(filter=self.build_filter(filters)),
+            )
+        except Exception as e:
+            self.logger.error(f"Error while deleting points matching {filters}: {e}")
+            return False
+
+        return True
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               filters: dict = None,
+                               score_threshold: Optional[float] = None) -> List[RetrievedDocument]:
+        try:
+            if not await self.check_vector_dimension(collection_name, vector):
+                return None
+
+            results = await self.client.search(
+                collection_name=collection_name,
+                query_vector=vector,
+                query_filter=self.build_filter(filters),
+                score_threshold=score_threshold,
+                search_params=self.search_params,
+                limit=limit,
+                with_payload=True,
+                with_vectors=False
+            )
+
+            if not results:
+                return None
+
+            return self.to_retrieved_documents(results)
+        except Exception as e:
+            self.logger.error(f"Error in search_by_vector: {e}")
+            return None
+
+    async def search_batch(self, collection_name: str, vectors: list, limit: int = 5,
+                           filters: dict = None,
+                           score_threshold: Optional[float] = None) -> List[List[RetrievedDocument]]:
+        """Searches several query vectors in a single request (see self.search_batch)."""
+        if not vectors:
+            return []
+
+        try:
+            if not await self.check_vector_dimension(collection_name, vectors[0]):
+                return None
+
+            batch_results = await self.client.search_batch(
+                collection_name=collection_name,
+                requests=self.build_search_requests(vectors, limit, filters, score_threshold)
+            )
+
+            return [self.to_retrieved_documents(results) for results in batch_results]
+        except Exception as e:
+            self.logger.error(f"Error in search_batch: {e}")
+            return None
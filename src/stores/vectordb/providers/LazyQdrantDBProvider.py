@@ -0,0 +1,290 @@
+from qdrant_client import models, QdrantClient
+from .QdrantDBProvider import QdrantDBProvider
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List
+
+class OpenCollection:
+    """A collection whose local-mode client is currently loaded in memory."""
+
+    def __init__(self, client: QdrantClient, path: str):
+        self.client = client
+        self.path = path
+        self.refs = 0
+        self.last_used = time.monotonic()
+        self.resident_bytes = 0
+        # Set by delete_collection: no new users, closed once the current ones are done
+        self.doomed = False
+
+class LazyQdrantDBProvider(QdrantDBProvider):
+    """Local-mode Qdrant that keeps each collection in its own storage directory.
+
+    A local-mode QdrantClient loads every collection under its path into
+    memory when it opens. Here every collection gets its own client, opened on
+    first access and kept in an LRU bounded by `max_open_collections` and
+    `max_resident_bytes`; collections idle for `idle_seconds` are closed back
+    to disk. Memory therefore follows the number of active projects rather
+    than the number of projects. Resident bytes are approximated by each open
+    collection's on-disk size, since local mode holds its storage in memory;
+    it is measured on open and after every write.
+
+    Opening a collection reads its whole storage, so it happens outside the
+    provider-wide lock, under a lock of that collection only: other
+    collections stay usable meanwhile. Reading a collection that does not
+    exist raises instead of opening (and creating) an empty store for it.
+    """
+
+    LEGACY_MIGRATION_MARKER = ".legacy_migrated"
+
+    def __init__(self, db_path: str, distance_method: str,
+                 max_open_collections: int = 32,
+                 max_resident_bytes: int = 0,
+                 idle_seconds: int = 600,
+                 vector_config: dict = None):
+        """Initialize the provider.
+
+        Args:
+            db_path: Root directory of the local Qdrant storage
+            distance_method: Distance used for new collections
+            max_open_collections: Maximum number of collections kept open
+            max_resident_bytes: Maximum total size of open collections (0 for unbounded)
+            idle_seconds: Close collections not accessed for this long (0 to disable)
+            vector_config: Quantization and storage defaults for new collections
+        """
+        super().__init__(db_path=db_path, distance_method=distance_method,
+                         vector_config=vector_config)
+
+        self.collections_root = os.path.join(db_path, "collections")
+        self.max_open_collections = max(1, max_open_collections)
+        self.max_resident_bytes = max_resident_bytes
+        self.idle_seconds = idle_seconds
+
+        self.open_collections: "OrderedDict[str, OpenCollection]" = OrderedDict()
+        self.lock = threading.RLock()
+        # Notified whenever a collection is released, for deletes waiting on its users
+        self.released = threading.Condition(self.lock)
+        self.open_locks: "dict[str, threading.Lock]" = {}
+
+        self.opens = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def connect(self):
+        os.makedirs(self.collections_root, exist_ok=True)
+        self.migrate_legacy_store()
+
+    def disconnect(self):
+        with self.lock:
+            for name in list(self.open_collections):
+                self._close(name)
+
+    def get_collection_path(self, collection_name: str) -> str:
+        return os.path.join(self.collections_root, collection_name)
+
+    @contextmanager
+    def collection_client(self, collection_name: str, write: bool = False):
+        """Yields the collection's client, opening it if needed; it is never evicted while in use."""
+        entry = self._acquire(collection_name, write=write)
+        try:
+            yield entry.client
+        finally:
+            self._release(entry, write=write)
+
+    def _acquire(self, collection_name: str, write: bool = False) -> OpenCollection:
+        with self.lock:
+            entry = self._use_open(collection_name)
+            if entry is not None:
+                return entry
+            open_lock = self.open_locks.setdefault(collection_name, threading.Lock())
+
+        with open_lock:
+            # Another thread may have opened it while this one waited
+            with self.lock:
+                entry = self._use_open(collection_name)
+                if entry is not None:
+                    return entry
+
+            # Opening creates the storage directory; only writes (create_collection) may do that
+            if not write and not self.is_collection_existed(collection_name):
+                raise ValueError(f"Collection {collection_name} not found")
+
+            path = self.get_collection_path(collection_name)
+            entry = OpenCollection(client=QdrantClient(path=path), path=path)
+            entry.resident_bytes = self.get_directory_size(path)
+
+            with self.lock:
+                self.open_collections[collection_name] = entry
+                self.opens += 1
+                entry.refs += 1
+                self._evict()
+
+        self.logger.info(f"Opened vector collection {collection_name} ({entry.resident_bytes} bytes)")
+        return entry
+
+    def _use_open(self, collection_name: str):
+        entry = self.open_collections.get(collection_name)
+        if entry is None or entry.doomed:
+            return None
+
+        self.hits += 1
+        self.open_collections.move_to_end(collection_name)
+        entry.refs += 1
+        entry.last_used = time.monotonic()
+        self._evict()
+        return entry
+
+    def _release(self, entry: OpenCollection, write: bool = False):
+        # Reads leave the storage as it is; only writes can change its size
+        resident_bytes = self.get_directory_size(entry.path) if write else None
+        with self.lock:
+            entry.refs -= 1
+            entry.last_used = time.monotonic()
+            if resident_bytes is not None:
+                entry.resident_bytes = resident_bytes
+            self._evict()
+            self.released.notify_all()
+
+    def _evict(self):
+        """Closes idle collections, then least recently used ones until within bounds."""
+        now = time.monotonic()
+        if self.idle_seconds:
+            for name, entry in list(self.open_collections.items()):
+                if entry.refs == 0 and now - entry.last_used > self.idle_seconds:
+                    self._close(name)
+
+        for name, entry in list(self.open_collections.items()):
+            if not self._over_bounds():
+                break
+            if entry.refs == 0:
+                self._close(name)
+
+    def _over_bounds(self) -> bool:
+        if len(self.open_collections) > self.max_open_collections:
+            return True
+        return bool(self.max_resident_bytes) and self.get_resident_bytes() > self.max_resident_bytes
+
+    def _close(self, collection_name: str):
+        entry = self.open_collections.pop(collection_name, None)
+        if entry is None:
+            return
+
+        try:
+            entry.client.close()
+        except Exception as e:
+            self.logger.error(f"Error while closing vector collection {collection_name}: {e}")
+        self.evictions += 1
+        self.logger.info(f"Closed vector collection {collection_name}")
+
+    def close_idle_collections(self):
+        with self.lock:
+            self._evict()
+
+    def get_resident_bytes(self) -> int:
+        return sum(entry.resident_bytes for entry in self.open_collections.values())
+
+    @staticmethod
+    def get_directory_size(path: str) -> int:
+        total = 0
+        for root, _, files in os.walk(path):
+            for file_name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, file_name))
+                except OSError:
+                    pass
+        return total
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                "open_collections": len(self.open_collections),
+                "max_open_collections": self.max_open_collections,
+                "resident_bytes": self.get_resident_bytes(),
+                "max_resident_bytes": self.max_resident_bytes,
+                "opens": self.opens,
+                "hits": self.hits,
+                "evictions": self.evictions,
+            }
+
+    def is_collection_existed(self, collection_name: str) -> bool:
+        # Checked on disk so that probing a collection does not load it
+        return os.path.isdir(os.path.join(self.get_collection_path(collection_name), "collection", collection_name))
+
+    def list_all_collections(self) -> List:
+        return [
+            name for name in sorted(os.listdir(self.collections_root))
+            if self.is_collection_existed(name)
+        ]
+
+    def delete_collection(self, collection_name: str):
+        self.forget_collection(collection_name)
+        with self.lock:
+            open_lock = self.open_locks.setdefault(collection_name, threading.Lock())
+
+        # Held so that a concurrent open cannot load the storage being removed
+        with open_lock:
+            with self.lock:
+                entry = self.open_collections.get(collection_name)
+                if entry is not None:
+                    # Searches and upserts already running finish on the client before it is closed
+                    entry.doomed = True
+                    self.released.wait_for(lambda: entry.refs == 0)
+                self._close(collection_name)
+
+            if self.is_collection_existed(collection_name):
+                shutil.rmtree(self.get_collection_path(collection_name))
+                return True
+
+    def migrate_legacy_store(self):
+        """Copies collections of a single-directory local store into per-collection stores, once."""
+        marker = os.path.join(self.collections_root, self.LEGACY_MIGRATION_MARKER)
+        if os.path.exists(marker):
+            return
+
+        if os.path.exists(os.path.join(self.db_path, "meta.json")):
+            legacy_client = QdrantClient(path=self.db_path)
+            try:
+                for description in legacy_client.get_collections().collections:
+                    self._migrate_collection(legacy_client, description.name)
+            finally:
+                legacy_client.close()
+
+        open(marker, "w").close()
+
+    def _migrate_collection(self, legacy_client: QdrantClient, collection_name: str):
+        if self.is_collection_existed(collection_name):
+            return
+
+        self.logger.info(f"Migrating vector collection {collection_name} to its own storage directory")
+        collection_info = legacy_client.get_collection(collection_name=collection_name)
+        with self.collection_client(collection_name, write=True) as client:
+            client.create_collection(
+                collection_name=collection_name,
+                vectors_config=collection_info.config.params.vectors,
+                quantization_config=collection_info.config.quantization_config,
+            )
+
+            offset = None
+            while True:
+                points, offset = legacy_client.scroll(
+                    collection_name=collection_name,
+                    limit=256,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True,
+                )
+                if points:
+                    client.upsert(
+                        collection_name=collection_name,
+                        points=[
+                            models.PointStruct(id=point.id, vector=point.vector, payload=point.payload)
+                            for point in points
+                        ],
+                    )
+                if offset is None:
+                    break
+
+        self.ensure_payload_indexes(collection_name=collection_name)
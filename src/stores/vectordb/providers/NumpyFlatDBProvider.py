@@ -0,0 +1,583 @@
+from ..VectorDBInterface import VectorDBInterface
+from ..VectorDBEnums import DistanceMethodEnums, PayloadFieldEnums
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import numpy as np
+from contextlib import contextmanager
+from typing import List, Optional
+from models.db_schemes.data_chunk import RetrievedDocument
+
+class ReadWriteLock:
+    """Lets any number of readers in at once, or a single writer.
+
+    A waiting writer holds back new readers, so a stream of searches cannot
+    starve an upsert. Neither side is reentrant.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.readers = 0
+        self.writer = False
+        self.waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        with self.condition:
+            self.condition.wait_for(lambda: not self.writer and not self.waiting_writers)
+            self.readers += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.readers -= 1
+                if not self.readers:
+                    self.condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self.condition:
+            self.waiting_writers += 1
+            try:
+                self.condition.wait_for(lambda: not self.writer and not self.readers)
+            finally:
+                self.waiting_writers -= 1
+            self.writer = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.writer = False
+                self.condition.notify_all()
+
+class FlatCollection:
+    """One collection on disk: a memory-mapped vector matrix plus a SQLite payload sidecar.
+
+    Row i of `vectors.bin` holds the vector of the point stored with `row = i`
+    in `payload.sqlite3`. Rows of deleted points are zeroed and dropped from
+    the sidecar; the matrix is compacted once they make up half of it.
+
+    Searches share `lock` for reading; upserts, deletes and compaction take it
+    for writing, since they move or remap the matrix.
+    """
+
+    META_FILE = "meta.json"
+    VECTORS_FILE = "vectors.bin"
+    PAYLOAD_FILE = "payload.sqlite3"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = ReadWriteLock()
+
+        with open(os.path.join(path, self.META_FILE)) as f:
+            self.meta = json.load(f)
+
+        self.dtype = np.dtype(self.meta["dtype"])
+        self.dimension = self.meta["dimension"]
+        self.matrix = None
+        self._map_vectors()
+
+        self.connection = sqlite3.connect(os.path.join(path, self.PAYLOAD_FILE), check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS points ("
+            "row INTEGER PRIMARY KEY, point_id TEXT UNIQUE NOT NULL, "
+            "asset_id TEXT, payload TEXT NOT NULL)"
+        )
+        # Every filterable payload field gets its own indexed column; fields
+        # added after a collection was created are added here
+        columns = {name for _, name, *_ in self.connection.execute("PRAGMA table_info(points)")}
+        for field in PayloadFieldEnums:
+            if field.value not in columns:
+                self.connection.execute(f"ALTER TABLE points ADD COLUMN {field.value} TEXT")
+            self.connection.execute(
+                f"CREATE INDEX IF NOT EXISTS points_{field.value} ON points ({field.value})"
+            )
+        self.connection.commit()
+
+        if "next_point_id" not in self.meta:
+            # Collections created before the counter existed used row counts as ids
+            (max_id,) = self.connection.execute(
+                "SELECT MAX(CAST(point_id AS INTEGER)) FROM points WHERE point_id NOT GLOB '*[^0-9]*'"
+            ).fetchone()
+            self.meta["next_point_id"] = max(self.count, (max_id or 0) + 1)
+
+    @classmethod
+    def create(cls, path: str, dimension: int, dtype: str, distance: str):
+        os.makedirs(path, exist_ok=True)
+        open(os.path.join(path, cls.VECTORS_FILE), "wb").close()
+        with open(os.path.join(path, cls.META_FILE), "w") as f:
+            json.dump({
+                "dimension": dimension,
+                "dtype": dtype,
+                "distance": distance,
+                "count": 0,
+                "capacity": 0,
+                "deleted": 0,
+                "next_point_id": 0,
+            }, f)
+        return cls(path)
+
+    @property
+    def count(self) -> int:
+        return self.meta["count"]
+
+    def _map_vectors(self):
+        # Mapping is lazy: opening a collection reads no vectors into RAM
+        capacity = self.meta["capacity"]
+        self.matrix = None
+        if capacity:
+            self.matrix = np.memmap(
+                os.path.join(self.path, self.VECTORS_FILE),
+                dtype=self.dtype, mode="r+", shape=(capacity, self.dimension)
+            )
+
+    def _write_meta(self):
+        meta_path = os.path.join(self.path, self.META_FILE)
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(self.meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def _ensure_capacity(self, rows_needed: int):
+        capacity = self.meta["capacity"]
+        if rows_needed <= capacity:
+            return
+
+        new_capacity = max(rows_needed, capacity * 2, 1024)
+        if self.matrix is not None:
+            self.matrix.flush()
+            self.matrix = None
+        with open(os.path.join(self.path, self.VECTORS_FILE), "r+b") as f:
+            f.truncate(new_capacity * self.dimension * self.dtype.itemsize)
+
+        self.meta["capacity"] = new_capacity
+        self._map_vectors()
+
+    def prepare(self, vectors) -> np.ndarray:
+        """Converts vectors to float32 rows, L2-normalized for cosine collections."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[np.newaxis, :]
+        if vectors.shape[1] != self.dimension:
+            raise ValueError(f"Expected vectors of dimension {self.dimension}, got {vectors.shape[1]}")
+
+        if self.meta["distance"] == DistanceMethodEnums.COSINE.value:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1.0, norms)
+        return vectors
+
+    def reserve_point_ids(self, n: int) -> List[int]:
+        """Returns `n` ids never handed out before in this collection, even across compactions."""
+        with self.lock.write():
+            start = self.meta["next_point_id"]
+            self.meta["next_point_id"] = start + n
+            self._write_meta()
+        return list(range(start, start + n))
+
+    def upsert(self, point_ids: List[str], vectors, payloads: List[dict]):
+        vectors = self.prepare(vectors)
+
+        with self.lock.write():
+            existing = {}
+            for i in range(0, len(point_ids), 500):
+                batch = point_ids[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                existing.update(self.connection.execute(
+                    f"SELECT point_id, row FROM points WHERE point_id IN ({placeholders})", batch
+                ).fetchall())
+
+            rows = []
+            next_row = self.count
+            for point_id in point_ids:
+                if point_id in existing:
+                    rows.append(existing[point_id])
+                else:
+                    existing[point_id] = next_row
+                    rows.append(next_row)
+                    next_row += 1
+
+            self._ensure_capacity(next_row)
+            self.matrix[rows] = vectors.astype(self.dtype)
+            self.matrix.flush()
+
+            fields = [field.value for field in PayloadFieldEnums]
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO points (row, point_id, payload, {', '.join(fields)}) "
+                f"VALUES (?, ?, ?, {', '.join('?' * len(fields))})",
+                [
+                    (row, point_id, json.dumps(payload), *(payload.get(field) for field in fields))
+                    for row, point_id, payload in zip(rows, point_ids, payloads)
+                ]
+            )
+            self.connection.commit()
+
+            self.meta["count"] = next_row
+            self._write_meta()
+
+    def delete_by_asset_id(self, asset_id: str) -> int:
+        return self.delete_by_filter({PayloadFieldEnums.ASSET_ID.value: asset_id})
+
+    def delete_by_filter(self, filters: dict) -> int:
+        with self.lock.write():
+            rows = self.get_filtered_rows(filters).tolist()
+            if not rows:
+                return 0
+
+            self.matrix[rows] = 0
+            self.matrix.flush()
+            for i in range(0, len(rows), 500):
+                batch = rows[i:i + 500]
+                self.connection.execute(
+                    f"DELETE FROM points WHERE row IN ({','.join('?' * len(batch))})", batch
+                )
+            self.connection.commit()
+
+            self.meta["deleted"] += len(rows)
+            self._write_meta()
+
+            if self.meta["deleted"] * 2 > self.count:
+                self._compact()
+            return len(rows)
+
+    def compact(self):
+        """Rewrites the matrix without the rows of deleted points."""
+        with self.lock.write():
+            self._compact()
+
+    def _compact(self):
+        rows = [row for (row,) in self.connection.execute("SELECT row FROM points ORDER BY row").fetchall()]
+        vectors_path = os.path.join(self.path, self.VECTORS_FILE)
+
+        with open(vectors_path + ".tmp", "wb") as f:
+            for i in range(0, len(rows), 65536):
+                f.write(np.ascontiguousarray(self.matrix[rows[i:i + 65536]]).tobytes())
+
+        # Rows are renumbered in ascending order, so a new row id never collides with a pending one
+        self.connection.executemany(
+            "UPDATE points SET row = ? WHERE row = ?",
+            [(new_row, row) for new_row, row in enumerate(rows) if new_row != row]
+        )
+        self.matrix = None
+        os.replace(vectors_path + ".tmp", vectors_path)
+        self.connection.commit()
+
+        self.meta.update({"count": len(rows), "capacity": len(rows), "deleted": 0})
+        self._write_meta()
+        self._map_vectors()
+
+    def get_filtered_rows(self, filters: dict) -> np.ndarray:
+        conditions = []
+        params = []
+        for key, value in filters.items():
+            if key not in {field.value for field in PayloadFieldEnums}:
+                raise ValueError(f"Filtering on '{key}' is not supported; indexed fields: "
+                                 f"{[field.value for field in PayloadFieldEnums]}")
+            conditions.append(f"{key} = ?")
+            params.append(str(value))
+
+        rows = self.connection.execute(
+            f"SELECT row FROM points WHERE {' AND '.join(conditions)} ORDER BY row", params
+        ).fetchall()
+        return np.fromiter((row for (row,) in rows), dtype=np.int64, count=len(rows))
+
+    def get_payloads(self, rows) -> dict:
+        rows = [int(row) for row in rows]
+        payloads = {}
+        for i in range(0, len(rows), 500):
+            batch = rows[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            payloads.update(
+                (row, json.loads(payload))
+                for row, payload in self.connection.execute(
+                    f"SELECT row, payload FROM points WHERE row IN ({placeholders})", batch
+                ).fetchall()
+            )
+        return payloads
+
+    def close(self):
+        with self.lock.write():
+            if self.matrix is not None:
+                self.matrix.flush()
+                self.matrix = None
+            self.connection.close()
+
+class NumpyFlatDBProvider(VectorDBInterface):
+    """Exact (brute-force) vector search over memory-mapped NumPy matrices.
+
+    For projects of a few thousand chunks an exact scan is faster than HNSW
+    and has perfect recall. Each collection is a pre-normalized float32 or
+    float16 matrix mapped from disk, so opening one is O(1) and only the
+    pages touched by a scan are read. Top-k uses argpartition over blocks of
+    `search_block_size` rows, and several queries are scored together as a
+    single matrix multiply.
+    """
+
+    def __init__(self, db_path: str, distance_method: str, dtype: str = "float32",
+                 search_block_size: int = 65536):
+
+        self.db_path = db_path
+        self.distance_method = distance_method
+        self.dtype = np.dtype(dtype).name
+        self.search_block_size = search_block_size
+        self.collections = {}
+        self.collections_lock = threading.Lock()
+
+        if self.dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+
+        self.logger = logging.getLogger(__name__)
+
+    def connect(self):
+        os.makedirs(self.db_path, exist_ok=True)
+
+    def disconnect(self):
+        with self.collections_lock:
+            for collection in self.collections.values():
+                collection.close()
+            self.collections = {}
+
+    def get_collection_path(self, collection_name: str) -> str:
+        return os.path.join(self.db_path, collection_name)
+
+    def get_collection(self, collection_name: str) -> Optional[FlatCollection]:
+        with self.collections_lock:
+            collection = self.collections.get(collection_name)
+            if collection is None and self.is_collection_existed(collection_name):
+                collection = FlatCollection(self.get_collection_path(collection_name))
+                self.collections[collection_name] = collection
+            return collection
+
+    def is_collection_existed(self, collection_name: str) -> bool:
+        return os.path.exists(os.path.join(self.get_collection_path(collection_name), FlatCollection.META_FILE))
+
+    def list_all_collections(self) -> List:
+        if not os.path.isdir(self.db_path):
+            return []
+        return [name for name in sorted(os.listdir(self.db_path)) if self.is_collection_existed(name)]
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return None
+
+        meta = collection.meta
+        return {
+            "vectors_count": meta["count"] - meta["deleted"],
+            "rows": meta["count"],
+            "capacity": meta["capacity"],
+            "dimension": meta["dimension"],
+            "dtype": meta["dtype"],
+            "distance": meta["distance"],
+        }
+
+    def count_points(self, collection_name: str, filters: dict = None) -> int:
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return 0
+
+        with collection.lock.read():
+            if filters:
+                return len(collection.get_filtered_rows({key: str(value) for key, value in filters.items()}))
+            return collection.meta["count"] - collection.meta["deleted"]
+
+    def delete_collection(self, collection_name: str):
+        with self.collections_lock:
+            collection = self.collections.pop(collection_name, None)
+            if collection is not None:
+                collection.close()
+
+        if self.is_collection_existed(collection_name):
+            shutil.rmtree(self.get_collection_path(collection_name))
+            return True
+
+    def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False,
+                                vector_config: dict = None):
+        # Exact search has no quantized copy to configure; storage precision
+        # follows VECTOR_DB_DTYPE, so `vector_config` is accepted and ignored
+        if do_reset:
+            _ = self.delete_collection(collection_name=collection_name)
+
+        if not self.is_collection_existed(collection_name):
+            with self.collections_lock:
+                self.collections[collection_name] = FlatCollection.create(
+                    path=self.get_collection_path(collection_name),
+                    dimension=embedding_size,
+                    dtype=self.dtype,
+                    distance=self.distance_method,
+                )
+            return True
+
+        return False
+
+    @staticmethod
+    def build_payload(text: str, metadata: dict = None) -> dict:
+        payload = {"text": text, "metadata": metadata}
+        for field in PayloadFieldEnums:
+            if metadata and metadata.get(field.value) is not None:
+                payload[field.value] = str(metadata[field.value])
+        return payload
+
+    def insert_one(self, collection_name: str, text: str, vector: list,
+                   metadata: dict = None,
+                   record_id: str = None):
+        return self.insert_many(
+            collection_name=collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadata=[metadata],
+            record_ids=[record_id] if record_id is not None else None,
+        )
+
+    def insert_many(self, collection_name: str, texts: str,
+                    vectors: list, metadata: list = None,
+                   record_ids: str = None, batch_size: int = 50):
+
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            self.logger.error(f"Can not insert new records to non-existed collection: {collection_name}")
+            return False
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = collection.reserve_point_ids(len(texts))
+
+        try:
+            collection.upsert(
+                point_ids=[str(record_id) for record_id in record_ids],
+                vectors=vectors,
+                payloads=[self.build_payload(text=text, metadata=meta) for text, meta in zip(texts, metadata)],
+            )
+        except Exception as e:
+            self.logger.error(f"Error while inserting records: {e}")
+            return False
+
+        return True
+
+    def delete_by_asset_id(self, collection_name: str, asset_id: str):
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return False
+
+        deleted = collection.delete_by_asset_id(asset_id=str(asset_id))
+        self.logger.info(f"Deleted {deleted} points of asset {asset_id} from {collection_name}")
+        return True
+
+    def delete_by_filter(self, collection_name: str, filters: dict):
+        collection = self.get_collection(collection_name)
+        if collection is None or not filters:
+            return False
+
+        try:
+            deleted = collection.delete_by_filter(filters={key: str(value) for key, value in filters.items()})
+        except Exception as e:
+            self.logger.error(f"Error while deleting points matching {filters}: {e}")
+            return False
+
+        self.logger.info(f"Deleted {deleted} points matching {filters} from {collection_name}")
+        return True
+
+    def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                         filters: dict = None, score_threshold: Optional[float] = None):
+        results = self.search_batch(
+            collection_name=collection_name,
+            vectors=[vector],
+            limit=limit,
+            filters=filters,
+            score_threshold=score_threshold,
+        )
+        if not results or not results[0]:
+            return None
+        return results[0]
+
+    def search_batch(self, collection_name: str, vectors: list, limit: int = 5,
+                     filters: dict = None, score_threshold: Optional[float] = None):
+        """Scores all `vectors` against the collection in one pass.
+
+        Returns:
+            One list of RetrievedDocument per query vector, or None on error
+        """
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            self.logger.error(f"Can not search non-existed collection: {collection_name}")
+            return None
+
+        try:
+            queries = collection.prepare(vectors)
+            with collection.lock.read():
+                if filters:
+                    top_rows, top_scores = self._search_rows(
+                        collection, queries, collection.get_filtered_rows(filters), limit
+                    )
+                else:
+                    # Deleted rows are zero vectors and may rank; fetch enough to drop them
+                    top_rows, top_scores = self._search_all(
+                        collection, queries, limit + collection.meta["deleted"]
+                    )
+                payloads = collection.get_payloads(np.unique(top_rows))
+        except Exception as e:
+            self.logger.error(f"Error in search_batch: {e}")
+            return None
+
+        results = []
+        for rows, scores in zip(top_rows, top_scores):
+            documents = []
+            for row, score in zip(rows, scores):
+                payload = payloads.get(int(row))
+                if payload is None:
+                    continue
+                if score_threshold is not None and score < score_threshold:
+                    break
+                documents.append(RetrievedDocument(**{
+                    "score": float(score),
+                    "text": payload["text"],
+                    "id": (payload.get("metadata") or {}).get("chunk_id"),
+                    "metadata": payload.get("metadata") or {},
+                }))
+                if len(documents) == limit:
+                    break
+            results.append(documents)
+
+        return results
+
+    @staticmethod
+    def top_k(scores: np.ndarray, k: int):
+        """Row indices and scores of the k best columns of every query row, best first."""
+        k = min(k, scores.shape[1])
+        if k < scores.shape[1]:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1)
+        return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
+
+    def _search_all(self, collection: FlatCollection, queries: np.ndarray, k: int):
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+
+        for start in range(0, collection.count, self.search_block_size):
+            end = min(start + self.search_block_size, collection.count)
+            block_scores = queries @ np.asarray(collection.matrix[start:end], dtype=np.float32).T
+            block_rows, block_scores = self.top_k(block_scores, k)
+
+            merged_rows = np.concatenate([best_rows, block_rows + start], axis=1)
+            merged_scores = np.concatenate([best_scores, block_scores], axis=1)
+            keep, best_scores = self.top_k(merged_scores, k)
+            best_rows = np.take_along_axis(merged_rows, keep, axis=1)
+
+        return best_rows, best_scores
+
+    def _search_rows(self, collection: FlatCollection, queries: np.ndarray, rows: np.ndarray, k: int):
+        if len(rows) == 0:
+            empty = np.empty((len(queries), 0))
+            return empty.astype(np.int64), empty.astype(np.float32)
+
+        scores = queries @ np.asarray(collection.matrix[rows], dtype=np.float32).T
+        positions, top_scores = self.top_k(scores, k)
+        return rows[positions], top_scores
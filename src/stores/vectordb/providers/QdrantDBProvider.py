@@ -1,31 +1,41 @@
 from qdrant_client import models, QdrantClient
 from ..VectorDBInterface import VectorDBInterface
-from ..VectorDBEnums import DistanceMethodEnums
+from .QdrantProviderMixin import QdrantProviderMixin
 import logging
+from contextlib import contextmanager
 from typing import List, Optional
-from models.db_schemes.data_chunk import RetrievedDocument
 
-class QdrantDBProvider(VectorDBInterface):
+class QdrantDBProvider(QdrantProviderMixin, VectorDBInterface):
 
-    def __init__(self, db_path: str, distance_method: str):
+    def __init__(self, db_path: str, distance_method: str, url: str = None, api_key: str = None,
+                 vector_config: dict = None):
 
         self.client = None
         self.db_path = db_path
-        self.distance_method = None
+        self.url = url
+        self.api_key = api_key
 
-        if distance_method == DistanceMethodEnums.COSINE.value:
-            self.distance_method = models.Distance.COSINE
-        elif distance_method == DistanceMethodEnums.DOT.value:
-            self.distance_method = models.Distance.DOT
+        self.init_collection_settings(distance_method=distance_method, vector_config=vector_config)
 
         self.logger = logging.getLogger(__name__)
 
     def connect(self):
-        self.client = QdrantClient(path=self.db_path)
+        if self.url:
+            self.client = QdrantClient(url=self.url, api_key=self.api_key)
+        else:
+            self.client = QdrantClient(path=self.db_path)
 
     def disconnect(self):
         self.client = None
 
+    @contextmanager
+    def collection_client(self, collection_name: str, write: bool = False):
+        """Yields the client that serves `collection_name` (a single shared client here).
+
+        `write` marks blocks that modify the collection, for providers that track its size.
+        """
+        yield self.client
+
     def is_collection_existed(self, collection_name: str) -> bool:
         return self.client.collection_exists(collection_name=collection_name)
     
@@ -33,30 +43,108 @@ class QdrantDBProvider(VectorDBInterface):
         return self.client.get_collections()
     
     def get_collection_info(self, collection_name: str) -> dict:
-        return self.client.get_collection(collection_name=collection_name)
+        with self.collection_client(collection_name) as client:
+            return client.get_collection(collection_name=collection_name)
     
+    def count_points(self, collection_name: str, filters: dict = None) -> Optional[int]:
+        """Exact number of points matching all `filters`, e.g. one project's share of a shared collection."""
+        if not self.is_collection_existed(collection_name):
+            return 0
+
+        try:
+            with self.collection_client(collection_name) as client:
+                return client.count(
+                    collection_name=collection_name,
+                    count_filter=self.build_filter(filters),
+                    exact=True,
+                ).count
+        except Exception as e:
+            self.logger.error(f"Error while counting points of {collection_name}: {e}")
+            return None
+
     def delete_collection(self, collection_name: str):
+        self.forget_collection(collection_name)
         if self.is_collection_existed(collection_name):
             return self.client.delete_collection(collection_name=collection_name)
-        
+
+    def ensure_payload_indexes(self, collection_name: str):
+        """Creates the keyword payload indexes used by filtered search (once per collection)."""
+        if collection_name in self.indexed_collections:
+            return
+
+        try:
+            payload_schema = self.get_collection_info(collection_name=collection_name).payload_schema
+            for field_name in self.missing_payload_indexes(payload_schema):
+                with self.collection_client(collection_name, write=True) as client:
+                    client.create_payload_index(
+                        collection_name=collection_name,
+                        field_name=field_name,
+                        field_schema=models.PayloadSchemaType.KEYWORD,
+                    )
+        except Exception as e:
+            self.logger.error(f"Error while creating payload indexes for {collection_name}: {e}")
+            return
+
+        self.indexed_collections.add(collection_name)
+
+    def check_vector_dimension(self, collection_name: str, vector: list) -> bool:
+        """Refuses vectors whose dimension differs from the collection's."""
+        if self.cached_dimension_matches(collection_name, vector):
+            return True
+
+        vectors_config = self.get_collection_info(collection_name=collection_name).config.params.vectors
+        return self.validate_vector_dimension(collection_name, vectors_config.size, vector)
+
     def create_collection(self, collection_name: str, 
                                 embedding_size: int,
-                                do_reset: bool = False):
+                                do_reset: bool = False,
+                                vector_config: dict = None):
+        """Creates the collection if missing.
+
+        `vector_config` overrides the provider defaults (quantization,
+        on_disk, always_ram) for this collection; it only takes effect when
+        the collection is created, see update_vector_config for existing ones.
+        """
         if do_reset:
             _ = self.delete_collection(collection_name=collection_name)
         
         if not self.is_collection_existed(collection_name):
-            _ = self.client.create_collection(
-                collection_name=collection_name,
-                vectors_config=models.VectorParams(
-                    size=embedding_size,
-                    distance=self.distance_method
+            with self.collection_client(collection_name, write=True) as client:
+                _ = client.create_collection(
+                    collection_name=collection_name,
+                    **self.build_collection_params(embedding_size, vector_config)
                 )
-            )
+            self.ensure_payload_indexes(collection_name=collection_name)
 
             return True
-        
+
+        # Collections created before the payload indexes existed get them here
+        self.ensure_payload_indexes(collection_name=collection_name)
         return False
+
+    def update_vector_config(self, collection_name: str, vector_config: dict):
+        """Applies quantization / on_disk settings to an existing collection.
+
+        The server rebuilds the quantized vectors in the background; local
+        mode accepts the call but keeps every vector in memory regardless.
+        """
+        if not self.is_collection_existed(collection_name):
+            return False
+
+        vector_config = self.merge_vector_config(self.vector_config, vector_config)
+        quantization_config = self.build_quantization_config(vector_config)
+        try:
+            with self.collection_client(collection_name, write=True) as client:
+                client.update_collection(
+                    collection_name=collection_name,
+                    vectors_config={"": models.VectorParamsDiff(on_disk=vector_config["on_disk"])},
+                    quantization_config=quantization_config or models.Disabled.DISABLED,
+                )
+        except Exception as e:
+            self.logger.error(f"Error while updating vector config of {collection_name}: {e}")
+            return False
+
+        return True
     
     def insert_one(self, collection_name: str, text: str, vector: list,
                    metadata: dict = None,
@@ -88,10 +176,11 @@ class QdrantDBProvider(VectorDBInterface):
                 point.payload.update(metadata)
                 
             # Insert the point
-            self.client.upsert(
-                collection_name=collection_name,
-                points=[point]
-            )
+            with self.collection_client(collection_name, write=True) as client:
+                client.upsert(
+                    collection_name=collection_name,
+                    points=[point]
+                )
             
             return True
             
@@ -109,69 +198,186 @@ class QdrantDBProvider(VectorDBInterface):
         if record_ids is None:
             record_ids = list(range(0, len(texts)))
 
+        try:
+            if vectors and not self.check_vector_dimension(collection_name, vectors[0]):
+                return False
+        except Exception as e:
+            self.logger.error(f"Error while reading the dimension of {collection_name}: {e}")
+            return False
+
         for i in range(0, len(texts), batch_size):
             batch_end = i + batch_size
 
-            batch_text = texts[i:batch_end]
-            batch_vectors = vectors[i:batch_end]
-            batch_metadata = metadata[i:batch_end]
-            batch_record_ids = record_ids[i:batch_end]
-
-            batch_records = [
-                 models.Record(
-                     id=batch_record_ids[x],
-                     vector=batch_vectors[x],
-                     payload={
-                         "text": batch_text[x], "metadata": batch_metadata[x]
-                     }
-                 )
-
-                for x in range(len(batch_text))
-            ]
+            batch_points = self.build_points(
+                texts[i:batch_end], vectors[i:batch_end],
+                metadata[i:batch_end], record_ids[i:batch_end]
+            )
             try:
-                _ = self.client.upload_records(
-                collection_name=collection_name,
-                records=batch_records,
-                )
+                with self.collection_client(collection_name, write=True) as client:
+                    _ = client.upload_points(
+                        collection_name=collection_name,
+                        points=batch_points,
+                    )
             except Exception as e:
                 self.logger.error(f"Error while inserting batch: {e}")
                 return False
 
         return True
     
+    def delete_by_asset_id(self, collection_name: str, asset_id: str):
+        """Deletes every point that belongs to the given asset (document)."""
+        if not self.is_collection_existed(collection_name):
+            return False
+
+        try:
+            with self.collection_client(collection_name, write=True) as client:
+                client.delete(
+                    collection_name=collection_name,
+                    points_selector=models.FilterSelector(filter=self.build_asset_filter(asset_id)),
+                )
+        except Exception as e:
+            self.logger.error(f"Error while deleting points of asset {asset_id}: {e}")
+            return False
+
+        return True
+
+    def delete_by_filter(self, collection_name: str, filters: dict):
+        """Deletes every point matching all `filters`, e.g. one project's points in a shared collection."""
+        # An empty filter would match the whole collection
+        if not filters or not self.is_collection_existed(collection_name):
+            return False
+
+        try:
+            with self.collection_client(collection_name, write=True) as client:
+                client.delete(
+                    collection_name=collection_name,
+                    points_selector=models.FilterSelector(filter=self.build_filter(filters)),
+                )
+        except Exception as e:
+            self.logger.error(f"Error while deleting points matching {filters}: {e}")
+            return False
+
+        return True
+
     def search_by_vector(self, collection_name: str, vector:list, limit: int = 5,
-                           query_filter = None, score_threshold: Optional[float] = None):
+                           filters: dict = None, score_threshold: Optional[float] = None):
         """ Search for vectors similar to the query vector, with optional filtering.
 
         Args:
             collection_name: Name of the collection to search in.
             vector: The query vector.
             limit: Max number of results to return.
-            query_filter: Qdrant filter object (e.g., models.Filter).
+            filters: Exact-match conditions on indexed payload fields, e.g. {"asset_id": "..."}.
             score_threshold: Minimum score threshold for results.
         """
 
         try:
-            results = self.client.search(
-                collection_name=collection_name,
-                query_vector=vector,
-                query_filter=query_filter,
-                score_threshold=score_threshold,
-                limit=limit,
-                with_payload=True,
-                with_vectors=False
-            )
+            if not self.check_vector_dimension(collection_name, vector):
+                return None
+
+            with self.collection_client(collection_name) as client:
+                results = client.search(
+                    collection_name=collection_name,
+                    query_vector=vector,
+                    query_filter=self.build_filter(filters),
+                    score_threshold=score_threshold,
+                    search_params=self.search_params,
+                    limit=limit,
+                    with_payload=True,
+                    with_vectors=False
+                )
 
             if not results or len(results) == 0:
                 return None
             
-            return [
-                RetrievedDocument(**{
-                    "score": result.score,
-                    "text": result.payload["text"],    
-                })
-            for result in results
-            ]
+            return self.to_retrieved_documents(results)
         except Exception as e:
             self.logger.error(f"Error in search_by_vector: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def search_batch(self, collection_name: str, vectors: list, limit: int = 5,
+                     filters: dict = None, score_threshold: Optional[float] = None):
+        """Searches several query vectors in a single request.
+
+        Every query shares `limit`, `filters` and `score_threshold`.
+
+        Returns:
+            One list of RetrievedDocument per query vector, or None on error
+        """
+        if not vectors:
+            return []
+
+        try:
+            if not self.check_vector_dimension(collection_name, vectors[0]):
+                return None
+
+            with self.collection_client(collection_name) as client:
+                batch_results = client.search_batch(
+                    collection_name=collection_name,
+                    requests=self.build_search_requests(vectors, limit, filters, score_threshold)
+                )
+
+            return [self.to_retrieved_documents(results) for results in batch_results]
+        except Exception as e:
+            self.logger.error(f"Error in search_batch: {e}")
+            return None
+
+    def estimate_recall(self, collection_name: str, sample_size: int = 20, limit: int = 10,
+                        filters: dict = None) -> Optional[dict]:
+        """Measures how many exact nearest neighbours the configured search finds.
+
+        Stored vectors are used as queries; each is searched once with the
+        normal (HNSW, quantized, oversampled) parameters and once exactly, and
+        recall@limit is the mean overlap of the two result sets. `filters`
+        (the tenant filter in a shared collection) applies to the samples and
+        to both searches, as it does to the project's real queries.
+        """
+        if not self.is_collection_existed(collection_name):
+            return None
+
+        try:
+            query_filter = self.build_filter(filters)
+            with self.collection_client(collection_name) as client:
+                points, _ = client.scroll(
+                    collection_name=collection_name,
+                    scroll_filter=query_filter,
+                    limit=sample_size,
+                    with_payload=False,
+                    with_vectors=True,
+                )
+
+                overlaps = []
+                for point in points:
+                    approximate = client.search(
+                        collection_name=collection_name,
+                        query_vector=point.vector,
+                        query_filter=query_filter,
+                        search_params=self.search_params,
+                        limit=limit,
+                        with_payload=False,
+                    )
+                    exact = client.search(
+                        collection_name=collection_name,
+                        query_vector=point.vector,
+                        query_filter=query_filter,
+                        search_params=models.SearchParams(exact=True),
+                        limit=limit,
+                        with_payload=False,
+                    )
+                    exact_ids = {hit.id for hit in exact}
+                    if exact_ids:
+                        overlaps.append(len(exact_ids & {hit.id for hit in approximate}) / len(exact_ids))
+
+                quantization_config = client.get_collection(collection_name=collection_name).config.quantization_config
+        except Exception as e:
+            self.logger.error(f"Error while estimating recall of {collection_name}: {e}")
+            return None
+
+        return {
+            "recall": round(sum(overlaps) / len(overlaps), 4) if overlaps else None,
+            "limit": limit,
+            "samples": len(overlaps),
+            "quantization": quantization_config.model_dump(mode="json") if quantization_config else None,
+            "oversampling": self.vector_config["oversampling"],
+            "rescore": self.vector_config["rescore"],
+        }
@@ -0,0 +1,222 @@
+from qdrant_client import models
+from ..VectorDBEnums import DistanceMethodEnums, PayloadFieldEnums, QuantizationEnums
+from typing import List
+from models.db_schemes.data_chunk import RetrievedDocument
+
+class QdrantProviderMixin:
+    """Request builders shared by QdrantDBProvider and AsyncQdrantDBProvider.
+
+    Both providers may serve the same collection (ingestion writes through
+    the sync client, request handlers search through the async one), so
+    payloads, filters and collection parameters are built in one place.
+    """
+
+    DEFAULT_VECTOR_CONFIG = {
+        "quantization": QuantizationEnums.NONE.value,
+        "on_disk": False,
+        "always_ram": True,
+        "oversampling": 2.0,
+        "rescore": True,
+        # Build HNSW links per tenant (payload_m) instead of one global graph;
+        # for shared collections whose searches always filter on project_id
+        "multitenant": False,
+    }
+
+    def init_collection_settings(self, distance_method: str, vector_config: dict = None,
+                                 collection_dimensions: dict = None, indexed_collections: set = None):
+        """Sets the distance, vector config and per-collection caches.
+
+        `collection_dimensions` and `indexed_collections` may be another
+        provider's caches, so that deleting or resetting a collection through
+        one client invalidates them for both.
+        """
+        self.distance_method = None
+
+        if distance_method == DistanceMethodEnums.COSINE.value:
+            self.distance_method = models.Distance.COSINE
+        elif distance_method == DistanceMethodEnums.DOT.value:
+            self.distance_method = models.Distance.DOT
+
+        self.indexed_collections = indexed_collections if indexed_collections is not None else set()
+        # Vector size each collection was created with, i.e. the embedding
+        # dimension its index is built for
+        self.collection_dimensions = collection_dimensions if collection_dimensions is not None else {}
+
+        # Storage/quantization defaults for new collections; projects may override them
+        self.vector_config = self.merge_vector_config(self.DEFAULT_VECTOR_CONFIG, vector_config)
+        self.search_params = self.build_search_params(self.vector_config)
+
+    def forget_collection(self, collection_name: str):
+        """Drops the cached payload indexes and dimension of a deleted collection."""
+        self.indexed_collections.discard(collection_name)
+        self.collection_dimensions.pop(collection_name, None)
+
+    @staticmethod
+    def missing_payload_indexes(payload_schema: dict) -> List[str]:
+        """Payload fields used by filtered search that have no index yet."""
+        payload_schema = payload_schema or {}
+        return [field.value for field in PayloadFieldEnums if field.value not in payload_schema]
+
+    def cached_dimension_matches(self, collection_name: str, vector: list) -> bool:
+        """Whether the cached dimension of `collection_name` is known and fits `vector`.
+
+        A miss means the dimension must be (re-)read from the server: it was
+        never read, or the collection may have been recreated by another
+        client since, so a stale size never refuses a valid vector.
+        """
+        return self.collection_dimensions.get(collection_name) == len(vector)
+
+    def validate_vector_dimension(self, collection_name: str, dimension: int, vector: list) -> bool:
+        """Caches the collection's dimension and refuses vectors of another size.
+
+        This happens when EMBEDDING_DIMENSIONS (or the embedding model) changed
+        after the collection was indexed; the project must be re-indexed.
+        """
+        self.collection_dimensions[collection_name] = dimension
+        if len(vector) != dimension:
+            self.logger.error(
+                f"Collection {collection_name} is indexed with {dimension}-dimensional vectors, "
+                f"got {len(vector)}; re-index the project after changing the embedding size"
+            )
+            return False
+
+        return True
+
+    def build_collection_params(self, embedding_size: int, vector_config: dict = None) -> dict:
+        """create_collection arguments; `vector_config` overrides the provider defaults."""
+        vector_config = self.merge_vector_config(self.vector_config, vector_config)
+        return {
+            "vectors_config": models.VectorParams(
+                size=embedding_size,
+                distance=self.distance_method,
+                on_disk=vector_config["on_disk"]
+            ),
+            "quantization_config": self.build_quantization_config(vector_config),
+            "hnsw_config": self.build_hnsw_config(vector_config),
+        }
+
+    @classmethod
+    def build_points(cls, texts: list, vectors: list, metadata: list, record_ids: list) -> List[models.PointStruct]:
+        return [
+            models.PointStruct(
+                id=record_id,
+                vector=vector,
+                payload=cls.build_payload(text=text, metadata=meta)
+            )
+            for text, vector, meta, record_id in zip(texts, vectors, metadata, record_ids)
+        ]
+
+    def build_search_requests(self, vectors: list, limit: int, filters: dict = None,
+                              score_threshold: float = None) -> List[models.SearchRequest]:
+        query_filter = self.build_filter(filters)
+        return [
+            models.SearchRequest(
+                vector=vector,
+                filter=query_filter,
+                params=self.search_params,
+                score_threshold=score_threshold,
+                limit=limit,
+                with_payload=True,
+                with_vector=False,
+            )
+            for vector in vectors
+        ]
+
+    @staticmethod
+    def build_payload(text: str, metadata: dict = None) -> dict:
+        """Builds a point payload, lifting the filterable fields to the top level."""
+        payload = {"text": text, "metadata": metadata}
+        for field in PayloadFieldEnums:
+            if metadata and metadata.get(field.value) is not None:
+                payload[field.value] = str(metadata[field.value])
+        return payload
+
+    @staticmethod
+    def merge_vector_config(base: dict, overrides: dict = None) -> dict:
+        """Applies the non-None entries of `overrides` on top of `base`."""
+        merged = dict(base)
+        merged.update({key: value for key, value in (overrides or {}).items() if value is not None})
+        return merged
+
+    @staticmethod
+    def build_quantization_config(vector_config: dict):
+        """Maps a vector config to Qdrant's quantization config (None keeps full precision)."""
+        quantization = vector_config.get("quantization") or QuantizationEnums.NONE.value
+        always_ram = vector_config.get("always_ram", True)
+
+        if quantization == QuantizationEnums.NONE.value:
+            return None
+        if quantization == QuantizationEnums.SCALAR.value:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=always_ram,
+                )
+            )
+        if quantization == QuantizationEnums.BINARY.value:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=always_ram)
+            )
+
+        raise ValueError(f"Unknown vector quantization: {quantization}")
+
+    @staticmethod
+    def build_hnsw_config(vector_config: dict):
+        if not vector_config.get("multitenant"):
+            return None
+        return models.HnswConfigDiff(payload_m=16, m=0)
+
+    @staticmethod
+    def build_search_params(vector_config: dict):
+        """Query-time quantization parameters.
+
+        Qdrant ignores them for collections without quantization, so the same
+        parameters serve every collection. Oversampling fetches more candidates
+        from the quantized vectors; rescoring re-ranks them with the originals.
+        """
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(
+                rescore=vector_config.get("rescore", True),
+                oversampling=vector_config.get("oversampling"),
+            )
+        )
+
+    @staticmethod
+    def build_filter(filters: dict = None):
+        """Turns {"field": value} pairs into a Qdrant filter (all conditions must match)."""
+        if not filters:
+            return None
+
+        return models.Filter(
+            must=[
+                models.FieldCondition(key=key, match=models.MatchValue(value=value))
+                for key, value in filters.items()
+            ]
+        )
+
+    @staticmethod
+    def build_asset_filter(asset_id: str):
+        """Matches every point of an asset (document)."""
+        # Points indexed before asset_id moved to the top level only carry metadata.asset_id
+        return models.Filter(
+            should=[
+                models.FieldCondition(
+                    key=key,
+                    match=models.MatchValue(value=str(asset_id)),
+                )
+                for key in (PayloadFieldEnums.ASSET_ID.value, "metadata.asset_id")
+            ]
+        )
+
+    @staticmethod
+    def to_retrieved_documents(results) -> List[RetrievedDocument]:
+        return [
+            RetrievedDocument(**{
+                "score": result.score,
+                "text": result.payload["text"],
+                "id": (result.payload.get("metadata") or {}).get("chunk_id"),
+                "metadata": result.payload.get("metadata") or {},
+            })
+            for result in results
+        ]
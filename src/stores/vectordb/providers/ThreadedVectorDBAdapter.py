@@ -0,0 +1,95 @@
+from ..AsyncVectorDBInterface import AsyncVectorDBInterface
+import asyncio
+from typing import List, Optional
+from models.db_schemes.data_chunk import RetrievedDocument
+
+class ThreadedVectorDBAdapter(AsyncVectorDBInterface):
+    """Exposes a synchronous VectorDBInterface provider as coroutines.
+
+    Every call runs in a worker thread, so backends without a native async
+    client (e.g. local-mode Qdrant, which cannot be opened twice) no longer
+    block the event loop while searching or writing.
+    """
+
+    def __init__(self, vectordb_client):
+        self.vectordb_client = vectordb_client
+
+    async def connect(self):
+        # The wrapped client is connected (and disconnected) by its owner
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        return await asyncio.to_thread(
+            self.vectordb_client.is_collection_existed, collection_name=collection_name
+        )
+
+    async def delete_collection(self, collection_name: str):
+        return await asyncio.to_thread(
+            self.vectordb_client.delete_collection, collection_name=collection_name
+        )
+
+    async def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False,
+                                vector_config: dict = None):
+        return await asyncio.to_thread(
+            self.vectordb_client.create_collection,
+            collection_name=collection_name,
+            embedding_size=embedding_size,
+            do_reset=do_reset,
+            vector_config=vector_config,
+        )
+
+    async def insert_many(self, collection_name: str, texts: list,
+                          vectors: list, metadata: list = None,
+                          record_ids: list = None, batch_size: int = 50):
+        return await asyncio.to_thread(
+            self.vectordb_client.insert_many,
+            collection_name=collection_name,
+            texts=texts,
+            vectors=vectors,
+            metadata=metadata,
+            record_ids=record_ids,
+            batch_size=batch_size,
+        )
+
+    async def delete_by_asset_id(self, collection_name: str, asset_id: str):
+        return await asyncio.to_thread(
+            self.vectordb_client.delete_by_asset_id,
+            collection_name=collection_name,
+            asset_id=asset_id,
+        )
+
+    async def delete_by_filter(self, collection_name: str, filters: dict):
+        return await asyncio.to_thread(
+            self.vectordb_client.delete_by_filter,
+            collection_name=collection_name,
+            filters=filters,
+        )
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               filters: dict = None,
+                               score_threshold: Optional[float] = None) -> List[RetrievedDocument]:
+        return await asyncio.to_thread(
+            self.vectordb_client.search_by_vector,
+            collection_name=collection_name,
+            vector=vector,
+            limit=limit,
+            filters=filters,
+            score_threshold=score_threshold,
+        )
+
+    async def search_batch(self, collection_name: str, vectors: list, limit: int = 5,
+                           filters: dict = None,
+                           score_threshold: Optional[float] = None) -> List[List[RetrievedDocument]]:
+        return await asyncio.to_thread(
+            self.vectordb_client.search_batch,
+            collection_name=collection_name,
+            vectors=vectors,
+            limit=limit,
+            filters=filters,
+            score_threshold=score_threshold,
+        )
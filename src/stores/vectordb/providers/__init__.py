@@ -1 +1,5 @@
 from .QdrantDBProvider import QdrantDBProvider
+from .AsyncQdrantDBProvider import AsyncQdrantDBProvider
+from .ThreadedVectorDBAdapter import ThreadedVectorDBAdapter
+from .NumpyFlatDBProvider import NumpyFlatDBProvider
+from .LazyQdrantDBProvider import LazyQdrantDBProvider
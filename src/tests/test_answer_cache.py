@@ -0,0 +1,65 @@
+from stores.llm.AnswerCache import AnswerCache
+
+def test_make_scope_separates_everything_an_answer_depends_on():
+    scope = AnswerCache.make_scope("project", 1, file_id="file", language="en",
+                                   conversation_history=[{"role": "user", "content": "hi"}], limit=10)
+
+    assert scope == AnswerCache.make_scope("project", 1, file_id="file", language="en",
+                                           conversation_history=[{"role": "user", "content": "hi"}], limit=10)
+    assert scope != AnswerCache.make_scope("project", 2, file_id="file", language="en",
+                                           conversation_history=[{"role": "user", "content": "hi"}], limit=10)
+    assert scope != AnswerCache.make_scope("project", 1, language="en",
+                                           conversation_history=[{"role": "user", "content": "hi"}], limit=10)
+    assert scope != AnswerCache.make_scope("project", 1, file_id="file", language="ar",
+                                           conversation_history=[{"role": "user", "content": "hi"}], limit=10)
+    assert scope != AnswerCache.make_scope("project", 1, file_id="file", language="en", limit=10)
+    assert scope != AnswerCache.make_scope("project", 1, file_id="file", language="en",
+                                           conversation_history=[{"role": "user", "content": "hi"}], limit=5)
+
+def test_get_matches_the_normalized_question():
+    cache = AnswerCache()
+    scope = AnswerCache.make_scope("project", 1)
+    cache.put(scope, "What is the  total revenue?", "answer")
+
+    assert cache.get(scope, "what is the total revenue?") == "answer"
+    assert cache.get(AnswerCache.make_scope("project", 1, limit=5), "What is the total revenue?") is None
+
+def test_get_similar_returns_the_closest_question_above_the_threshold():
+    cache = AnswerCache(similarity_threshold=0.9)
+    scope = AnswerCache.make_scope("project", 1)
+    cache.put(scope, "What was the revenue?", "revenue", query_vector=[1.0, 0.0])
+    cache.put(scope, "Who is the CEO?", "ceo", query_vector=[0.0, 1.0])
+
+    value, similarity = cache.get_similar(scope, [0.99, 0.05], "How much revenue was there?")
+    assert value == "revenue"
+    assert similarity > 0.9
+
+    value, _ = cache.get_similar(scope, [0.7, 0.7], "Something in between?")
+    assert value is None
+
+def test_get_similar_requires_the_same_numbers():
+    cache = AnswerCache(similarity_threshold=0.9)
+    scope = AnswerCache.make_scope("project", 1)
+    cache.put(scope, "Revenue in 2022?", "2022 revenue", query_vector=[1.0, 0.0])
+
+    assert cache.get_similar(scope, [1.0, 0.0], "What was the revenue for 2022")[0] == "2022 revenue"
+    assert cache.get_similar(scope, [1.0, 0.0], "Revenue in 2023?")[0] is None
+    assert cache.get_similar(scope, [1.0, 0.0], "Revenue in ٢٠٢٢?")[0] == "2022 revenue"
+
+def test_get_similar_is_disabled_without_a_threshold():
+    cache = AnswerCache()
+    scope = AnswerCache.make_scope("project", 1)
+    cache.put(scope, "What was the revenue?", "revenue", query_vector=[1.0, 0.0])
+
+    assert cache.get_similar(scope, [1.0, 0.0], "How much revenue was there?") == (None, 0.0)
+    assert cache.get_stats()["misses"] == 1
+
+def test_a_newer_index_version_drops_older_answers():
+    cache = AnswerCache(similarity_threshold=0.9)
+    old_scope = AnswerCache.make_scope("project", 1)
+    cache.put(old_scope, "What was the revenue?", "old", query_vector=[1.0, 0.0])
+
+    new_scope = AnswerCache.make_scope("project", 2)
+    assert cache.get(new_scope, "What was the revenue?") is None
+    assert cache.get(old_scope, "What was the revenue?") is None
+    assert cache.get_similar(new_scope, [1.0, 0.0], "What was the revenue?")[0] is None
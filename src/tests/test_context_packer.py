@@ -0,0 +1,74 @@
+import pytest
+
+import stores.llm.ContextPacker as context_packer
+from stores.llm.ContextPacker import ContextPacker, MESSAGE_OVERHEAD_TOKENS
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    # Estimated counts (4 ASCII characters per token) keep the budgets below exact
+    monkeypatch.setattr(context_packer, "tiktoken", None)
+
+def words(n_tokens):
+    return "abc " * n_tokens
+
+def test_pack_keeps_the_best_documents_that_fit():
+    packer = ContextPacker(max_input_tokens=100 + MESSAGE_OVERHEAD_TOKENS, max_history_tokens=0)
+    documents = [
+        {"text": words(40), "score": 0.5},
+        {"text": words(50), "score": 0.9},
+        {"text": words(30), "score": 0.7},
+    ]
+
+    packed = packer.pack(fixed_texts=[words(10)], documents=documents)
+
+    assert [doc["score"] for doc in packed.documents] == [0.9, 0.7]
+    assert packed.dropped_documents == 1
+    assert packed.trimmed_documents == 0
+    assert packed.used_tokens == 90 + MESSAGE_OVERHEAD_TOKENS
+
+def test_pack_trims_the_first_document_that_does_not_fit():
+    packer = ContextPacker(max_input_tokens=200, max_history_tokens=0)
+    documents = [{"text": words(100), "score": 0.9}, {"text": words(200), "score": 0.8}]
+
+    packed = packer.pack(fixed_texts=[], documents=documents)
+
+    assert len(packed.documents) == 2
+    assert packed.trimmed_documents == 1
+    assert packer.count_tokens(packed.documents[1]["text"]) <= 100
+    assert packed.used_tokens <= 200
+
+def test_pack_drops_documents_too_short_to_trim():
+    packer = ContextPacker(max_input_tokens=100 + ContextPacker.MIN_TRIMMED_CHUNK_TOKENS - 1,
+                           max_history_tokens=0)
+    documents = [{"text": words(100), "score": 0.9}, {"text": words(100), "score": 0.8}]
+
+    packed = packer.pack(fixed_texts=[], documents=documents)
+
+    assert len(packed.documents) == 1
+    assert packed.dropped_documents == 1
+
+def test_pack_keeps_the_most_recent_turns_within_the_history_budget():
+    turn_tokens = 10 + MESSAGE_OVERHEAD_TOKENS
+    packer = ContextPacker(max_input_tokens=1000, max_history_tokens=2 * turn_tokens)
+    history = [{"role": "user", "content": words(10)} for i in range(4)]
+    for i, message in enumerate(history):
+        message["turn"] = i
+
+    packed = packer.pack(fixed_texts=[], documents=[], history=history)
+
+    assert [message["turn"] for message in packed.history] == [2, 3]
+    assert packed.dropped_turns == 2
+    assert packed.used_tokens == 2 * turn_tokens
+
+def test_pack_counts_the_document_template_for_every_document():
+    packer = ContextPacker(max_input_tokens=100, max_history_tokens=0)
+    documents = [{"text": words(40), "score": 0.9}, {"text": words(40), "score": 0.8}]
+
+    packed = packer.pack(fixed_texts=[], documents=documents, document_overhead=words(10))
+
+    assert len(packed.documents) == 2
+    assert packed.used_tokens == 100
+
+def test_non_ascii_text_is_estimated_with_more_tokens_per_character():
+    assert context_packer.estimate_tokens("a" * 12) == 3
+    assert context_packer.estimate_tokens("ب" * 12) == 8
@@ -0,0 +1,65 @@
+import json
+
+import numpy as np
+
+from stores.vectordb.providers.NumpyFlatDBProvider import FlatCollection
+
+def create_collection(tmp_path, texts):
+    collection = FlatCollection.create(str(tmp_path / "collection"), dimension=len(texts), dtype="float32",
+                                       distance="cosine")
+    collection.upsert(
+        point_ids=[str(point_id) for point_id in collection.reserve_point_ids(len(texts))],
+        vectors=np.eye(len(texts)),
+        payloads=[{"text": text, "asset_id": str(i % 2)} for i, text in enumerate(texts)],
+    )
+    return collection
+
+def stored_points(collection):
+    """(point_id, text, index of the vector's non-zero component) of every stored point, by row."""
+    points = []
+    for row, point_id, payload in collection.connection.execute(
+        "SELECT row, point_id, payload FROM points ORDER BY row"
+    ):
+        points.append((point_id, json.loads(payload)["text"], int(np.argmax(collection.matrix[row]))))
+    return points
+
+def test_compact_drops_deleted_rows_and_keeps_vectors_with_their_payloads(tmp_path):
+    collection = create_collection(tmp_path, ["a", "b", "c", "d", "e"])
+
+    assert collection.delete_by_filter({"asset_id": "1"}) == 2
+    collection.compact()
+
+    assert collection.meta["count"] == 3
+    assert collection.meta["capacity"] == 3
+    assert collection.meta["deleted"] == 0
+    assert stored_points(collection) == [("0", "a", 0), ("2", "c", 2), ("4", "e", 4)]
+
+def test_compact_survives_reopening(tmp_path):
+    collection = create_collection(tmp_path, ["a", "b", "c", "d"])
+    collection.delete_by_filter({"asset_id": "0"})
+    collection.compact()
+    collection.close()
+
+    reopened = FlatCollection(str(tmp_path / "collection"))
+    assert stored_points(reopened) == [("1", "b", 1), ("3", "d", 3)]
+
+def test_point_ids_are_not_reused_after_compact(tmp_path):
+    collection = create_collection(tmp_path, ["a", "b", "c", "d"])
+    collection.delete_by_filter({"asset_id": "1"})
+    collection.compact()
+
+    new_ids = collection.reserve_point_ids(2)
+    assert new_ids == [4, 5]
+
+    collection.upsert([str(point_id) for point_id in new_ids], np.eye(4)[[1, 3]],
+                      [{"text": "f"}, {"text": "g"}])
+    assert [text for _, text, _ in stored_points(collection)] == ["a", "c", "f", "g"]
+
+def test_deleting_half_of_the_rows_compacts_automatically(tmp_path):
+    collection = create_collection(tmp_path, ["a", "b", "c", "d", "e", "f"])
+
+    collection.delete_by_filter({"asset_id": "0"})
+    collection.delete_by_filter({"asset_id": "1"})
+
+    assert collection.meta["count"] == 0
+    assert stored_points(collection) == []
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from helpers.single_flight import SingleFlight
+
+def test_run_shares_one_computation_between_concurrent_callers():
+    flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "answer"
+
+    async def main():
+        return await asyncio.gather(*(flight.run("key", compute) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["answer"] * 5
+    assert len(calls) == 1
+    assert flight.get_stats()["leaders"] == 1
+    assert flight.get_stats()["followers"] == 4
+    assert flight.get_stats()["in_flight"] == 0
+
+def test_run_starts_afresh_once_the_computation_finished():
+    flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return len(calls)
+
+    async def main():
+        return [await flight.run("key", compute), await flight.run("key", compute)]
+
+    assert asyncio.run(main()) == [1, 2]
+
+def test_run_shares_exceptions():
+    flight = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def main():
+        return await asyncio.gather(*(flight.run("key", compute) for _ in range(2)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+def test_stream_replays_earlier_events_to_late_subscribers():
+    flight = SingleFlight()
+    produced = []
+
+    async def produce():
+        for event in range(3):
+            produced.append(event)
+            await asyncio.sleep(0.01)
+            yield event
+
+    async def collect(delay):
+        await asyncio.sleep(delay)
+        return [event async for event in flight.stream("key", produce)]
+
+    async def main():
+        return await asyncio.gather(collect(0), collect(0.015))
+
+    assert asyncio.run(main()) == [[0, 1, 2], [0, 1, 2]]
+    assert produced == [0, 1, 2]
+    assert flight.get_stats()["stream_followers"] == 1
+
+def test_stream_is_cancelled_when_every_subscriber_leaves():
+    flight = SingleFlight()
+    closed = []
+
+    async def produce():
+        try:
+            while True:
+                await asyncio.sleep(0.01)
+                yield "event"
+        finally:
+            closed.append(True)
+
+    async def main():
+        events = flight.stream("key", produce)
+        assert await events.__anext__() == "event"
+        await events.aclose()
+        await asyncio.sleep(0.02)
+
+    asyncio.run(main())
+    assert closed == [True]
+    assert flight.get_stats()["cancelled_streams"] == 1
+    assert flight.get_stats()["in_flight_streams"] == 0
+
+def test_stream_raises_the_producer_error_to_every_subscriber():
+    flight = SingleFlight()
+
+    async def produce():
+        yield "event"
+        raise RuntimeError("broken")
+
+    async def collect():
+        return [event async for event in flight.stream("key", produce)]
+
+    async def main():
+        return await asyncio.gather(collect(), collect(), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(collect())